@@ -0,0 +1,102 @@
+"""
+Benchmark: OFFSET pagination vs keyset (cursor) pagination on the jobs table.
+
+Fills a fresh temporary database with N jobs (many sharing the same
+created_at second, like CURRENT_TIMESTAMP defaults), then times fetching one
+page at increasing depths with `offset(depth).limit(page)` and with
+`keyset_page` from a cursor pointing at the same position.
+
+Run from backend/:
+    python -m benchmarks.bench_pagination --jobs 200000 --page 50
+"""
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import String, type_coerce
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Job, JobStatus
+from database.connection import create_sqlite_engine
+from utils.pagination import encode_cursor, keyset_page
+
+
+def fill(Session, count, per_second=20):
+    """Insert `count` jobs, `per_second` of them per created_at second."""
+    start = datetime(2024, 1, 1)
+    db = Session()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "type": "bench",
+            "status": JobStatus.COMPLETED,
+            "progress": 100,
+            "total_steps": 1,
+            "current_step": 1,
+            "created_at": start + timedelta(seconds=i // per_second),
+        }
+        for i in range(count)
+    ]
+    db.bulk_insert_mappings(Job, rows)
+    db.commit()
+    db.close()
+
+
+def timed(fn, repeat):
+    """Best wall time of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(Path(tmp) / "bench.db")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        fill(Session, args.jobs)
+
+        db = Session()
+        depths = [d for d in (0, 1000, 10000, 50000, 100000, args.jobs - args.page) if 0 <= d < args.jobs]
+
+        print(f"{args.jobs} jobs, page of {args.page}, best of {args.repeat}\n")
+        print(f"{'depth':>8}{'offset ms':>12}{'keyset ms':>12}{'speedup':>10}")
+        for depth in depths:
+            offset_ms = timed(
+                lambda: db.query(Job)
+                .order_by(Job.created_at.desc(), Job.id.desc())
+                .offset(depth).limit(args.page).all(),
+                args.repeat
+            )
+
+            cursor = None
+            if depth:
+                # Cursor pointing at the row just before `depth`
+                job, created_text = db.query(Job, type_coerce(Job.created_at, String))\
+                    .order_by(Job.created_at.desc(), Job.id.desc())\
+                    .offset(depth - 1).first()
+                cursor = encode_cursor(created_text, job.id)
+            keyset_ms = timed(
+                lambda: keyset_page(db.query(Job), Job.created_at, Job.id, args.page, cursor),
+                args.repeat
+            )
+            print(f"{depth:>8}{offset_ms:>12.2f}{keyset_ms:>12.2f}{offset_ms / keyset_ms:>9.1f}x")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
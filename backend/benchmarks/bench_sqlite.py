@@ -0,0 +1,122 @@
+"""
+Benchmark: concurrent SQLite reads/writes, default journal vs tuned profile.
+
+Writers mimic JobService.update_job (one short commit per progress update),
+readers mimic request handlers listing jobs. Each profile runs against a
+fresh temporary database file.
+
+Run from backend/:
+    python -m benchmarks.bench_sqlite --writers 4 --readers 8 --seconds 5
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Job, JobStatus
+from database.connection import SQLITE_PRAGMAS, create_sqlite_engine, get_sqlite_pragmas
+
+
+PROFILES = {
+    # Previous connection setup: rollback journal, synchronous=FULL, foreign keys only
+    "default": [("journal_mode", "DELETE"), ("foreign_keys", "ON")],
+    "tuned": SQLITE_PRAGMAS,
+}
+
+
+def run_profile(name, pragmas, writers, readers, seconds, jobs=50):
+    """Run the mixed workload once and return throughput counters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(Path(tmp) / "bench.db", pragmas=pragmas)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        db = Session()
+        job_ids = []
+        for i in range(jobs):
+            job = Job(type="bench", status=JobStatus.RUNNING, total_steps=1000, current_step=0, progress=0)
+            db.add(job)
+            db.flush()
+            job_ids.append(job.id)
+        db.commit()
+        db.close()
+
+        counters = {"writes": 0, "reads": 0, "errors": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def count(key):
+            with lock:
+                counters[key] += 1
+
+        def writer(offset):
+            i = offset
+            while not stop.is_set():
+                session = Session()
+                try:
+                    job = session.get(Job, job_ids[i % len(job_ids)])
+                    job.current_step += 1
+                    job.message = f"step {job.current_step}"
+                    session.commit()
+                    count("writes")
+                except OperationalError:
+                    session.rollback()
+                    count("errors")
+                finally:
+                    session.close()
+                i += 1
+
+        def reader():
+            while not stop.is_set():
+                session = Session()
+                try:
+                    session.query(Job).order_by(Job.created_at.desc()).limit(50).all()
+                    count("reads")
+                except OperationalError:
+                    count("errors")
+                finally:
+                    session.close()
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        pragmas_report = get_sqlite_pragmas(engine)
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "journal_mode": pragmas_report["journal_mode"],
+        "synchronous": pragmas_report["synchronous"],
+        "writes_per_second": counters["writes"] / seconds,
+        "reads_per_second": counters["reads"] / seconds,
+        "errors": counters["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writer / {args.readers} reader threads, {args.seconds}s per profile\n")
+    print(f"{'profile':<10}{'journal':<10}{'sync':<8}{'writes/s':>10}{'reads/s':>10}{'errors':>8}")
+    for name, pragmas in PROFILES.items():
+        r = run_profile(name, pragmas, args.writers, args.readers, args.seconds)
+        print(f"{r['profile']:<10}{r['journal_mode']:<10}{r['synchronous']:<8}"
+              f"{r['writes_per_second']:>10.0f}{r['reads_per_second']:>10.0f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
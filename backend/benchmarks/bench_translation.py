@@ -0,0 +1,51 @@
+"""
+Benchmark: serial per-item translation vs batched concurrent translation.
+
+Uses the offline LocalTranslatorBackend with a simulated round-trip latency,
+so it runs without network access and without touching the translation cache.
+
+Run from backend/:
+    python -m benchmarks.bench_translation --concepts 10 --latency 0.05
+"""
+import argparse
+import time
+
+from services.translation_service import TranslationService, LocalTranslatorBackend, LANGUAGES
+
+
+def serial_per_item(backend: LocalTranslatorBackend, concepts, source_lang="fr"):
+    """Previous strategy: one request per concept per language, in sequence."""
+    translations = {source_lang: concepts}
+    for lang in LANGUAGES:
+        if lang != source_lang:
+            translations[lang] = [backend.translate(c, source_lang, lang) for c in concepts]
+    return translations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concepts", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per request")
+    args = parser.parse_args()
+
+    concepts = [f"concept {i}" for i in range(args.concepts)]
+
+    backend = LocalTranslatorBackend(latency=args.latency)
+    start = time.perf_counter()
+    serial_per_item(backend, concepts)
+    serial_time, serial_calls = time.perf_counter() - start, backend.calls
+
+    backend = LocalTranslatorBackend(latency=args.latency)
+    service = TranslationService(backend=backend, cache=None)
+    start = time.perf_counter()
+    service.translate_concepts(concepts)
+    batch_time, batch_calls = time.perf_counter() - start, backend.calls
+
+    print(f"{'strategy':<20}{'requests':>10}{'seconds':>10}")
+    print(f"{'serial per item':<20}{serial_calls:>10}{serial_time:>10.3f}")
+    print(f"{'batched concurrent':<20}{batch_calls:>10}{batch_time:>10.3f}")
+    print(f"speedup: {serial_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
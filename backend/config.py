@@ -1,6 +1,7 @@
 """Configuration settings for the backend."""
 import os
 from pathlib import Path
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 
@@ -11,17 +12,78 @@ class Settings(BaseSettings):
     STORAGE_PATH: Path = Path(os.getenv("STORAGE_PATH", "/tmp/storage"))
     DB_PATH: Path = Path(os.getenv("STORAGE_PATH", "/tmp/storage") + "/db/local.db")
     BUCKETS_PATH: Path = Path(os.getenv("STORAGE_PATH", "/tmp/storage") + "/buckets")
+    STORAGE_INDEX_TTL: float = 30.0  # Seconds a cached universe folder listing is trusted (0 = no cache)
+    
+    # Response cache (GET /universes, /universes/{slug})
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512  # LRU bound on cached responses
+    RESPONSE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # LRU bound on cached bodies (16 MB)
+    RESPONSE_CACHE_TTL: float = 30.0  # Seconds an entry is served without revalidation
+    RESPONSE_CACHE_STALE_TTL: float = 300.0  # Extra seconds served stale while refreshing (0 = off)
     
     # Supabase
     SUPABASE_URL: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
     SUPABASE_BUCKET_NAME: str = "univers"
+    SUPABASE_EMBEDDED_SELECT: bool = True  # Fetch full universes with one nested select
+    
+    # SQLite tuning (applied to every pooled connection)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # WAL lets readers proceed while a writer commits
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL, far fewer fsyncs than FULL
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for the write lock instead of failing
+    SQLITE_CACHE_SIZE_KB: int = 20000  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # Memory-mapped I/O (256 MB)
+    SQLITE_TEMP_STORE: str = "MEMORY"  # Temp tables/indexes in RAM
+    DB_POOL_SIZE: int = 10  # Connections kept open (requests + job threads)
+    DB_POOL_MAX_OVERFLOW: int = 20  # Extra connections under burst
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    
+    # SQL instrumentation
+    SQL_ECHO: bool = False  # Log every SQL statement (development only)
+    SQL_METRICS_ENABLED: bool = True  # Per-statement timing + per-request query counts
+    SQL_SLOW_QUERY_MS: float = 100.0  # Statements slower than this are logged
+    SQL_SLOW_QUERY_LOG_SIZE: int = 100  # Slow queries kept for /api/metrics/queries
+    SQL_METRICS_MAX_STATEMENTS: int = 500  # Distinct statements tracked
     
     # Replicate AI
     REPLICATE_API_TOKEN: str = ""
+    GENERATION_MAX_CONCURRENCY: int = 4  # Max in-flight Replicate predictions per batch
+    REPLICATE_RATE_LIMIT: float = 1.0  # Replicate calls per second (token bucket refill rate)
+    REPLICATE_RATE_BURST: int = 4  # Token bucket capacity (max burst of calls)
+    REPLICATE_API_URL: str = "https://api.replicate.com/v1"
+    REPLICATE_MAX_CONNECTIONS: int = 20  # Shared HTTP pool for predictions, polls and downloads
+    REPLICATE_POLL_INTERVAL: float = 1.0  # Seconds between prediction status polls
+    REPLICATE_PREDICTION_TIMEOUT: float = 900.0  # Give up on a prediction after this many seconds
+    
+    # Background jobs
+    JOB_WORKERS: int = 4  # Worker threads running background jobs (extra jobs wait in PENDING)
+    JOB_TYPE_LIMITS: Dict[str, int] = {"generate_all": 2, "generate_videos": 2, "sync_pull_all": 1}  # Max concurrent jobs per type (JSON)
+    JOB_DRAIN_TIMEOUT: float = 30.0  # Seconds shutdown waits for running jobs
+    JOB_LEASE_TTL: float = 60.0  # A job whose lease is not renewed for this long is recovered
+    JOB_HEARTBEAT_INTERVAL: float = 15.0  # Lease renewal + expired lease scan period
+    JOB_MAX_ATTEMPTS: int = 3  # Interrupted jobs are requeued until this many attempts
+    JOB_PROGRESS_FLUSH_INTERVAL: float = 0.5  # Seconds between batched job progress writes
+    JOB_EVENTS_HEARTBEAT: float = 15.0  # Seconds between keep-alives on idle job event streams
+    JOB_EVENTS_RETRY_MS: int = 3000  # SSE reconnect delay advertised to clients
+    JOB_EVENTS_TRACKED_JOBS: int = 1000  # Jobs whose last event ID is kept for reconnects
+    
+    # Media downloads (generated outputs)
+    DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes held in memory per download while streaming to disk
+    DOWNLOAD_MAX_CONNECTIONS: int = 20  # Shared HTTP pool for output downloads
+    DOWNLOAD_RETRIES: int = 3  # Resume attempts (HTTP Range) after a dropped connection
+    
+    # Translation
+    TRANSLATION_BACKEND: str = "google"  # Options: google, local (offline stand-in)
+    TRANSLATION_CACHE_MEMORY_SIZE: int = 2048  # Entries kept in the in-memory LRU
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 50000  # Rows kept in SQLite before eviction
+    TRANSLATION_CACHE_TTL_DAYS: int = 90  # Entries older than this are re-translated
     
     # Sync settings
     SYNC_MODE: str = "last_write_wins"  # Options: last_write_wins, timestamp_merge
+    SYNC_TRANSFER_CONCURRENCY: int = 8  # Parallel media uploads/downloads
+    SYNC_TRANSFER_RETRIES: int = 3  # Retries per file (exponential backoff)
+    SYNC_TRANSFER_BACKOFF: float = 0.5  # First retry delay in seconds
+    SYNC_PULL_CONCURRENCY: int = 4  # Universes pulled in parallel by init sync
     
     # Server
     DEBUG: bool = True
@@ -1,5 +1,7 @@
 """Database module - SQLite with SQLAlchemy ORM."""
-from .connection import engine, SessionLocal, Base, get_db, init_db
+from .connection import engine, SessionLocal, Base, get_db, init_db, get_sqlite_pragmas
+from .instrumentation import query_stats
+from .migrations import run_migrations
 from .models import (
     Univers,
     UniversPrompts,
@@ -9,7 +11,9 @@ from .models import (
     UniversAssetTranslation,
     UniversMusicPrompts,
     Job,
-    JobStatus
+    JobStatus,
+    TranslationMemory,
+    MediaManifestEntry
 )
 
 __all__ = [
@@ -18,6 +22,9 @@ __all__ = [
     "Base",
     "get_db",
     "init_db",
+    "get_sqlite_pragmas",
+    "query_stats",
+    "run_migrations",
     "Univers",
     "UniversPrompts",
     "UniversTranslation",
@@ -26,5 +33,7 @@ __all__ = [
     "UniversAssetTranslation",
     "UniversMusicPrompts",
     "Job",
-    "JobStatus"
+    "JobStatus",
+    "TranslationMemory",
+    "MediaManifestEntry"
 ]
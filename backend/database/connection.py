@@ -1,24 +1,100 @@
 """SQLite database connection and session management."""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from config import settings
+from .instrumentation import query_stats
 
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.DB_PATH}"
 
+# Pragmas applied to every new connection, in order
+SQLITE_PRAGMAS: List[Tuple[str, Any]] = [
+    ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+    ("synchronous", settings.SQLITE_SYNCHRONOUS),
+    ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+    ("cache_size", -settings.SQLITE_CACHE_SIZE_KB),  # Negative = KiB instead of pages
+    ("mmap_size", settings.SQLITE_MMAP_SIZE),
+    ("temp_store", settings.SQLITE_TEMP_STORE),
+    ("foreign_keys", "ON"),
+]
+
+# Pragmas reported at startup
+REPORTED_PRAGMAS = [name for name, _ in SQLITE_PRAGMAS]
+
+# SQLite reports some pragmas as integers
+PRAGMA_VALUE_NAMES = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
+
+
+def create_sqlite_engine(
+    db_path: Path,
+    pragmas: Optional[List[Tuple[str, Any]]] = None,
+    echo: bool = False
+) -> Engine:
+    """
+    Create a SQLite engine with a thread-friendly pool and per-connection pragmas.
+
+    Args:
+        db_path: SQLite file path
+        pragmas: (name, value) pragmas to apply on connect (default: SQLITE_PRAGMAS)
+        echo: Log SQL statements
+
+    Returns:
+        Configured engine
+    """
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    new_engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={
+            "check_same_thread": False,  # Required for SQLite (pooled across threads)
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+        },
+        poolclass=QueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=False,  # Local file: connections don't go stale
+        echo=echo
+    )
+
+    @event.listens_for(new_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return new_engine
+
+
+def get_sqlite_pragmas(target: Optional[Engine] = None) -> Dict[str, Any]:
+    """Effective values of the tuned pragmas, read back from a pooled connection."""
+    target = target or engine
+    report = {}
+    with target.connect() as connection:
+        for name in REPORTED_PRAGMAS:
+            row = connection.exec_driver_sql(f"PRAGMA {name}").fetchone()
+            value = row[0] if row else None
+            report[name] = PRAGMA_VALUE_NAMES.get(name, {}).get(value, value)
+    report["pool_size"] = target.pool.size()
+    return report
+
+
 # Create engine with SQLite-specific settings
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    echo=settings.DEBUG  # Log SQL queries in debug mode
+engine = create_sqlite_engine(
+    settings.DB_PATH,
+    echo=settings.SQL_ECHO  # Per-statement logging; use /api/metrics/queries instead
 )
 
-# Enable foreign keys for SQLite
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+if settings.SQL_METRICS_ENABLED:
+    query_stats.install(engine)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -39,5 +115,13 @@ def get_db():
 def init_db():
     """Initialize database tables."""
     from . import models  # Import models to register them
+    from .migrations import run_migrations
     Base.metadata.create_all(bind=engine)
-    print(f"✅ Database initialized at {settings.DB_PATH}")
+    schema = run_migrations(engine)
+    print(f"✅ Database initialized at {settings.DB_PATH} (schema v{schema['to_version']})")
+
+    pragmas = get_sqlite_pragmas()
+    print("⚙️  SQLite: " + ", ".join(f"{name}={value}" for name, value in pragmas.items()))
+    if str(pragmas.get("journal_mode", "")).lower() != settings.SQLITE_JOURNAL_MODE.lower():
+        print(f"⚠️  SQLite journal_mode is {pragmas.get('journal_mode')} "
+              f"(requested {settings.SQLITE_JOURNAL_MODE})")
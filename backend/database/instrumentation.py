@@ -0,0 +1,216 @@
+"""Query instrumentation - Per-statement latency histograms and per-request query counts."""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+class RequestQueries:
+    """Query counter for one unit of work (an HTTP request or a `track()` block)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+
+# Counter of the request being served (propagated into FastAPI's threadpool)
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar("current_request_queries", default=None)
+
+
+class QueryStats:
+    """
+    Collects SQL timing from SQLAlchemy cursor events.
+
+    - Per normalized statement: count, total/max latency, latency histogram
+    - Slow query log (statements over SQL_SLOW_QUERY_MS)
+    - Per route: number of requests and queries per request
+
+    Statement literals are already bound parameters, so statements are only
+    normalized for whitespace and expanded IN lists.
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: Optional[float] = None,
+        max_statements: Optional[int] = None,
+        slow_log_size: Optional[int] = None
+    ):
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else settings.SQL_SLOW_QUERY_MS
+        self.max_statements = max_statements or settings.SQL_METRICS_MAX_STATEMENTS
+        self._lock = threading.Lock()
+        self._statements: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._slow: deque = deque(maxlen=slow_log_size or settings.SQL_SLOW_QUERY_LOG_SIZE)
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._started_at = datetime.utcnow()
+
+    # =========================================================================
+    # ENGINE HOOKS
+    # =========================================================================
+
+    def install(self, engine: Engine):
+        """Attach cursor execute listeners to an engine."""
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("query_start_time")
+            if not starts:
+                return
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            self.record(statement, elapsed_ms)
+
+    @staticmethod
+    def normalize(statement: str) -> str:
+        """Collapse whitespace and variable-length IN lists so similar statements group."""
+        statement = re.sub(r"\s+", " ", statement).strip()
+        statement = re.sub(r"\((?:\?, )+\?\)", "(?...)", statement)
+        return statement[:500]
+
+    def record(self, statement: str, elapsed_ms: float):
+        """Record one executed statement."""
+        request = _current_request.get()
+        if request is not None:
+            request.add(elapsed_ms)
+
+        key = self.normalize(statement)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+                self._statements[key] = stats
+                while len(self._statements) > self.max_statements:
+                    self._statements.popitem(last=False)
+            else:
+                self._statements.move_to_end(key)
+
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["histogram"][self._bucket(elapsed_ms)] += 1
+
+            if elapsed_ms >= self.slow_query_ms:
+                self._slow.append({
+                    "statement": key,
+                    "ms": round(elapsed_ms, 3),
+                    "at": datetime.utcnow().isoformat()
+                })
+
+        if elapsed_ms >= self.slow_query_ms:
+            print(f"🐢 Slow query ({elapsed_ms:.1f} ms): {key[:200]}")
+
+    @staticmethod
+    def _bucket(elapsed_ms: float) -> int:
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                return i
+        return len(LATENCY_BUCKETS_MS)
+
+    # =========================================================================
+    # REQUEST TRACKING
+    # =========================================================================
+
+    @contextmanager
+    def track(self) -> Iterator[RequestQueries]:
+        """
+        Count the queries executed in this context (and threadpool calls made from it).
+
+        Usage:
+            with query_stats.track() as queries:
+                ...
+            queries.count
+        """
+        queries = RequestQueries()
+        token = _current_request.set(queries)
+        try:
+            yield queries
+        finally:
+            _current_request.reset(token)
+
+    def record_request(self, route: str, queries: RequestQueries):
+        """Aggregate the query count of a finished request under its route."""
+        with self._lock:
+            stats = self._routes.setdefault(route, {"requests": 0, "queries": 0, "max_queries": 0, "query_ms": 0.0})
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            stats["query_ms"] += queries.total_ms
+
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+
+    def snapshot(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        Current metrics.
+
+        Returns:
+            Dict with top statements by total time, slow queries and per-route counts
+        """
+        buckets = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+
+        with self._lock:
+            statements = sorted(self._statements.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            top: List[Dict[str, Any]] = [
+                {
+                    "statement": statement,
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "histogram": dict(zip(buckets, stats["histogram"]))
+                }
+                for statement, stats in statements[:limit]
+            ]
+            routes = {
+                route: {
+                    "requests": stats["requests"],
+                    "avg_queries": round(stats["queries"] / stats["requests"], 2),
+                    "max_queries": stats["max_queries"],
+                    "avg_query_ms": round(stats["query_ms"] / stats["requests"], 3)
+                }
+                for route, stats in sorted(self._routes.items())
+            }
+            return {
+                "since": self._started_at.isoformat(),
+                "slow_query_ms": self.slow_query_ms,
+                "total_queries": sum(stats["count"] for _, stats in statements),
+                "statements": top,
+                "slow_queries": list(self._slow)[::-1],
+                "routes": routes
+            }
+
+    def reset(self):
+        """Clear all collected metrics."""
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+            self._routes.clear()
+            self._started_at = datetime.utcnow()
+
+
+# Singleton instance
+query_stats = QueryStats()
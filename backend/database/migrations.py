@@ -0,0 +1,149 @@
+"""Schema migrations - Bring existing SQLite databases up to the current models."""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import Connection, Engine
+
+
+# =============================================================================
+# HELPERS (usable from migrations)
+# =============================================================================
+
+def get_schema_version(connection: Connection) -> int:
+    """Schema version stored in the database header (PRAGMA user_version)."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def set_schema_version(connection: Connection, version: int):
+    connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def column_exists(connection: Connection, table: str, column: str) -> bool:
+    rows = connection.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def add_column(connection: Connection, table: str, column: str, ddl: str) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN if the column is missing.
+
+    Args:
+        connection: Open connection (inside the migration transaction)
+        table: Table name
+        column: Column name
+        ddl: Column type and constraints, e.g. "DATETIME" or "INTEGER DEFAULT 0"
+            (SQLite only allows constant defaults and no PRIMARY KEY/UNIQUE)
+
+    Returns:
+        True if the column was added
+    """
+    if column_exists(connection, table, column):
+        return False
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return True
+
+
+def create_missing_indexes(connection: Connection, metadata: MetaData) -> List[str]:
+    """
+    Create every index declared on the models that the database lacks.
+
+    `create_all` only creates indexes together with new tables, so indexes
+    added to existing models would never reach deployed databases otherwise.
+
+    Returns:
+        Names of the created indexes
+    """
+    existing = {
+        row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    tables = {
+        row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    created = []
+    for table in metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                index.create(bind=connection)
+                created.append(index.name)
+    return created
+
+
+# =============================================================================
+# MIGRATIONS
+# =============================================================================
+
+def _backfill_updated_at(connection: Connection):
+    """Rows created before updated_at had an insert default have NULL there."""
+    for table in ("univers", "univers_assets"):
+        connection.exec_driver_sql(
+            f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL"
+        )
+
+
+def _add_job_lease_columns(connection: Connection):
+    """Durable job queue: task payload, priority, attempts and lease/heartbeat."""
+    add_column(connection, "jobs", "payload", "TEXT")
+    add_column(connection, "jobs", "priority", "INTEGER DEFAULT 0")
+    add_column(connection, "jobs", "attempts", "INTEGER DEFAULT 0")
+    add_column(connection, "jobs", "lease_owner", "VARCHAR(64)")
+    add_column(connection, "jobs", "lease_expires_at", "DATETIME")
+    add_column(connection, "jobs", "heartbeat_at", "DATETIME")
+
+
+# (version, description, upgrade). Append only; never renumber.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Backfill univers/asset updated_at from created_at", _backfill_updated_at),
+    (2, "Add job queue lease/heartbeat columns", _add_job_lease_columns),
+]
+
+
+def run_migrations(engine: Engine, metadata: Optional[MetaData] = None) -> Dict[str, object]:
+    """
+    Upgrade the database schema. Call after `create_all`.
+
+    Each pending migration runs in its own transaction together with the
+    user_version bump, then missing declared indexes are created.
+
+    Args:
+        engine: Target engine
+        metadata: Declared models (default: Base.metadata)
+
+    Returns:
+        Dict with from_version, to_version, applied migrations and created indexes
+    """
+    if metadata is None:
+        from .connection import Base
+        metadata = Base.metadata
+
+    with engine.connect() as connection:
+        from_version = get_schema_version(connection)
+
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if version <= from_version:
+            continue
+        with engine.begin() as connection:
+            upgrade(connection)
+            set_schema_version(connection, version)
+        applied.append(version)
+        print(f"🛠️  Migration {version}: {description}")
+
+    with engine.begin() as connection:
+        created = create_missing_indexes(connection, metadata)
+        if created:
+            print(f"🛠️  Created indexes: {', '.join(created)}")
+            connection.exec_driver_sql("PRAGMA optimize")  # Refresh planner statistics
+        to_version = get_schema_version(connection)
+
+    return {
+        "from_version": from_version,
+        "to_version": to_version,
+        "applied": applied,
+        "created_indexes": created
+    }
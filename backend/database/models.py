@@ -3,8 +3,8 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import (
-    Column, Integer, BigInteger, String, Text, Boolean,
-    DateTime, ForeignKey, Enum, CheckConstraint, UniqueConstraint
+    Column, Integer, BigInteger, String, Text, Boolean, Float,
+    DateTime, ForeignKey, Enum, CheckConstraint, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -21,6 +21,7 @@ class JobStatus(str, PyEnum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class Language(str, PyEnum):
@@ -42,7 +43,7 @@ class Univers(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)  # Sync watermark (full precision)
     name = Column(Text, nullable=False)
     slug = Column(Text, nullable=False, unique=True, index=True)
     thumbnail_url = Column(Text)
@@ -78,6 +79,11 @@ class Univers(Base):
         back_populates="univers",
         cascade="all, delete-orphan"
     )
+    
+    # Keyset pagination (newest first)
+    __table_args__ = (
+        Index("ix_univers_created_at_id", "created_at", "id"),
+    )
 
 
 # ============================================================================
@@ -94,6 +100,10 @@ class UniversPrompts(Base):
     default_video_prompt = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_univers_prompts_univers_id", "univers_id"),
+    )
+    
     # Relationships
     univers = relationship("Univers", back_populates="prompts")
 
@@ -117,6 +127,7 @@ class UniversTranslation(Base):
             "language IN ('fr', 'en', 'es', 'it', 'de')",
             name="valid_language"
         ),
+        Index("ix_univers_translations_univers_id_language", "univers_id", "language"),
     )
     
     # Relationships
@@ -137,7 +148,12 @@ class UniversAsset(Base):
     image_name = Column(Text, nullable=False)  # Filename in storage
     display_name = Column(Text, nullable=False)  # Default display name
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)  # Sync watermark (full precision)
+    
+    # Relationship loads filter on univers_id and order by sort_order
+    __table_args__ = (
+        Index("ix_univers_assets_univers_id_sort_order", "univers_id", "sort_order"),
+    )
     
     # Relationships
     univers = relationship("Univers", back_populates="assets")
@@ -192,6 +208,7 @@ class UniversAssetTranslation(Base):
             "language IN ('fr', 'en', 'es', 'it', 'de')",
             name="valid_asset_language"
         ),
+        Index("ix_univers_assets_translations_asset_id_language", "asset_id", "language"),
     )
 
     # Relationships
@@ -247,3 +264,66 @@ class Job(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
+    
+    # Durable queue (see JobService.recover)
+    payload = Column(Text)  # JSON task arguments (NULL = ad-hoc task, not resumable)
+    priority = Column(Integer, default=0)
+    attempts = Column(Integer, default=0)  # Times a worker claimed the job
+    lease_owner = Column(String(64))  # Process holding the job (queued or running)
+    lease_expires_at = Column(DateTime(timezone=True))  # Recovered once past this without a heartbeat
+    heartbeat_at = Column(DateTime(timezone=True))
+    
+    # Keyset pagination (newest first), optionally filtered by universe or status
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_univers_slug_created_at", "univers_slug", "created_at", "id"),
+        Index("ix_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_jobs_status_lease_expires_at", "status", "lease_expires_at"),
+    )
+
+
+# ============================================================================
+# TRANSLATION MEMORY (Persistent translation cache, local only)
+# ============================================================================
+
+class TranslationMemory(Base):
+    """Cached machine translation keyed by language pair and normalized text."""
+    __tablename__ = "translation_memory"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_lang = Column(String(5), nullable=False)
+    target_lang = Column(String(5), nullable=False)
+    source_text = Column(Text, nullable=False)  # Normalized source text
+    translated_text = Column(Text, nullable=False)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("source_lang", "target_lang", "source_text", name="unique_translation_key"),
+    )
+
+
+# ============================================================================
+# MEDIA MANIFEST (Per-file state for delta media sync, local only)
+# ============================================================================
+
+class MediaManifestEntry(Base):
+    """Size/mtime/hash of one media file, plus its state at the last sync."""
+    __tablename__ = "media_manifest"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    univers_slug = Column(String(100), nullable=False, index=True)
+    path = Column(Text, nullable=False)  # Relative to bucket: "{slug}/file.png"
+    size = Column(BigInteger, nullable=True)
+    mtime = Column(Float, nullable=True)
+    sha256 = Column(String(64), nullable=True)  # None = file missing locally
+    synced_sha256 = Column(String(64), nullable=True)  # Local hash at last push/pull
+    remote_etag = Column(Text, nullable=True)  # Remote eTag at last push/pull
+    synced_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("univers_slug", "path", name="unique_manifest_path"),
+    )
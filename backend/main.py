@@ -8,14 +8,15 @@ A clean FastAPI backend with:
 - Bidirectional sync with Supabase
 - AI content generation via Replicate
 """
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from config import settings
-from database import init_db
-from routes import universes_router, generation_router, sync_router, jobs_router
+from database import init_db, query_stats
+from routes import universes_router, generation_router, sync_router, jobs_router, metrics_router
 
 # Version for semantic release
 version = "2.0.0"
@@ -27,6 +28,8 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting MagikSwipe Backend...")
     init_db()
+    from services.job_service import job_service
+    job_service.recover()  # Resume jobs interrupted by a crash or restart
     print(f"📁 Storage path: {settings.STORAGE_PATH}")
     print(f"💾 Database: {settings.DB_PATH}")
     print(f"🪣 Buckets: {settings.BUCKETS_PATH}")
@@ -35,6 +38,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down...")
+    from services.generation_service import generation_service
+    # Blocking joins: run off the event loop so it keeps serving during the drain
+    await asyncio.to_thread(job_service.shutdown, settings.JOB_DRAIN_TIMEOUT)  # Before the loop the jobs run on
+    await asyncio.to_thread(generation_service.close)
 
 
 # Create FastAPI app
@@ -52,8 +59,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # Pagination headers readable by the viewer
 )
 
+# SQL query count per request (X-Query-Count header + /api/metrics/queries)
+if settings.SQL_METRICS_ENABLED:
+    @app.middleware("http")
+    async def track_request_queries(request: Request, call_next):
+        with query_stats.track() as queries:
+            response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            query_stats.record_request(f"{request.method} {route.path}", queries)
+        response.headers["X-Query-Count"] = str(queries.count)
+        response.headers["X-Query-Time-Ms"] = f"{queries.total_ms:.2f}"
+        return response
+
 # Mount static files for local storage
 app.mount(
     "/storage/buckets",
@@ -66,6 +87,7 @@ app.include_router(universes_router, prefix="/api")
 app.include_router(generation_router, prefix="/api")
 app.include_router(sync_router, prefix="/api")
 app.include_router(jobs_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 
 # Admin router (dangerous operations - use with caution)
 from routes.admin import router as admin_router
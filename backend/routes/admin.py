@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from database import get_db, Univers, UniversAsset, UniversAssetPrompts, UniversAssetTranslation, UniversTranslation, UniversPrompts, UniversMusicPrompts
+from services.response_cache import response_cache
 from services.storage_service import storage_service
 from services.supabase_service import supabase_service
 
@@ -78,6 +79,7 @@ def cleanup_local_universe(slug: str, db: Session) -> Dict[str, Any]:
         # 6. Delete the universe
         db.delete(univers)
         db.commit()
+        response_cache.invalidate_universe(slug)
 
         # 7. Delete local files after successful DB cleanup
         files_deleted = storage_service.delete_universe_folder(slug)
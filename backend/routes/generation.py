@@ -1,4 +1,5 @@
 """Generation routes - AI content generation endpoints."""
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
@@ -12,11 +13,112 @@ from schemas import (
 )
 from services.generation_service import generation_service
 from services.job_service import job_service
+from services.response_cache import response_cache
 from services.storage_service import storage_service
+from services.translation_cache import translation_cache
 
 router = APIRouter(prefix="/generate", tags=["generation"])
 
 
+# =============================================================================
+# JOB TASKS
+# =============================================================================
+# Registered on the job service so queued jobs can be resumed after a
+# restart: they only take JSON arguments, stored on the job row.
+
+@job_service.task("generate_images")
+def run_generate_images(job_id, slug, concepts, prompts, theme_context, resume=False):
+    paths = generation_service.generate_all_images(
+        slug=slug,
+        concepts=concepts,
+        prompts=prompts,
+        job_id=job_id,
+        theme_context=theme_context,
+        skip_existing=resume
+    )
+    return [str(path) for path in paths]
+
+
+@job_service.task("generate_videos")
+def run_generate_videos(job_id, slug, concepts, prompts, resume=False):
+    paths = generation_service.generate_all_videos(
+        slug=slug,
+        concepts=concepts,
+        prompts=prompts,
+        job_id=job_id,
+        skip_existing=resume
+    )
+    return [str(path) for path in paths]
+
+
+@job_service.task("generate_music")
+def run_generate_music(job_id, slug, language, style, resume=False):
+    existing = storage_service.get_music_file_path(slug, language)
+    if resume and existing.exists():
+        return str(existing)
+    return str(generation_service.generate_music(
+        slug=slug,
+        language=language,
+        style=style,
+        job_id=job_id
+    ))
+
+
+@job_service.task("generate_all")
+def run_generate_all(job_id, slug, theme, count, generate_videos, generate_music, concepts=None, resume=False):
+    # Generate content (concepts are checkpointed so a resumed job keeps them)
+    result = generation_service.generate_universe_content(
+        slug=slug,
+        theme=theme,
+        concept_count=count,
+        generate_videos=generate_videos,
+        generate_music=generate_music,
+        job_id=job_id,
+        concepts=concepts,
+        on_concepts=lambda generated: job_service.save_checkpoint(job_id, concepts=generated),
+        skip_existing=resume
+    )
+    
+    # Create assets in database
+    from database import SessionLocal
+    db_session = SessionLocal()
+    try:
+        # Get fresh universe
+        univ = db_session.query(Univers).filter(Univers.slug == slug).first()
+        
+        # Delete existing assets
+        db_session.query(UniversAsset).filter(UniversAsset.univers_id == univ.id).delete()
+        
+        # Create new assets
+        for i, concept in enumerate(result["concepts"]):
+            asset = UniversAsset(
+                univers_id=univ.id,
+                sort_order=i + 1,
+                image_name=f"asset_{i+1:03d}.png",
+                display_name=concept
+            )
+            db_session.add(asset)
+            db_session.flush()
+            
+            # Add translations
+            for lang, translations in result["translations"].items():
+                if i < len(translations):
+                    trans = UniversAssetTranslation(
+                        asset_id=asset.id,
+                        language=lang,
+                        display_name=translations[i]
+                    )
+                    db_session.add(trans)
+        
+        univ.updated_at = datetime.utcnow()  # Assets replaced: invalidate universe ETags
+        db_session.commit()
+    finally:
+        db_session.close()
+    response_cache.invalidate_universe(slug)
+    
+    return result
+
+
 # =============================================================================
 # CONCEPT GENERATION
 # =============================================================================
@@ -111,7 +213,9 @@ def apply_concepts(
         
         created += 1
     
+    univers.updated_at = datetime.utcnow()  # Assets replaced: invalidate universe ETags
     db.commit()
+    response_cache.invalidate_universe(slug)
     
     return {
         "success": True,
@@ -167,22 +271,17 @@ def generate_images(
         else:
             prompts.append(None)
     
-    # Create and run job
-    def task(job_id):
-        return generation_service.generate_all_images(
-            slug=slug,
-            concepts=concepts,
-            prompts=prompts,
-            job_id=job_id,
-            theme_context=univers.name
-        )
-    
-    job = job_service.run_async(
+    # Create and queue job
+    job = job_service.enqueue(
         db=db,
         job_type="generate_images",
-        task_func=task,
         univers_slug=slug,
-        total_steps=len(assets)
+        preempt=data.preempt,
+        total_steps=len(assets),
+        slug=slug,
+        concepts=concepts,
+        prompts=prompts,
+        theme_context=univers.name
     )
     
     return JobResponse(
@@ -194,7 +293,8 @@ def generate_images(
         total_steps=job.total_steps,
         current_step=job.current_step,
         message=job.message,
-        created_at=job.created_at
+        created_at=job.created_at,
+        queue_position=job_service.queue_position(job.id)
     )
 
 
@@ -252,21 +352,16 @@ def generate_videos(
         else:
             prompts.append(None)
     
-    # Create and run job
-    def task(job_id):
-        return generation_service.generate_all_videos(
-            slug=slug,
-            concepts=concepts,
-            prompts=prompts,
-            job_id=job_id
-        )
-    
-    job = job_service.run_async(
+    # Create and queue job
+    job = job_service.enqueue(
         db=db,
         job_type="generate_videos",
-        task_func=task,
         univers_slug=slug,
-        total_steps=len(existing_images)
+        preempt=data.preempt,
+        total_steps=len(existing_images),
+        slug=slug,
+        concepts=concepts,
+        prompts=prompts
     )
     
     return JobResponse(
@@ -278,7 +373,8 @@ def generate_videos(
         total_steps=job.total_steps,
         current_step=job.current_step,
         message=job.message,
-        created_at=job.created_at
+        created_at=job.created_at,
+        queue_position=job_service.queue_position(job.id)
     )
 
 
@@ -301,19 +397,16 @@ def generate_music(
     if not generation_service.is_available:
         raise HTTPException(status_code=503, detail="AI generation not available")
     
-    def task(job_id):
-        return str(generation_service.generate_music(
-            slug=slug,
-            language=data.language.value,
-            style=data.style
-        ))
-    
-    job = job_service.run_async(
+    job = job_service.enqueue(
         db=db,
         job_type="generate_music",
-        task_func=task,
         univers_slug=slug,
-        total_steps=1
+        preempt=data.preempt,
+        preempt_keys=("language",),  # One music job per language
+        total_steps=1,
+        slug=slug,
+        language=data.language.value,
+        style=data.style
     )
     
     return JobResponse(
@@ -325,7 +418,8 @@ def generate_music(
         total_steps=job.total_steps,
         current_step=job.current_step,
         message=job.message,
-        created_at=job.created_at
+        created_at=job.created_at,
+        queue_position=job_service.queue_position(job.id)
     )
 
 
@@ -357,67 +451,24 @@ def generate_all(
     if not generation_service.is_available:
         raise HTTPException(status_code=503, detail="AI generation not available")
     
-    def task(job_id):
-        # Generate content
-        result = generation_service.generate_universe_content(
-            slug=slug,
-            theme=data.theme,
-            concept_count=data.count,
-            generate_videos=data.generate_videos,
-            generate_music=data.generate_music,
-            job_id=job_id
-        )
-        
-        # Create assets in database
-        from database import SessionLocal
-        db_session = SessionLocal()
-        try:
-            # Get fresh universe
-            univ = db_session.query(Univers).filter(Univers.slug == slug).first()
-            
-            # Delete existing assets
-            db_session.query(UniversAsset).filter(UniversAsset.univers_id == univ.id).delete()
-            
-            # Create new assets
-            for i, concept in enumerate(result["concepts"]):
-                asset = UniversAsset(
-                    univers_id=univ.id,
-                    sort_order=i + 1,
-                    image_name=f"asset_{i+1:03d}.png",
-                    display_name=concept
-                )
-                db_session.add(asset)
-                db_session.flush()
-                
-                # Add translations
-                for lang, translations in result["translations"].items():
-                    if i < len(translations):
-                        trans = UniversAssetTranslation(
-                            asset_id=asset.id,
-                            language=lang,
-                            display_name=translations[i]
-                        )
-                        db_session.add(trans)
-            
-            db_session.commit()
-        finally:
-            db_session.close()
-        
-        return result
-    
-    # Estimate total steps
-    total = data.count * 2  # concepts + images
+    # Estimate total steps (refined once concepts are generated)
+    total = data.count  # images
     if data.generate_videos:
         total += data.count
     if data.generate_music:
         total += 5  # 5 languages
     
-    job = job_service.run_async(
+    job = job_service.enqueue(
         db=db,
         job_type="generate_all",
-        task_func=task,
         univers_slug=slug,
-        total_steps=total
+        preempt=data.preempt,
+        total_steps=total,
+        slug=slug,
+        theme=data.theme,
+        count=data.count,
+        generate_videos=data.generate_videos,
+        generate_music=data.generate_music
     )
     
     return JobResponse(
@@ -429,7 +480,8 @@ def generate_all(
         total_steps=job.total_steps,
         current_step=job.current_step,
         message=job.message,
-        created_at=job.created_at
+        created_at=job.created_at,
+        queue_position=job_service.queue_position(job.id)
     )
 
 
@@ -454,21 +506,24 @@ def translate_lyrics(
     if not univers:
         raise HTTPException(status_code=404, detail=f"Universe '{slug}' not found")
     
-    if not generation_service.is_available:
-        raise HTTPException(status_code=503, detail="AI generation not available")
-    
     if "lyrics" not in data:
         raise HTTPException(status_code=400, detail="Missing 'lyrics' field")
     
+    # Without AI configured, only the translation memory can answer
     try:
         translated = generation_service.translate_text(
             text=data["lyrics"],
             source_lang="fr",  # Assume French source
-            target_lang=language
+            target_lang=language,
+            cached_only=not generation_service.is_available
         )
-        return {"lyrics": translated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+    
+    if translated is None:
+        raise HTTPException(status_code=503, detail="AI generation not available")
+    
+    return {"lyrics": translated}
 
 
 @router.post("/translate-text")
@@ -478,20 +533,29 @@ def translate_text(data: dict):
     
     Used by frontend for translating music prompts and other text.
     """
-    if not generation_service.is_available:
-        raise HTTPException(status_code=503, detail="AI generation not available")
-    
     required_fields = ["text", "source", "target"]
     for field in required_fields:
         if field not in data:
             raise HTTPException(status_code=400, detail=f"Missing '{field}' field")
     
+    # Without AI configured, only the translation memory can answer
     try:
         translated = generation_service.translate_text(
             text=data["text"],
             source_lang=data["source"],
-            target_lang=data["target"]
+            target_lang=data["target"],
+            cached_only=not generation_service.is_available
         )
-        return {"translated": translated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+    
+    if translated is None:
+        raise HTTPException(status_code=503, detail="AI generation not available")
+    
+    return {"translated": translated}
+
+
+@router.get("/translation-cache/stats")
+def translation_cache_stats():
+    """Translation memory hit/miss counters and sizes."""
+    return translation_cache.stats()
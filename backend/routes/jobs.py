@@ -1,23 +1,55 @@
 """Jobs routes - Async job tracking endpoints."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import json
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from database import get_db, Job, JobStatus
+from config import settings
+from database import get_db, Job, JobStatus, SessionLocal
 from schemas import JobResponse
+from services.job_events import FINAL_STATUSES, format_sse, job_events
 from services.job_service import job_service
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
+def to_job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        type=job.type,
+        univers_slug=job.univers_slug,
+        status=job.status,
+        progress=job.progress,
+        total_steps=job.total_steps,
+        current_step=job.current_step,
+        message=job.message,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        queue_position=job_service.queue_position(job.id)
+    )
+
+
 @router.get("", response_model=List[JobResponse])
 def list_jobs(
+    response: Response,
     univers_slug: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    with_total: bool = Query(False, description="Add X-Total-Count (runs a COUNT)"),
     db: Session = Depends(get_db)
 ):
-    """List all jobs with optional filters."""
+    """
+    List jobs with optional filters, newest first.
+    
+    Paginated by cursor: the `X-Next-Cursor` response header (absent on the
+    last page) is passed back as `cursor` to get the next page.
+    """
     job_status = None
     if status:
         try:
@@ -25,30 +57,23 @@ def list_jobs(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     
-    jobs = job_service.get_jobs(
-        db=db,
-        univers_slug=univers_slug,
-        status=job_status,
-        limit=limit
-    )
-    
-    return [
-        JobResponse(
-            id=j.id,
-            type=j.type,
-            univers_slug=j.univers_slug,
-            status=j.status,
-            progress=j.progress,
-            total_steps=j.total_steps,
-            current_step=j.current_step,
-            message=j.message,
-            error=j.error,
-            created_at=j.created_at,
-            started_at=j.started_at,
-            completed_at=j.completed_at
+    try:
+        jobs, next_cursor = job_service.get_jobs(
+            db=db,
+            univers_slug=univers_slug,
+            status=job_status,
+            limit=limit,
+            cursor=cursor
         )
-        for j in jobs
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if with_total:
+        response.headers["X-Total-Count"] = str(job_service.count_jobs(db, univers_slug, job_status))
+    
+    return [to_job_response(j) for j in jobs]
 
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -62,22 +87,199 @@ def get_job(
     if not job:
         raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
     
-    return JobResponse(
-        id=job.id,
-        type=job.type,
-        univers_slug=job.univers_slug,
-        status=job.status,
-        progress=job.progress,
-        total_steps=job.total_steps,
-        current_step=job.current_step,
-        message=job.message,
-        error=job.error,
-        created_at=job.created_at,
-        started_at=job.started_at,
-        completed_at=job.completed_at
+    return to_job_response(job)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a pending or running job.
+    
+    The job is `cancelled` at once; a running job stops at its next step
+    and its in-flight Replicate predictions are cancelled.
+    """
+    job = job_service.get_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    
+    if not job_service.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' already finished")
+    
+    db.refresh(job)
+    return to_job_response(job)
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+def _job_snapshot(job_id: str) -> Optional[Dict]:
+    """Current job state as JSON-ready dict (blocking DB read)."""
+    db = SessionLocal()
+    try:
+        job = job_service.get_job(db, job_id)
+        return to_job_response(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream a job's progress as Server-Sent Events (`event: job`).
+    
+    The first event is the full job (skipped when the `Last-Event-ID` of a
+    reconnecting client is still the latest); the next ones carry only the
+    changed fields. A `: ping` comment is sent every JOB_EVENTS_HEARTBEAT
+    seconds while idle; the stream ends once the job is completed, failed or
+    cancelled.
+    Updates faster than the client reads are merged, never queued.
+    
+    No database session is held while the stream is open: each read uses
+    a short-lived one, so idle watchers do not take pooled connections.
+    """
+    if await run_in_threadpool(_job_snapshot, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    
+    async def events():
+        subscription = job_events.subscribe([job_id])
+        try:
+            # Subscribe before reading the state: no update falls in between
+            latest_id = job_events.last_event_id(job_id)
+            snapshot = await run_in_threadpool(_job_snapshot, job_id)
+            if snapshot is None:
+                return
+            if last_event_id is None or last_event_id != latest_id:
+                yield format_sse(json.dumps(snapshot), "job", latest_id, settings.JOB_EVENTS_RETRY_MS)
+            if snapshot["status"] in FINAL_STATUSES:
+                return
+            
+            while True:
+                batch = await subscription.get(timeout=settings.JOB_EVENTS_HEARTBEAT)
+                if not batch:
+                    yield ": ping\n\n"
+                    continue
+                for _, event_id, fields in batch:
+                    yield format_sse(json.dumps(fields), "job", event_id)
+                    if fields.get("status") in FINAL_STATUSES:
+                        return
+        finally:
+            job_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+def _parse_ws_message(text: str) -> Dict:
+    """
+    Validate a client WebSocket message.
+    
+    Returns:
+        {"subscribe": [...], "unsubscribe": [...], "last_event_ids": {...}}
+    
+    Raises:
+        ValueError: Not JSON, or not the expected shape
+    """
+    try:
+        message = json.loads(text)
+    except ValueError:
+        raise ValueError("Invalid JSON")
+    if not isinstance(message, dict):
+        raise ValueError("Message must be a JSON object")
+    
+    parsed = {}
+    for field in ("subscribe", "unsubscribe"):
+        job_ids = message.get(field) or []
+        if not isinstance(job_ids, list) or not all(isinstance(j, str) for j in job_ids):
+            raise ValueError(f"'{field}' must be a list of job IDs")
+        parsed[field] = job_ids
+    last_ids = message.get("last_event_ids") or {}
+    if not isinstance(last_ids, dict):
+        raise ValueError("'last_event_ids' must be an object")
+    parsed["last_event_ids"] = last_ids
+    return parsed
+
+
+@router.websocket("/ws")
+async def jobs_websocket(websocket: WebSocket):
+    """
+    Follow several jobs over one WebSocket.
+    
+    Client messages:
+    - `{"subscribe": [job_id, ...], "last_event_ids": {job_id: id}}`
+    - `{"unsubscribe": [job_id, ...]}`
+    
+    Server messages:
+    - `{"type": "job", "job_id", "event_id", "job": {...}}` (full job first,
+      then changed fields; the job is unsubscribed once it has finished)
+    - `{"type": "error", "job_id", "detail"}` for unknown jobs (`job_id`
+      null for a malformed client message; the socket stays open)
+    - `{"type": "ping"}` every JOB_EVENTS_HEARTBEAT seconds while idle
+    """
+    await websocket.accept()
+    subscription = job_events.subscribe([])
+    
+    async def send_snapshot(job_id: str, last_event_id: Optional[str]):
+        latest_id = job_events.last_event_id(job_id)
+        snapshot = await run_in_threadpool(_job_snapshot, job_id)
+        if snapshot is None:
+            job_events.unsubscribe(subscription, [job_id])
+            await websocket.send_json({"type": "error", "job_id": job_id, "detail": "Job not found"})
+            return
+        if last_event_id is None or last_event_id != latest_id:
+            await websocket.send_json({"type": "job", "job_id": job_id, "event_id": latest_id, "job": snapshot})
+        if snapshot["status"] in FINAL_STATUSES:
+            job_events.unsubscribe(subscription, [job_id])
+    
+    async def receive():
+        while True:
+            try:
+                message = _parse_ws_message(await websocket.receive_text())
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "job_id": None, "detail": str(e)})
+                continue
+            if message["unsubscribe"]:
+                job_events.unsubscribe(subscription, message["unsubscribe"])
+            if message["subscribe"]:
+                last_ids = message["last_event_ids"]
+                job_events.subscribe(message["subscribe"], subscription)
+                for job_id in message["subscribe"]:
+                    await send_snapshot(job_id, last_ids.get(job_id))
+    
+    async def send():
+        while True:
+            batch = await subscription.get(timeout=settings.JOB_EVENTS_HEARTBEAT)
+            if not batch:
+                await websocket.send_json({"type": "ping"})
+                continue
+            for job_id, event_id, fields in batch:
+                await websocket.send_json({"type": "job", "job_id": job_id, "event_id": event_id, "job": fields})
+                if fields.get("status") in FINAL_STATUSES:
+                    job_events.unsubscribe(subscription, [job_id])
+    
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        job_events.unsubscribe(subscription)
+
+
 @router.delete("/cleanup")
 def cleanup_jobs(
     days: int = Query(7, ge=1, le=30),
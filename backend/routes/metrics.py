@@ -0,0 +1,60 @@
+"""Metrics routes - Runtime performance counters."""
+from fastapi import APIRouter, Query
+
+from database import query_stats
+from services.job_events import job_events
+from services.job_scheduler import job_scheduler
+from services.job_service import job_service
+from services.response_cache import response_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/queries")
+def get_query_metrics(limit: int = Query(20, ge=1, le=200)):
+    """
+    SQL query metrics since startup (or last reset).
+    
+    Returns the statements with the highest total time (count, avg/max
+    latency, histogram), recent slow queries and queries per request by route.
+    """
+    return query_stats.snapshot(limit=limit)
+
+
+@router.delete("/queries", status_code=204)
+def reset_query_metrics():
+    """Reset SQL query metrics."""
+    query_stats.reset()
+    return None
+
+
+@router.get("/cache")
+def get_cache_metrics():
+    """
+    Response cache metrics: hit rate (fresh + stale hits), entries, body
+    bytes held, evictions, invalidations and background refreshes.
+    """
+    return response_cache.snapshot()
+
+
+@router.delete("/cache", status_code=204)
+def clear_response_cache():
+    """Drop every cached response and reset the cache counters."""
+    response_cache.clear()
+    response_cache.reset_stats()
+    return None
+
+
+@router.get("/jobs")
+def get_job_metrics():
+    """
+    Job scheduler state: worker pool size, per-type limits, running jobs
+    (total and per type), queue length and age of the oldest queued job,
+    plus the progress buffer (updates coalesced into batched writes) and
+    the event bus feeding streaming clients.
+    """
+    return {
+        **job_scheduler.snapshot(),
+        "progress": job_service.progress.snapshot(),
+        "events": job_events.snapshot()
+    }
@@ -3,13 +3,23 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from database import get_db
-from schemas import SyncRequest, SyncResponse, SyncInitResponse
+from schemas import SyncRequest, SyncResponse, SyncInitResponse, JobResponse
 from services.sync_service import sync_service
 from services.supabase_service import supabase_service
+from services.job_service import job_service
 
 router = APIRouter(prefix="/sync", tags=["sync"])
 
 
+@job_service.task("sync_pull_all")
+def run_sync_pull_all(job_id, resume=False):
+    # A full pull is idempotent: a resumed job simply pulls again
+    result = sync_service.pull_all(job_id=job_id)
+    if not result.success:
+        raise RuntimeError(result.message)
+    return result.model_dump()
+
+
 @router.get("/status")
 def get_sync_status():
     """Check Supabase connection status."""
@@ -35,7 +45,7 @@ def sync_init(
             detail="Supabase not connected. Configure SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY."
         )
     
-    result = sync_service.pull_all(db)
+    result = sync_service.pull_all()
     
     if not result.success:
         raise HTTPException(status_code=500, detail=result.message)
@@ -43,6 +53,41 @@ def sync_init(
     return result
 
 
+@router.post("/init/async", response_model=JobResponse)
+def sync_init_async(
+    db: Session = Depends(get_db)
+):
+    """
+    Initialize local database from Supabase as a background job.
+    
+    Same as /init, but returns immediately with a job to poll
+    (one step per universe, SyncInitResponse as result).
+    """
+    if not supabase_service.is_connected:
+        raise HTTPException(
+            status_code=503,
+            detail="Supabase not connected. Configure SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY."
+        )
+    
+    job = job_service.enqueue(
+        db=db,
+        job_type="sync_pull_all"
+    )
+    
+    return JobResponse(
+        id=job.id,
+        type=job.type,
+        univers_slug=job.univers_slug,
+        status=job.status,
+        progress=job.progress,
+        total_steps=job.total_steps,
+        current_step=job.current_step,
+        message=job.message,
+        created_at=job.created_at,
+        queue_position=job_service.queue_position(job.id)
+    )
+
+
 @router.post("/pull/{slug}", response_model=SyncResponse)
 def sync_pull(
     slug: str,
@@ -1,7 +1,9 @@
 """Universe routes - CRUD operations for universes and assets."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
 from slugify import slugify
 
 from database import get_db, Univers, UniversPrompts, UniversTranslation, UniversAsset, UniversAssetPrompts, UniversAssetTranslation, UniversMusicPrompts
@@ -10,10 +12,25 @@ from schemas import (
     AssetCreate, AssetUpdate, AssetResponse, AssetListResponse,
     UniversMusicPromptsCreate, UniversMusicPromptsUpdate, UniversMusicPromptsResponse
 )
+from services.response_cache import CachedResponse, response_cache
 from services.storage_service import storage_service
+from utils.http_cache import make_etag, not_modified_response, set_validators
+from utils.pagination import keyset_page
 
 router = APIRouter(prefix="/universes", tags=["universes"])
 
+# Eager-loading plans: one query per relation instead of one per row
+UNIVERS_RESPONSE_OPTIONS = (
+    joinedload(Univers.prompts),
+    selectinload(Univers.translations),
+    selectinload(Univers.music_prompts),
+    selectinload(Univers.assets),
+)
+ASSET_RESPONSE_OPTIONS = (
+    joinedload(UniversAsset.prompts),
+    selectinload(UniversAsset.translations),
+)
+
 
 # =============================================================================
 # UNIVERSE CRUD
@@ -21,19 +38,67 @@ router = APIRouter(prefix="/universes", tags=["universes"])
 
 @router.get("", response_model=UniversListResponse)
 def list_universes(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     is_public: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    with_total: bool = Query(True, description="Include the total count (runs a COUNT)"),
     db: Session = Depends(get_db)
 ):
-    """List all universes with pagination."""
+    """
+    List universes, newest first (response cache + conditional GET via ETag).
+    
+    Paginated by cursor: pass `next_cursor` back as `cursor` for the next
+    page. `skip` is still honoured (applied after the cursor) for older
+    clients, but deep offsets scan every skipped row.
+    """
+    page = (skip, limit, is_public, cursor, with_total)
+    key = ("universes",) + page
+    entry = response_cache.get(key, refresh=lambda session: _build_list_entry(session, *page))
+    if entry:
+        return _cached_response(request, entry)
+    
+    generation = response_cache.generation
+    etag, last_modified = _list_validators(db, *page)
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        return cached
+    
+    try:
+        entry = _build_list_entry(db, *page, validators=(etag, last_modified))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response_cache.put(key, entry, tags=["universes"], generation=generation)
+    return _cached_response(request, entry)
+
+
+def _build_list_entry(
+    db: Session,
+    skip: int,
+    limit: int,
+    is_public: Optional[bool],
+    cursor: Optional[str],
+    with_total: bool,
+    validators: Optional[Tuple[str, Optional[datetime]]] = None
+) -> CachedResponse:
+    """Build and serialize one page of the universe listing."""
+    validators = validators or _list_validators(db, skip, limit, is_public, cursor, with_total)
     query = db.query(Univers)
     
     if is_public is not None:
         query = query.filter(Univers.is_public == is_public)
     
-    total = query.count()
-    universes = query.order_by(Univers.created_at.desc()).offset(skip).limit(limit).all()
+    total = query.count() if with_total else None
+    universes, next_cursor = keyset_page(query, Univers.created_at, Univers.id, limit, cursor, offset=skip)
+    
+    # Asset counts for the whole page in one grouped query
+    asset_counts = dict(
+        db.query(UniversAsset.univers_id, func.count(UniversAsset.id))
+        .filter(UniversAsset.univers_id.in_([u.id for u in universes]))
+        .group_by(UniversAsset.univers_id)
+        .all()
+    ) if universes else {}
     
     items = []
     for u in universes:
@@ -43,11 +108,12 @@ def list_universes(
             slug=u.slug,
             thumbnail_url=u.thumbnail_url or storage_service.get_thumbnail_url(u.slug),
             is_public=u.is_public,
-            asset_count=len(u.assets),
+            asset_count=asset_counts.get(u.id, 0),
             last_synced_at=u.last_synced_at
         ))
     
-    return UniversListResponse(items=items, total=total)
+    body = UniversListResponse(items=items, total=total, next_cursor=next_cursor).model_dump_json().encode()
+    return CachedResponse(body, *validators)
 
 
 @router.post("", response_model=UniversResponse, status_code=201)
@@ -97,23 +163,50 @@ def create_universe(
     storage_service.create_universe_folder(slug)
     
     db.commit()
-    db.refresh(univers)
+    response_cache.invalidate_universe(slug)
     
-    return _build_univers_response(univers)
+    return _build_univers_response(_get_univers_full(db, slug))
 
 
 @router.get("/{slug}", response_model=UniversResponse)
 def get_universe(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Get a universe by slug with all relations."""
-    univers = db.query(Univers).filter(Univers.slug == slug).first()
+    """Get a universe by slug with all relations (response cache + conditional GET via ETag)."""
+    key = ("univers", slug)
+    entry = response_cache.get(key, refresh=lambda session: _build_univers_entry(session, slug))
+    if entry:
+        return _cached_response(request, entry)
     
-    if not univers:
+    generation = response_cache.generation
+    validators = _univers_validators(db, slug, "univers")
+    
+    if not validators:
         raise HTTPException(status_code=404, detail=f"Universe '{slug}' not found")
     
-    return _build_univers_response(univers)
+    cached = not_modified_response(request, *validators)
+    if cached:
+        return cached
+    
+    entry = _build_univers_entry(db, slug, validators)
+    response_cache.put(key, entry, tags=[f"univers:{slug}"], generation=generation)
+    return _cached_response(request, entry)
+
+
+def _build_univers_entry(
+    db: Session,
+    slug: str,
+    validators: Optional[Tuple[str, Optional[datetime]]] = None
+) -> Optional[CachedResponse]:
+    """Build and serialize a universe detail (None if it no longer exists)."""
+    validators = validators or _univers_validators(db, slug, "univers")
+    univers = _get_univers_full(db, slug)
+    if not validators or not univers:
+        return None
+    body = _build_univers_response(univers).model_dump_json().encode()
+    return CachedResponse(body, *validators)
 
 
 @router.patch("/{slug}", response_model=UniversResponse)
@@ -169,10 +262,11 @@ def update_universe(
             )
             db.add(trans)
     
+    _touch_univers(db, univers.id)
     db.commit()
-    db.refresh(univers)
+    response_cache.invalidate_universe(slug)
     
-    return _build_univers_response(univers)
+    return _build_univers_response(_get_univers_full(db, slug))
 
 
 @router.delete("/{slug}", status_code=204)
@@ -189,6 +283,7 @@ def delete_universe(
     # Delete from database (cascades to assets, translations, prompts)
     db.delete(univers)
     db.commit()
+    response_cache.invalidate_universe(slug)
     
     # Delete storage folder
     storage_service.delete_universe_folder(slug)
@@ -203,10 +298,25 @@ def delete_universe(
 @router.get("/{slug}/assets", response_model=List[AssetListResponse])
 def list_assets(
     slug: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """List all assets in a universe."""
-    univers = db.query(Univers).filter(Univers.slug == slug).first()
+    """List all assets in a universe (conditional GET via ETag)."""
+    validators = _univers_validators(db, slug, "assets")
+    
+    if not validators:
+        raise HTTPException(status_code=404, detail=f"Universe '{slug}' not found")
+    
+    cached = not_modified_response(request, *validators)
+    if cached:
+        return cached
+    set_validators(response, *validators)
+    
+    univers = db.query(Univers)\
+        .options(selectinload(Univers.assets))\
+        .filter(Univers.slug == slug)\
+        .first()
     
     if not univers:
         raise HTTPException(status_code=404, detail=f"Universe '{slug}' not found")
@@ -278,10 +388,11 @@ def create_asset(
             )
             db.add(trans)
     
+    _touch_univers(db, univers.id)
     db.commit()
-    db.refresh(asset)
+    response_cache.invalidate_universe(slug)
     
-    return _build_asset_response(asset, slug)
+    return _build_asset_response(_get_asset_full(db, slug, asset.id), slug)
 
 
 @router.get("/{slug}/assets/{asset_id}", response_model=AssetResponse)
@@ -291,10 +402,7 @@ def get_asset(
     db: Session = Depends(get_db)
 ):
     """Get a single asset by ID."""
-    asset = db.query(UniversAsset)\
-        .join(Univers)\
-        .filter(Univers.slug == slug, UniversAsset.id == asset_id)\
-        .first()
+    asset = _get_asset_full(db, slug, asset_id)
     
     if not asset:
         raise HTTPException(status_code=404, detail=f"Asset '{asset_id}' not found")
@@ -318,6 +426,9 @@ def update_asset(
     if not asset:
         raise HTTPException(status_code=404, detail=f"Asset '{asset_id}' not found")
     
+    # Prompt/translation edits don't touch the asset row; bump it for incremental sync
+    asset.updated_at = datetime.utcnow()
+
     # Update basic fields
     if data.display_name is not None:
         asset.display_name = data.display_name
@@ -351,10 +462,11 @@ def update_asset(
             )
             db.add(trans)
     
+    _touch_univers(db, asset.univers_id)
     db.commit()
-    db.refresh(asset)
+    response_cache.invalidate_universe(slug)
     
-    return _build_asset_response(asset, slug)
+    return _build_asset_response(_get_asset_full(db, slug, asset_id), slug)
 
 
 @router.delete("/{slug}/assets/{asset_id}", status_code=204)
@@ -375,8 +487,10 @@ def delete_asset(
     image_name = asset.image_name
     
     # Delete from database
+    _touch_univers(db, asset.univers_id)
     db.delete(asset)
     db.commit()
+    response_cache.invalidate_universe(slug)
     
     # Delete files
     storage_service.delete_file(f"{slug}/{image_name}")
@@ -391,14 +505,22 @@ def delete_asset(
 # =============================================================================
 
 @router.get("/{slug}/music-prompts", response_model=List[UniversMusicPromptsResponse])
-def list_music_prompts(slug: str, db: Session = Depends(get_db)):
-    """List all music prompts for a universe."""
-    univers = db.query(Univers).filter(Univers.slug == slug).first()
+def list_music_prompts(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """List all music prompts for a universe (conditional GET via ETag)."""
+    validators = _univers_validators(db, slug, "music-prompts")
 
-    if not univers:
+    if not validators:
         raise HTTPException(status_code=404, detail=f"Universe '{slug}' not found")
 
-    return univers.music_prompts
+    cached = not_modified_response(request, *validators)
+    if cached:
+        return cached
+    set_validators(response, *validators)
+
+    return db.query(UniversMusicPrompts)\
+        .join(Univers)\
+        .filter(Univers.slug == slug)\
+        .all()
 
 
 @router.post("/{slug}/music-prompts", response_model=UniversMusicPromptsResponse, status_code=201)
@@ -431,7 +553,9 @@ def create_music_prompt(
         lyrics=data.lyrics
     )
     db.add(prompt)
+    _touch_univers(db, univers.id)
     db.commit()
+    response_cache.invalidate_universe(slug)
     db.refresh(prompt)
     return prompt
 
@@ -473,7 +597,9 @@ def update_music_prompt(
     if data.lyrics is not None:
         prompt.lyrics = data.lyrics
 
+    _touch_univers(db, prompt.univers_id)
     db.commit()
+    response_cache.invalidate_universe(slug)
     db.refresh(prompt)
     return prompt
 
@@ -490,8 +616,10 @@ def delete_music_prompt(slug: str, language: str, db: Session = Depends(get_db))
     if not prompt:
         raise HTTPException(status_code=404, detail=f"Music prompt for '{language}' not found")
 
+    _touch_univers(db, prompt.univers_id)
     db.delete(prompt)
     db.commit()
+    response_cache.invalidate_universe(slug)
     return None
 
 
@@ -499,6 +627,98 @@ def delete_music_prompt(slug: str, language: str, db: Session = Depends(get_db))
 # HELPERS
 # =============================================================================
 
+def _cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Serve a cached body, or 304 if the client already has it."""
+    cached = not_modified_response(request, entry.etag, entry.last_modified)
+    if cached:
+        return cached
+    response = Response(content=entry.body, media_type="application/json")
+    set_validators(response, entry.etag, entry.last_modified)
+    return response
+
+
+def _touch_univers(db: Session, univers_id: int):
+    """Bump Univers.updated_at after a change to its child rows (ETags, sync)."""
+    db.query(Univers)\
+        .filter(Univers.id == univers_id)\
+        .update({Univers.updated_at: datetime.utcnow()}, synchronize_session=False)
+
+
+def _univers_validators(db: Session, slug: str, view: str) -> Optional[Tuple[str, Optional[datetime]]]:
+    """
+    ETag and Last-Modified of a universe view, without loading its relations.
+    
+    Derived from Univers.updated_at (bumped by every child-row change), the
+    asset count/latest asset update and the storage folder version.
+    
+    Returns:
+        (etag, last_modified), or None if the universe does not exist
+    """
+    row = db.query(
+        Univers.id,
+        Univers.updated_at,
+        func.count(UniversAsset.id),
+        func.max(UniversAsset.updated_at)
+    )\
+        .outerjoin(UniversAsset, UniversAsset.univers_id == Univers.id)\
+        .filter(Univers.slug == slug)\
+        .group_by(Univers.id)\
+        .first()
+    
+    if row is None:
+        return None
+    
+    univers_id, updated_at, asset_count, assets_updated_at = row
+    etag = make_etag(
+        view, univers_id, updated_at, asset_count, assets_updated_at,
+        storage_service.get_universe_version(slug)
+    )
+    return etag, max(filter(None, [updated_at, assets_updated_at]), default=None)
+
+
+def _list_validators(
+    db: Session,
+    skip: int,
+    limit: int,
+    is_public: Optional[bool],
+    cursor: Optional[str] = None,
+    with_total: bool = True
+) -> Tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified of a universe listing page, from two aggregate queries."""
+    univers_query = db.query(func.count(Univers.id), func.max(Univers.updated_at))
+    if is_public is not None:
+        univers_query = univers_query.filter(Univers.is_public == is_public)
+    univers_count, updated_at = univers_query.one()
+    asset_count, assets_updated_at = db.query(
+        func.count(UniversAsset.id),
+        func.max(UniversAsset.updated_at)
+    ).one()
+    
+    etag = make_etag(
+        "universes", skip, limit, is_public, cursor, with_total,
+        univers_count, updated_at, asset_count, assets_updated_at,
+        storage_service.get_storage_version()
+    )
+    return etag, max(filter(None, [updated_at, assets_updated_at]), default=None)
+
+
+def _get_univers_full(db: Session, slug: str) -> Optional[Univers]:
+    """Load a universe with every relation used by _build_univers_response."""
+    return db.query(Univers)\
+        .options(*UNIVERS_RESPONSE_OPTIONS)\
+        .filter(Univers.slug == slug)\
+        .first()
+
+
+def _get_asset_full(db: Session, slug: str, asset_id: str) -> Optional[UniversAsset]:
+    """Load an asset with every relation used by _build_asset_response."""
+    return db.query(UniversAsset)\
+        .options(*ASSET_RESPONSE_OPTIONS)\
+        .join(Univers)\
+        .filter(Univers.slug == slug, UniversAsset.id == asset_id)\
+        .first()
+
+
 def _build_univers_response(univers: Univers) -> UniversResponse:
     """Build a complete universe response with all relations."""
     slug = univers.slug
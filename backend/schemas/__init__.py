@@ -15,6 +15,7 @@ class JobStatusEnum(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class LanguageEnum(str, Enum):
@@ -277,7 +278,8 @@ class UniversListItem(BaseModel):
 class UniversListResponse(BaseModel):
     """Paginated univers list."""
     items: List[UniversListItem]
-    total: int
+    total: Optional[int] = None  # None when with_total=false
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
 
 
 # ============================================================================
@@ -315,6 +317,7 @@ class JobResponse(BaseModel):
     created_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    queue_position: Optional[int] = None  # 1-based, while PENDING in the scheduler queue
     
     class Config:
         from_attributes = True
@@ -341,18 +344,21 @@ class GenerateImagesRequest(BaseModel):
     """Request to generate images for assets."""
     asset_ids: Optional[List[str]] = None  # None = all assets
     regenerate: bool = False
+    preempt: bool = False  # Cancel this universe's unfinished image job
 
 
 class GenerateVideosRequest(BaseModel):
     """Request to generate videos for assets."""
     asset_ids: Optional[List[str]] = None
     regenerate: bool = False
+    preempt: bool = False  # Cancel this universe's unfinished video job
 
 
 class GenerateMusicRequest(BaseModel):
     """Request to generate background music."""
     language: LanguageEnum = LanguageEnum.FR
     style: str = Field(min_length=10, max_length=300, default="children friendly, playful")
+    preempt: bool = False  # Cancel this universe's unfinished music job in the same language
 
 
 class GenerateAllRequest(BaseModel):
@@ -362,6 +368,7 @@ class GenerateAllRequest(BaseModel):
     generate_videos: bool = True
     generate_music: bool = True
     regenerate: bool = False
+    preempt: bool = False  # Cancel this universe's unfinished full generation job
 
 
 # ============================================================================
@@ -373,12 +380,37 @@ class SyncRequest(BaseModel):
     force: bool = False  # Force overwrite even if newer
 
 
+class TransferStats(BaseModel):
+    """Aggregate media transfer statistics."""
+    files: int = 0
+    bytes: int = 0
+    failed: int = 0
+    retries: int = 0
+    skipped: int = 0  # Unchanged files (delta sync)
+    deleted: int = 0  # Files removed on the destination
+    seconds: float = 0.0
+    files_per_second: float = 0.0
+    bytes_per_second: float = 0.0
+    errors: List[str] = []
+
+
+class SyncRowStats(BaseModel):
+    """Row-level changes applied by an incremental sync."""
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    skipped: int = 0  # Unchanged since the last sync
+    conflicts: int = 0  # Kept the newer side (timestamp_merge)
+
+
 class SyncResponse(BaseModel):
     """Sync operation result."""
     success: bool
     message: str
     synced_items: int = 0
     errors: List[str] = []
+    transfer: Optional[TransferStats] = None  # Media transfer stats
+    rows: Optional[SyncRowStats] = None  # Asset row changes
 
 
 class SyncInitResponse(BaseModel):
@@ -388,3 +420,4 @@ class SyncInitResponse(BaseModel):
     universes_synced: int = 0
     assets_synced: int = 0
     files_downloaded: int = 0
+    errors: List[str] = []
@@ -4,11 +4,17 @@ from .supabase_service import SupabaseService
 from .sync_service import SyncService
 from .generation_service import GenerationService
 from .job_service import JobService
+from .response_cache import ResponseCache
+from .translation_cache import TranslationCache
+from .translation_service import TranslationService
 
 __all__ = [
     "StorageService",
     "SupabaseService",
     "SyncService",
     "GenerationService",
-    "JobService"
+    "JobService",
+    "ResponseCache",
+    "TranslationCache",
+    "TranslationService"
 ]
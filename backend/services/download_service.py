@@ -0,0 +1,125 @@
+"""Download service - Streams remote media to local storage."""
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from config import settings
+from services.storage_service import storage_service
+
+
+class IncompleteDownload(Exception):
+    """The connection ended before Content-Length bytes were received."""
+
+
+class DownloadService:
+    """
+    Streaming downloader for generated media (images, videos, music).
+
+    Responses are written chunk by chunk to a partial file and renamed into
+    place once complete, so memory use per download is one chunk whatever
+    the file size, and readers never see a truncated file. After a dropped
+    connection the download resumes from the partial file with an HTTP
+    Range request. Connections are reused through one shared pool.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        self.storage = storage_service
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Shared client, created on the running loop (a client cannot move between loops)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=settings.DOWNLOAD_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.DOWNLOAD_MAX_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(30.0, read=120.0),
+                follow_redirects=True
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def download(self, url: str, local_path: Path) -> Path:
+        """
+        Download `url` to `local_path`.
+
+        Args:
+            url: Source URL
+            local_path: Final absolute path (inside the bucket)
+
+        Returns:
+            The written path
+
+        Raises:
+            httpx.HTTPStatusError: Non-retryable HTTP error (4xx)
+            httpx.TransportError, IncompleteDownload: Still failing after DOWNLOAD_RETRIES resumes
+        """
+        # Keyed by URL: a partial file left by a failed download is only ever
+        # resumed for the same source
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        partial_path = self.storage.get_partial_path(local_path, key)
+
+        for attempt in range(settings.DOWNLOAD_RETRIES + 1):
+            try:
+                await self._fetch(url, partial_path)
+                break
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500 or attempt == settings.DOWNLOAD_RETRIES:
+                    partial_path.unlink(missing_ok=True)
+                    raise
+            except (httpx.TransportError, IncompleteDownload) as e:
+                if attempt == settings.DOWNLOAD_RETRIES:
+                    raise
+                print(f"⚠️ Download interrupted ({e}), resuming {local_path.name} "
+                      f"from {partial_path.stat().st_size if partial_path.exists() else 0} bytes")
+            await asyncio.sleep(min(2 ** attempt * 0.5, 10))
+
+        return await asyncio.to_thread(self.storage.commit_file, partial_path, local_path)
+
+    async def _fetch(self, url: str, partial_path: Path):
+        """One attempt: append the missing bytes to the partial file."""
+        offset = partial_path.stat().st_size if partial_path.exists() else 0
+        # Identity encoding: byte offsets must match the stored file
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        async with self._http().stream("GET", url, headers=headers) as response:
+            if response.status_code == 416 and offset:
+                return  # Partial file is already complete
+            response.raise_for_status()
+
+            if offset and response.status_code != 206:
+                offset = 0  # Range ignored: start over
+            length = response.headers.get("Content-Length")
+            expected = offset + int(length) if length is not None else None
+
+            with open(partial_path, "ab" if offset else "wb") as f:
+                async for chunk in response.aiter_bytes(settings.DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+
+        size = partial_path.stat().st_size
+        if expected is not None and size < expected:
+            raise IncompleteDownload(f"{size}/{expected} bytes")
+
+    async def aclose(self):
+        """Close the connection pool (must run on the loop that created it)."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+# Singleton instance
+download_service = DownloadService()
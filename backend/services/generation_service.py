@@ -2,22 +2,22 @@
 import os
 import re
 import json
-import time
 import base64
-import requests
+import asyncio
+import concurrent.futures
+import inspect
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from deep_translator import GoogleTranslator
-import replicate
+from typing import Any, List, Dict, Optional, Tuple, Callable
 
 from config import settings
 from services.storage_service import storage_service
-from services.job_service import job_service
+from services.job_service import JobCancelled, job_service
+from services.translation_service import translation_service, LANGUAGES
+from services.replicate_backend import AsyncReplicateBackend
+from services.download_service import download_service
+from utils import TokenBucket, BackgroundLoop
 
 
-# Supported languages
-LANGUAGES = ["fr", "en", "es", "it", "de"]
-
 # Replicate models - updated models
 MODELS = {
     "llm": "meta/llama-2-70b-chat",  # For generating concepts/object names
@@ -37,10 +37,29 @@ class GenerationService:
     - Images (PNG illustrations)
     - Videos (MP4 from images)
     - Music (MP3 background music)
+    
+    Generation is asyncio-native: the `*_async` methods run on one shared
+    background event loop and await the Replicate backend, so a batch of
+    predictions is a set of coroutines rather than a set of threads. The
+    synchronous methods are thin wrappers that block on the loop; given a
+    job_id, cancelling the job cancels the coroutine, which cancels its
+    in-flight predictions.
     """
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: Replicate backend (defaults to AsyncReplicateBackend;
+                tests pass a local fake)
+        """
         self.storage = storage_service
+        self.translator = translation_service
+        self.rate_limiter = TokenBucket(
+            rate=settings.REPLICATE_RATE_LIMIT,
+            capacity=settings.REPLICATE_RATE_BURST
+        )
+        self.backend = backend or AsyncReplicateBackend()
+        self.loop = BackgroundLoop("generation-loop")
         self._check_api_token()
     
     def _check_api_token(self):
@@ -56,6 +75,51 @@ class GenerationService:
         """Check if AI generation is available."""
         return bool(settings.REPLICATE_API_TOKEN)
     
+    def close(self):
+        """Close the backend and download connection pools and stop the event loop (app shutdown)."""
+        if self.loop.running:
+            try:
+                self.loop.run(self.backend.aclose(), timeout=5)
+                self.loop.run(download_service.aclose(), timeout=5)
+            except Exception as e:
+                print(f"⚠️ Failed to close Replicate backend: {e}")
+        self.loop.close()
+    
+    def _run(self, coro, job_id: Optional[str] = None) -> Any:
+        """
+        Block on a coroutine run on the generation loop, bound to a job.
+        
+        Raises:
+            JobCancelled: The job was cancelled while the coroutine ran
+        """
+        token = job_service.cancel_token(job_id) if job_id else None
+        if token is None:
+            return self.loop.run(coro)
+        
+        future = self.loop.submit(coro)
+        remove = token.on_cancel(future.cancel)
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise JobCancelled(f"Job {job_id} was cancelled")
+        finally:
+            remove()
+    
+    async def _run_model(self, model: str, input: Dict) -> Any:
+        """Run a Replicate model once the shared rate limiter grants a token."""
+        await self.rate_limiter.acquire_async()
+        return await self.backend.run(model, input)
+    
+    async def _save_output(self, output: Any, output_path: Path) -> Path:
+        """Stream a prediction output file to storage."""
+        url = output[0] if isinstance(output, list) else str(output)
+        return await self.backend.download_to(url, output_path)
+    
+    @staticmethod
+    async def _report(method: Callable, *args, **kwargs):
+        """Call a blocking job_service progress method without stalling the loop."""
+        await asyncio.to_thread(method, *args, **kwargs)
+    
     # =========================================================================
     # CONCEPT GENERATION (LLM)
     # =========================================================================
@@ -65,6 +129,15 @@ class GenerationService:
         theme: str,
         count: int = 10,
         language: str = "fr"
+    ) -> List[str]:
+        """Blocking wrapper around `generate_concepts_async`."""
+        return self.loop.run(self.generate_concepts_async(theme, count, language))
+    
+    async def generate_concepts_async(
+        self,
+        theme: str,
+        count: int = 10,
+        language: str = "fr"
     ) -> List[str]:
         """
         Generate a list of concepts for a theme using LLM.
@@ -95,8 +168,8 @@ Example output for "farm animals":
 
 Theme: {theme}
 Output:"""
-
-        output = replicate.run(
+        
+        output = await self._run_model(
             MODELS["llm"],
             input={
                 "system_prompt": system_prompt,
@@ -105,16 +178,16 @@ Output:"""
                 "temperature": 0.7
             }
         )
-
-        # Parse response
-        response_text = "".join(output)
-
+        
+        # Parse response (language models return a list of tokens)
+        response_text = "".join(output) if isinstance(output, list) else str(output)
+        
         # Extract JSON array
         match = re.search(r'\[.*?\]', response_text, re.DOTALL)
         if match:
             concepts = json.loads(match.group())
             return concepts[:count]
-
+        
         raise ValueError(f"Failed to parse concepts from LLM response: {response_text}")
     
     # =========================================================================
@@ -125,24 +198,24 @@ Output:"""
         self,
         text: str,
         source_lang: str = "fr",
-        target_lang: str = "en"
-    ) -> str:
+        target_lang: str = "en",
+        cached_only: bool = False
+    ) -> Optional[str]:
         """
-        Translate text using Google Translator.
+        Translate text through the translation service.
+        
+        The translation memory is consulted first; only misses hit the backend.
         
         Args:
             text: Text to translate
             source_lang: Source language code
             target_lang: Target language code
+            cached_only: Return None on a cache miss instead of translating
         
         Returns:
-            Translated text
+            Translated text (None on a miss with cached_only)
         """
-        if source_lang == target_lang:
-            return text
-        
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
-        return translator.translate(text)
+        return self.translator.translate_text(text, source_lang, target_lang, cached_only)
     
     def translate_concepts(
         self,
@@ -152,6 +225,9 @@ Output:"""
         """
         Translate a list of concepts to all supported languages.
         
+        Each target language is sent as one batch, and languages run
+        concurrently. Items that fail fall back to the original text.
+        
         Args:
             concepts: List of concept names
             source_lang: Source language
@@ -159,23 +235,7 @@ Output:"""
         Returns:
             Dict mapping language code to translated concepts
         """
-        translations = {source_lang: concepts}
-        
-        for lang in LANGUAGES:
-            if lang == source_lang:
-                continue
-            
-            translated = []
-            for concept in concepts:
-                try:
-                    translated.append(self.translate_text(concept, source_lang, lang))
-                except Exception as e:
-                    print(f"Translation error for '{concept}' to {lang}: {e}")
-                    translated.append(concept)  # Fallback to original
-            
-            translations[lang] = translated
-        
-        return translations
+        return self.translator.translate_concepts(concepts, source_lang)
     
     # =========================================================================
     # IMAGE GENERATION
@@ -212,6 +272,15 @@ Output:"""
         prompt: str,
         output_path: Path,
         size: str = "1024x1024"
+    ) -> Path:
+        """Blocking wrapper around `generate_image_async`."""
+        return self.loop.run(self.generate_image_async(prompt, output_path, size))
+    
+    async def generate_image_async(
+        self,
+        prompt: str,
+        output_path: Path,
+        size: str = "1024x1024"
     ) -> Path:
         """
         Generate an image using Replicate.
@@ -228,7 +297,7 @@ Output:"""
             raise RuntimeError("Replicate API not configured")
         
         print(f"🎨 Making Replicate API call for image generation: {prompt[:50]}...")
-        output = replicate.run(
+        output = await self._run_model(
             MODELS["image"],
             input={
                 "prompt": prompt,
@@ -238,20 +307,7 @@ Output:"""
         )
         print(f"✅ Replicate API call completed for image")
         
-        # Download image
-        if isinstance(output, list):
-            image_url = output[0]
-        else:
-            image_url = str(output)
-        
-        response = requests.get(image_url)
-        response.raise_for_status()
-        
-        # Save to file
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(response.content)
-        
-        return output_path
+        return await self._save_output(output, output_path)
     
     def generate_all_images(
         self,
@@ -259,55 +315,99 @@ Output:"""
         concepts: List[str],
         prompts: Optional[List[str]] = None,
         job_id: Optional[str] = None,
-        theme_context: str = ""
+        theme_context: str = "",
+        max_concurrency: Optional[int] = None,
+        on_image: Optional[Callable[[int, Path], None]] = None,
+        skip_existing: bool = False
+    ) -> List[Path]:
+        """Blocking wrapper around `generate_all_images_async`."""
+        return self._run(self.generate_all_images_async(
+            slug, concepts, prompts, job_id, theme_context, max_concurrency, on_image, skip_existing
+        ), job_id)
+    
+    async def generate_all_images_async(
+        self,
+        slug: str,
+        concepts: List[str],
+        prompts: Optional[List[str]] = None,
+        job_id: Optional[str] = None,
+        theme_context: str = "",
+        max_concurrency: Optional[int] = None,
+        on_image: Optional[Callable[[int, Path], Any]] = None,
+        skip_existing: bool = False
     ) -> List[Path]:
         """
         Generate images for all concepts in a universe.
         
+        Concepts are generated concurrently on the event loop, bounded by a
+        semaphore; the shared token bucket spaces out the Replicate calls.
+        
         Args:
             slug: Universe slug
             concepts: List of concept names
             prompts: Optional custom prompts (one per concept)
             job_id: Optional job ID for progress updates
             theme_context: Theme context for prompt generation
+            max_concurrency: Max in-flight generations (defaults to settings)
+            on_image: Optional callback(index, path) invoked on the loop as
+                each image completes (may be a coroutine function)
+            skip_existing: Keep images already on disk (resumed job)
         
         Returns:
-            List of paths to generated images
+            List of paths to generated images (in concept order)
         """
-        generated = []
+        total = len(concepts)
+        results: List[Optional[Path]] = [None] * total
+        completed = 0
+        limit = asyncio.Semaphore(max(1, max_concurrency or settings.GENERATION_MAX_CONCURRENCY))
         
         if job_id:
-            job_service.set_total_steps(job_id, len(concepts))
+            await self._report(job_service.set_total_steps, job_id, total)
         
-        for i, concept in enumerate(concepts):
-            try:
-                # Generate or use custom prompt
-                if prompts and i < len(prompts) and prompts[i]:
-                    prompt = prompts[i]
-                else:
-                    prompt = self.generate_image_prompt(concept, theme_context)
-                
-                # Output path (consistent naming with existing files)
-                concept_slug = concepts[i].lower().replace(' ', '_').replace('-', '_') if i < len(concepts) else f"item_{i+1}"
-                image_name = f"{i:02d}_{concept_slug}.png"
-                output_path = self.storage.get_asset_image_path(slug, image_name)
-                
-                # Generate
-                self.generate_image(prompt, output_path)
-                generated.append(output_path)
-                
-                if job_id:
-                    job_service.step(job_id, f"Generated image {i+1}/{len(concepts)}: {concept}")
-                
-                # Rate limiting
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Error generating image for '{concept}': {e}")
-                if job_id:
-                    job_service.update_job(job_id, message=f"Error on {concept}: {e}")
+        async def generate_one(i: int, concept: str):
+            nonlocal completed
+            
+            # Generate or use custom prompt
+            if prompts and i < len(prompts) and prompts[i]:
+                prompt = prompts[i]
+            else:
+                prompt = self.generate_image_prompt(concept, theme_context)
+            
+            # Output path (consistent naming with existing files)
+            concept_slug = concept.lower().replace(' ', '_').replace('-', '_')
+            image_name = f"{i:02d}_{concept_slug}.png"
+            output_path = self.storage.get_asset_image_path(slug, image_name)
+            
+            kept = skip_existing and output_path.exists()
+            if kept:
+                results[i] = output_path
+            else:
+                try:
+                    async with limit:
+                        job_service.raise_if_cancelled(job_id)  # Between steps
+                        results[i] = await self.generate_image_async(prompt, output_path)
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    print(f"Error generating image for '{concept}': {e}")
+                    if job_id:
+                        await self._report(job_service.update_job, job_id, message=f"Error on {concept}: {e}")
+                    return
+            
+            # Steps may finish out of order: report the completion count
+            completed += 1
+            if job_id:
+                verb = "Kept existing" if kept else "Generated"
+                await self._report(job_service.step, job_id, f"{verb} image {completed}/{total}: {concept}")
+            
+            if on_image:
+                outcome = on_image(i, results[i])
+                if inspect.isawaitable(outcome):
+                    await outcome
         
-        return generated
+        await asyncio.gather(*(generate_one(i, concept) for i, concept in enumerate(concepts)))
+        
+        return [path for path in results if path is not None]
     
     # =========================================================================
     # VIDEO GENERATION
@@ -343,6 +443,16 @@ Output:"""
         prompt: str,
         output_path: Path,
         duration: float = 3.0
+    ) -> Path:
+        """Blocking wrapper around `generate_video_async`."""
+        return self.loop.run(self.generate_video_async(image_path, prompt, output_path, duration))
+    
+    async def generate_video_async(
+        self,
+        image_path: Path,
+        prompt: str,
+        output_path: Path,
+        duration: float = 3.0
     ) -> Path:
         """
         Generate a video from an image using Replicate.
@@ -360,10 +470,9 @@ Output:"""
             raise RuntimeError("Replicate API not configured")
         
         # Read image
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-
-        output = replicate.run(
+        image_data = await asyncio.to_thread(Path(image_path).read_bytes)
+        
+        output = await self._run_model(
             MODELS["video"],
             input={
                 "image": f"data:image/png;base64,{base64.b64encode(image_data).decode()}",
@@ -373,74 +482,98 @@ Output:"""
             }
         )
         
-        # Download video
-        video_url = str(output)
-        response = requests.get(video_url)
-        response.raise_for_status()
-        
-        # Save to file
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(response.content)
-        
-        return output_path
+        return await self._save_output(output, output_path)
+    
+    def _select_video_prompt(
+        self,
+        index: int,
+        concept: str,
+        prompts: Optional[List[str]] = None
+    ) -> str:
+        """Use the custom video prompt for this index, or build a default one."""
+        if prompts and index < len(prompts) and prompts[index]:
+            return prompts[index]
+        return self.generate_video_prompt(concept)
     
     def generate_all_videos(
         self,
         slug: str,
         concepts: List[str],
         prompts: Optional[List[str]] = None,
-        job_id: Optional[str] = None
+        job_id: Optional[str] = None,
+        skip_existing: bool = False
+    ) -> List[Path]:
+        """Blocking wrapper around `generate_all_videos_async`."""
+        return self._run(self.generate_all_videos_async(
+            slug, concepts, prompts, job_id, skip_existing=skip_existing
+        ), job_id)
+    
+    async def generate_all_videos_async(
+        self,
+        slug: str,
+        concepts: List[str],
+        prompts: Optional[List[str]] = None,
+        job_id: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        skip_existing: bool = False
     ) -> List[Path]:
         """
         Generate videos for all assets in a universe.
         
+        Videos are generated concurrently, bounded like images.
+        
         Args:
             slug: Universe slug
             concepts: List of concept names
             prompts: Optional custom video prompts
             job_id: Optional job ID for progress updates
+            max_concurrency: Max in-flight generations (defaults to settings)
+            skip_existing: Keep videos already on disk (resumed job)
         
         Returns:
-            List of paths to generated videos
+            List of paths to generated videos (in image order)
         """
-        generated = []
         universe_path = self.storage.get_universe_path(slug)
-
+        
         # Get list of images (flat structure)
         images = sorted([f for f in universe_path.iterdir() if f.suffix == ".png"])
+        results: List[Optional[Path]] = [None] * len(images)
+        completed = 0
+        limit = asyncio.Semaphore(max(1, max_concurrency or settings.GENERATION_MAX_CONCURRENCY))
         
         if job_id:
-            job_service.set_total_steps(job_id, len(images))
+            await self._report(job_service.set_total_steps, job_id, len(images))
         
-        for i, image_path in enumerate(images):
-            try:
-                concept = concepts[i] if i < len(concepts) else f"item {i+1}"
-                
-                # Generate or use custom prompt
-                if prompts and i < len(prompts) and prompts[i]:
-                    prompt = prompts[i]
-                else:
-                    prompt = self.generate_video_prompt(concept)
-                
-                # Output path
-                output_path = image_path.with_suffix(".mp4")
-                
-                # Generate
-                self.generate_video(image_path, prompt, output_path)
-                generated.append(output_path)
-                
-                if job_id:
-                    job_service.step(job_id, f"Generated video {i+1}/{len(images)}: {concept}")
-                
-                # Rate limiting (videos take longer)
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"Error generating video for image {image_path}: {e}")
-                if job_id:
-                    job_service.update_job(job_id, message=f"Error: {e}")
+        async def generate_one(i: int, image_path: Path):
+            nonlocal completed
+            concept = concepts[i] if i < len(concepts) else f"item {i+1}"
+            prompt = self._select_video_prompt(i, concept, prompts)
+            output_path = image_path.with_suffix(".mp4")
+            
+            kept = skip_existing and output_path.exists()
+            if kept:
+                results[i] = output_path
+            else:
+                try:
+                    async with limit:
+                        job_service.raise_if_cancelled(job_id)  # Between steps
+                        results[i] = await self.generate_video_async(image_path, prompt, output_path)
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    print(f"Error generating video for image {image_path}: {e}")
+                    if job_id:
+                        await self._report(job_service.update_job, job_id, message=f"Error: {e}")
+                    return
+            
+            completed += 1
+            if job_id:
+                verb = "Kept existing" if kept else "Generated"
+                await self._report(job_service.step, job_id, f"{verb} video {completed}/{len(images)}: {concept}")
+        
+        await asyncio.gather(*(generate_one(i, path) for i, path in enumerate(images)))
         
-        return generated
+        return [path for path in results if path is not None]
     
     # =========================================================================
     # MUSIC GENERATION
@@ -452,32 +585,28 @@ Output:"""
         language: str,
         style: str = "children's music, playful, upbeat",
         duration: int = 60,
-        lyrics: Optional[str] = None
+        lyrics: Optional[str] = None,
+        job_id: Optional[str] = None
     ) -> Path:
-        """
-        Generate background music for a universe.
-
-        Args:
-            slug: Universe slug
-            language: Language code
-            style: Music style description
-            duration: Duration in seconds
-            lyrics: Optional lyrics
-
-        Returns:
-            Path to saved music file
-        """
-        if not self.is_available:
-            raise RuntimeError("Replicate API not configured")
-
-        # Get stored prompt and lyrics for the language
-        from database import SessionLocal, Univers, UniversMusicPrompts
+        """Blocking wrapper around `generate_music_async` (job_id: cancellable job)."""
+        return self._run(self.generate_music_async(slug, language, style, duration, lyrics, job_id), job_id)
+    
+    def _music_input(
+        self,
+        slug: str,
+        language: str,
+        style: str,
+        duration: int,
+        lyrics: Optional[str]
+    ) -> Tuple[Dict, str]:
+        """Build the music model input from the stored prompt and lyrics (blocking DB read)."""
+        from database import SessionLocal, Univers
         db = SessionLocal()
         try:
             univers = db.query(Univers).filter(Univers.slug == slug).first()
             if not univers:
                 raise ValueError(f"Universe '{slug}' not found")
-
+            
             stored_prompt = None
             stored_lyrics = None
             for mp in univers.music_prompts:
@@ -485,7 +614,7 @@ Output:"""
                     stored_prompt = mp.prompt
                     stored_lyrics = mp.lyrics
                     break
-
+            
             # Use stored lyrics or provided lyrics
             if lyrics:
                 music_lyrics = lyrics
@@ -493,41 +622,66 @@ Output:"""
                 music_lyrics = stored_lyrics
             else:
                 music_lyrics = ""
-
+            
             # Use stored prompt for style or fallback
             if stored_prompt:
                 style_description = stored_prompt
             else:
                 style_description = f"{style}, instrumental background music for {univers.name}"
-
+            
             input_params = {
                 "lyrics": music_lyrics,
                 "reference_audio": None,  # Optional: can add reference audio later
                 "style_strength": 0.8,  # Default style strength
                 "duration": duration
             }
-
+        
         finally:
             db.close()
         
-        print(f"🎵 Making Replicate API call for music generation: {slug} ({language}) - {music_lyrics[:50] if music_lyrics else style_description[:50]}...")
-        output = replicate.run(
+        return input_params, music_lyrics[:50] if music_lyrics else style_description[:50]
+    
+    async def generate_music_async(
+        self,
+        slug: str,
+        language: str,
+        style: str = "children's music, playful, upbeat",
+        duration: int = 60,
+        lyrics: Optional[str] = None,
+        job_id: Optional[str] = None
+    ) -> Path:
+        """
+        Generate background music for a universe.
+        
+        Args:
+            slug: Universe slug
+            language: Language code
+            style: Music style description
+            duration: Duration in seconds
+            lyrics: Optional lyrics
+            job_id: Optional job, checked for cancellation before the prediction
+        
+        Returns:
+            Path to saved music file
+        """
+        if not self.is_available:
+            raise RuntimeError("Replicate API not configured")
+        
+        # Get stored prompt and lyrics for the language
+        input_params, summary = await asyncio.to_thread(
+            self._music_input, slug, language, style, duration, lyrics
+        )
+        
+        job_service.raise_if_cancelled(job_id)
+        print(f"🎵 Making Replicate API call for music generation: {slug} ({language}) - {summary}...")
+        output = await self._run_model(
             MODELS["music"],
             input=input_params
         )
         print(f"✅ Replicate API call completed for music: {slug}")
         
-        # Download music
-        music_url = str(output)
-        response = requests.get(music_url)
-        response.raise_for_status()
-        
-        # Save to file
         output_path = self.storage.get_music_file_path(slug, language)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(response.content)
-        
-        return output_path
+        return await self._save_output(output, output_path)
     
     # =========================================================================
     # FULL UNIVERSE GENERATION
@@ -540,11 +694,38 @@ Output:"""
         concept_count: int = 10,
         generate_videos: bool = True,
         generate_music: bool = True,
-        job_id: Optional[str] = None
+        job_id: Optional[str] = None,
+        concepts: Optional[List[str]] = None,
+        on_concepts: Optional[Callable[[List[str]], None]] = None,
+        skip_existing: bool = False
+    ) -> Dict:
+        """Blocking wrapper around `generate_universe_content_async`."""
+        return self._run(self.generate_universe_content_async(
+            slug, theme, concept_count, generate_videos, generate_music, job_id,
+            concepts, on_concepts, skip_existing
+        ), job_id)
+    
+    async def generate_universe_content_async(
+        self,
+        slug: str,
+        theme: str,
+        concept_count: int = 10,
+        generate_videos: bool = True,
+        generate_music: bool = True,
+        job_id: Optional[str] = None,
+        concepts: Optional[List[str]] = None,
+        on_concepts: Optional[Callable[[List[str]], None]] = None,
+        skip_existing: bool = False
     ) -> Dict:
         """
         Generate all content for a universe.
         
+        Stages are pipelined rather than run back to back:
+        - Music for every language starts immediately (it only needs the
+          stored music prompts) and runs alongside the other stages
+        - Translations run alongside image generation
+        - Each finished image is queued straight into video generation
+        
         Args:
             slug: Universe slug
             theme: Theme description
@@ -552,6 +733,10 @@ Output:"""
             generate_videos: Whether to generate videos
             generate_music: Whether to generate music
             job_id: Optional job ID for progress updates
+            concepts: Concepts from a previous attempt (skips the LLM call)
+            on_concepts: Optional callback(concepts) once concepts are known
+                (blocking, run in a thread: e.g. save a job checkpoint)
+            skip_existing: Keep images, videos and music already on disk
         
         Returns:
             Dict with generated content info
@@ -565,48 +750,126 @@ Output:"""
         }
         
         # Create storage folder
-        self.storage.create_universe_folder(slug)
+        await asyncio.to_thread(self.storage.create_universe_folder, slug)
         
-        # Step 1: Generate concepts
-        if job_id:
-            job_service.update_job(job_id, message="Generating concepts...")
-        
-        concepts = self.generate_concepts(theme, concept_count)
-        result["concepts"] = concepts
-        
-        # Step 2: Translate concepts
-        if job_id:
-            job_service.update_job(job_id, message="Translating concepts...")
-        
-        translations = self.translate_concepts(concepts)
-        result["translations"] = translations
-        
-        # Step 3: Generate images
-        if job_id:
-            job_service.update_job(job_id, message="Generating images...")
+        video_limit = asyncio.Semaphore(max(1, settings.GENERATION_MAX_CONCURRENCY))
+        music_tasks: Dict[str, asyncio.Task] = {}
+        video_tasks: Dict[int, asyncio.Task] = {}
+        translations_task: Optional[asyncio.Task] = None
         
-        images = self.generate_all_images(slug, concepts, theme_context=theme, job_id=job_id)
-        result["images"] = [str(p) for p in images]
+        async def make_music(lang: str) -> Optional[Path]:
+            existing = self.storage.get_music_file_path(slug, lang)
+            try:
+                if skip_existing and existing.exists():
+                    path = existing
+                else:
+                    path = await self.generate_music_async(slug, lang, job_id=job_id)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"Music generation failed for {lang}: {e}")
+                return None
+            if job_id:
+                await self._report(job_service.step, job_id, f"Generated music ({lang})")
+            return path
         
-        # Step 4: Generate videos
-        if generate_videos:
+        try:
+            # Music runs in parallel with every other stage
+            if generate_music:
+                music_tasks = {lang: asyncio.create_task(make_music(lang)) for lang in LANGUAGES}
+            
+            # Step 1: Generate concepts
             if job_id:
-                job_service.update_job(job_id, message="Generating videos...")
+                await self._report(job_service.update_job, job_id, message="Generating concepts...")
+            
+            if not concepts:
+                concepts = await self.generate_concepts_async(theme, concept_count)
+                if on_concepts:
+                    await asyncio.to_thread(on_concepts, concepts)
+            result["concepts"] = concepts
             
-            videos = self.generate_all_videos(slug, concepts, job_id=job_id)
-            result["videos"] = [str(p) for p in videos]
-        
-        # Step 5: Generate music
-        if generate_music:
             if job_id:
-                job_service.update_job(job_id, message="Generating music...")
+                total = len(concepts) * (2 if generate_videos else 1) + len(music_tasks)
+                await self._report(job_service.set_total_steps, job_id, total)
+                await self._report(job_service.update_job, job_id, message="Generating images, videos and music...")
+            
+            # Step 2: Translate concepts (alongside images)
+            translations_task = asyncio.create_task(asyncio.to_thread(self.translate_concepts, concepts))
             
-            for lang in LANGUAGES:
+            # Step 3: Generate images, streaming each one into video generation
+            images_done = 0
+            videos_done = 0
+            
+            async def make_video(i: int, image_path: Path) -> Optional[Path]:
+                nonlocal videos_done
+                concept = concepts[i]
+                prompt = self._select_video_prompt(i, concept)
+                output_path = image_path.with_suffix(".mp4")
                 try:
-                    music_path = self.generate_music(slug, lang)
-                    result["music"].append(str(music_path))
+                    if skip_existing and output_path.exists():
+                        path = output_path
+                    else:
+                        async with video_limit:
+                            job_service.raise_if_cancelled(job_id)
+                            path = await self.generate_video_async(image_path, prompt, output_path)
+                except JobCancelled:
+                    raise
                 except Exception as e:
-                    print(f"Music generation failed for {lang}: {e}")
+                    print(f"Error generating video for '{concept}': {e}")
+                    if job_id:
+                        await self._report(job_service.update_job, job_id, message=f"Error on video {concept}: {e}")
+                    return None
+                videos_done += 1
+                if job_id:
+                    await self._report(job_service.step, job_id, f"Generated video {videos_done}/{len(concepts)}: {concept}")
+                return path
+            
+            async def queue_video(i: int, image_path: Path):
+                nonlocal images_done
+                images_done += 1
+                if generate_videos:
+                    video_tasks[i] = asyncio.create_task(make_video(i, image_path))
+                if job_id:
+                    await self._report(job_service.step, job_id, f"Generated image {images_done}/{len(concepts)}: {concepts[i]}")
+            
+            images = await self.generate_all_images_async(
+                slug,
+                concepts,
+                theme_context=theme,
+                on_image=queue_video,
+                skip_existing=skip_existing
+            )
+            result["images"] = [str(p) for p in images]
+            
+            # Step 4: Collect videos (errors were handled per video)
+            await asyncio.gather(*video_tasks.values())
+            result["videos"] = [
+                str(video_tasks[i].result()) for i in sorted(video_tasks)
+                if video_tasks[i].result() is not None
+            ]
+            
+            # Translations fall back per item, so this does not raise
+            result["translations"] = await translations_task
+            
+            # Step 5: Collect music
+            for lang, task in music_tasks.items():
+                path = await task
+                if path is not None:
+                    result["music"].append(str(path))
+        
+        except (asyncio.CancelledError, JobCancelled):
+            # Job cancelled: stop the other stages too (cancels their predictions)
+            for task in [*music_tasks.values(), *video_tasks.values()]:
+                task.cancel()
+            raise
+        
+        finally:
+            # On failure, let in-flight predictions finish rather than orphan them
+            pending = [
+                task for task in [*music_tasks.values(), *video_tasks.values(), translations_task]
+                if task is not None and not task.done()
+            ]
+            await asyncio.gather(*pending, return_exceptions=True)
         
         return result
 
@@ -0,0 +1,174 @@
+"""Job events - In-process pub/sub of job state changes for streaming clients."""
+import asyncio
+import itertools
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import settings
+
+
+# Job states after which no more events are published
+FINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class JobSubscription:
+    """
+    Events for a set of jobs, delivered on one event loop.
+
+    Events carry job fields (partial for progress ticks). A subscriber that
+    reads slower than jobs publish does not queue a backlog: the pending
+    events of a job are merged into one, so it always gets the latest state
+    and memory stays at one pending event per job.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.job_ids: Set[str] = set()
+        self.coalesced = 0
+        self._pending: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def _push(self, job_id: str, event_id: str, fields: Dict):
+        """Runs on the subscriber's loop."""
+        if job_id not in self.job_ids:
+            return
+        if job_id in self._pending:
+            self.coalesced += 1
+            fields = {**self._pending[job_id][1], **fields}
+        self._pending[job_id] = (event_id, fields)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> List[Tuple[str, str, Dict]]:
+        """
+        Wait for events.
+
+        Args:
+            timeout: Max seconds to wait
+
+        Returns:
+            [(job_id, event_id, fields)], empty on timeout
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        events = [(job_id, event_id, fields) for job_id, (event_id, fields) in self._pending.items()]
+        self._pending.clear()
+        return events
+
+
+class JobEventBus:
+    """
+    Fan-out of job updates from worker threads to streaming endpoints.
+
+    `publish` is called by the job service from any thread; it hands the
+    event to each subscriber's loop with `call_soon_threadsafe`, so nothing
+    blocks the publishing worker. Event IDs combine a per-process boot ID
+    and a sequence number; the last ID of each recent job is kept so that a
+    reconnecting client (Last-Event-ID) can tell whether it missed anything.
+    """
+
+    def __init__(self, max_tracked_jobs: int = 1000):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[JobSubscription]] = {}
+        self._last_ids: "OrderedDict[str, str]" = OrderedDict()
+        self._max_tracked_jobs = max_tracked_jobs
+        self._boot = uuid.uuid4().hex[:8]
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    # =========================================================================
+    # PUBLISH
+    # =========================================================================
+
+    def publish(self, job_id: str, **fields):
+        """
+        Publish job fields (e.g. status, progress, message).
+
+        Args:
+            job_id: Job ID
+            **fields: JSON-serializable job fields that changed
+        """
+        with self._lock:
+            event_id = f"{self._boot}-{next(self._seq)}"
+            self._last_ids[job_id] = event_id
+            self._last_ids.move_to_end(job_id)
+            while len(self._last_ids) > self._max_tracked_jobs:
+                self._last_ids.popitem(last=False)
+            subscribers = list(self._subscribers.get(job_id, ()))
+            self.published += 1
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, job_id, event_id, fields)
+            except RuntimeError:
+                self.unsubscribe(subscription)  # Its loop is closed
+
+    def last_event_id(self, job_id: str) -> Optional[str]:
+        """ID of the latest event published for a job (None if none is tracked)."""
+        with self._lock:
+            return self._last_ids.get(job_id)
+
+    # =========================================================================
+    # SUBSCRIBE
+    # =========================================================================
+
+    def subscribe(self, job_ids: Iterable[str], subscription: Optional[JobSubscription] = None) -> JobSubscription:
+        """
+        Subscribe to jobs (call from the event loop that reads the events).
+
+        Args:
+            job_ids: Jobs to follow
+            subscription: Existing subscription to extend (multiplexed streams)
+
+        Returns:
+            The subscription
+        """
+        if subscription is None:
+            subscription = JobSubscription(asyncio.get_running_loop())
+        with self._lock:
+            for job_id in job_ids:
+                subscription.job_ids.add(job_id)
+                self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobSubscription, job_ids: Optional[Iterable[str]] = None):
+        """Stop following some jobs (default: all of them)."""
+        with self._lock:
+            for job_id in list(subscription.job_ids if job_ids is None else job_ids):
+                subscription.job_ids.discard(job_id)
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+
+    def snapshot(self) -> Dict:
+        """Subscribed jobs, subscriptions and published events."""
+        with self._lock:
+            subscriptions = set().union(*self._subscribers.values()) if self._subscribers else set()
+            return {
+                "subscribed_jobs": len(self._subscribers),
+                "subscriptions": len(subscriptions),
+                "published": self.published
+            }
+
+
+def format_sse(data: str, event: Optional[str] = None, event_id: Optional[str] = None, retry: Optional[int] = None) -> str:
+    """One Server-Sent Events message."""
+    lines = []
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+# Singleton instance
+job_events = JobEventBus(max_tracked_jobs=settings.JOB_EVENTS_TRACKED_JOBS)
@@ -0,0 +1,196 @@
+"""Job scheduler - Bounded worker pool for background jobs."""
+import bisect
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+
+
+class QueuedJob:
+    """A job waiting for a worker. Ordered by priority (higher first), then FIFO."""
+
+    def __init__(self, job_id: str, job_type: str, run: Callable[[], None], priority: int, seq: int):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.run = run
+        self.priority = priority
+        self.sort_key = (-priority, seq)
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "QueuedJob") -> bool:
+        return self.sort_key < other.sort_key
+
+
+class JobScheduler:
+    """
+    Runs background jobs on a fixed pool of worker threads.
+
+    - At most `workers` jobs run at once, whatever the load
+    - Each job type can have a lower limit (JOB_TYPE_LIMITS), so e.g. video
+      batches cannot take every worker
+    - Waiting jobs are dispatched by priority, then in submission order; a
+      job whose type is at its limit is skipped, not blocking the others
+
+    Workers start on first submit and can start again after `shutdown()`.
+    """
+
+    def __init__(self, workers: Optional[int] = None, type_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            workers: Worker threads (defaults to JOB_WORKERS)
+            type_limits: Max concurrent jobs per type (defaults to JOB_TYPE_LIMITS)
+        """
+        self.workers = max(1, workers or settings.JOB_WORKERS)
+        self.type_limits = dict(settings.JOB_TYPE_LIMITS if type_limits is None else type_limits)
+        self._cond = threading.Condition()
+        self._queue: List[QueuedJob] = []  # Kept sorted
+        self._running: Dict[str, str] = {}  # job_id -> job_type
+        self._threads: List[threading.Thread] = []
+        self._seq = itertools.count()
+        self._stopping = False
+
+    # =========================================================================
+    # SUBMISSION
+    # =========================================================================
+
+    def submit(self, job_id: str, job_type: str, run: Callable[[], None], priority: int = 0):
+        """
+        Queue a job.
+
+        Args:
+            job_id: Job ID
+            job_type: Job type (per-type limits)
+            run: Callable executing the job (must handle its own errors)
+            priority: Higher runs first (default 0)
+        """
+        entry = QueuedJob(job_id, job_type, run, priority, next(self._seq))
+        with self._cond:
+            self._start_workers()
+            bisect.insort(self._queue, entry)
+            self._cond.notify()
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among waiting jobs (None if not waiting)."""
+        with self._cond:
+            for position, entry in enumerate(self._queue, start=1):
+                if entry.job_id == job_id:
+                    return position
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a job from the queue (True if it was waiting)."""
+        with self._cond:
+            for i, entry in enumerate(self._queue):
+                if entry.job_id == job_id:
+                    del self._queue[i]
+                    return True
+        return False
+
+    def job_ids(self) -> List[str]:
+        """IDs of the jobs this scheduler holds (running, then queued)."""
+        with self._cond:
+            return list(self._running) + [entry.job_id for entry in self._queue]
+
+    def snapshot(self) -> Dict:
+        """Workers, running jobs per type and queue length."""
+        with self._cond:
+            running_by_type: Dict[str, int] = {}
+            for job_type in self._running.values():
+                running_by_type[job_type] = running_by_type.get(job_type, 0) + 1
+            return {
+                "workers": self.workers,
+                "type_limits": dict(self.type_limits),
+                "running": len(self._running),
+                "running_by_type": running_by_type,
+                "queued": len(self._queue),
+                "oldest_queued_seconds": round(time.monotonic() - min(e.enqueued_at for e in self._queue), 1)
+                if self._queue else None
+            }
+
+    # =========================================================================
+    # WORKERS
+    # =========================================================================
+
+    def _start_workers(self):
+        """Start the pool if needed (caller holds the condition)."""
+        self._threads = [t for t in self._threads if t.is_alive()]
+        if self._threads and not self._stopping:
+            return
+        self._stopping = False
+        for i in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _limit(self, job_type: str) -> int:
+        return self.type_limits.get(job_type, self.workers)
+
+    def _next_runnable(self) -> Optional[QueuedJob]:
+        """Pop the first queued job whose type is under its limit (caller holds the condition)."""
+        running_by_type: Dict[str, int] = {}
+        for job_type in self._running.values():
+            running_by_type[job_type] = running_by_type.get(job_type, 0) + 1
+        for i, entry in enumerate(self._queue):
+            if running_by_type.get(entry.job_type, 0) < self._limit(entry.job_type):
+                return self._queue.pop(i)
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                entry = None
+                while not self._stopping:
+                    entry = self._next_runnable()
+                    if entry:
+                        break
+                    self._cond.wait()
+                if entry is None:
+                    return
+                self._running[entry.job_id] = entry.job_type
+
+            try:
+                entry.run()
+            except Exception as e:
+                print(f"Job {entry.job_id} crashed its worker: {e}")
+            finally:
+                with self._cond:
+                    self._running.pop(entry.job_id, None)
+                    # A slot of this type is free: other workers may now run a skipped job
+                    self._cond.notify_all()
+
+    # =========================================================================
+    # SHUTDOWN
+    # =========================================================================
+
+    def shutdown(self, timeout: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Stop taking jobs off the queue and wait for running jobs to finish.
+
+        Args:
+            timeout: Max seconds to wait for running jobs (defaults to JOB_DRAIN_TIMEOUT)
+
+        Returns:
+            Dict with `unstarted` (job IDs removed from the queue) and
+            `unfinished` (job IDs still running when the timeout expired)
+        """
+        timeout = settings.JOB_DRAIN_TIMEOUT if timeout is None else timeout
+        with self._cond:
+            self._stopping = True
+            unstarted = [entry.job_id for entry in self._queue]
+            self._queue.clear()
+            threads = list(self._threads)
+            self._cond.notify_all()
+
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        with self._cond:
+            unfinished = list(self._running)
+        return {"unstarted": unstarted, "unfinished": unfinished}
+
+
+# Singleton instance
+job_scheduler = JobScheduler()
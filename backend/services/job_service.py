@@ -1,23 +1,119 @@
 """Job service - Persistent async job tracking with SQLite."""
 import json
+import os
+import socket
 import threading
 import traceback
-from datetime import datetime
-from typing import Optional, Callable, Any, List
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Callable, Any, Dict, List, Tuple
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from config import settings
 from database import Job, JobStatus, SessionLocal
+from services.job_events import job_events
+from services.job_scheduler import job_scheduler
+from services.progress_buffer import JobProgress, ProgressBuffer
+from utils.pagination import keyset_page
+
+
+# Job states that never change again
+FINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's task once the job has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cancellation flag of a running job, shared with the code it runs.
+    
+    Tasks check it between steps (`raise_if_cancelled`); code blocked on a
+    long operation registers a callback (e.g. cancelling the future of the
+    coroutine it waits for) so that it stops without waiting for a check.
+    """
+    
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], Any]] = []
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+    
+    def on_cancel(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """
+        Call `callback` on cancellation (at once if already cancelled).
+        
+        Returns:
+            Function removing the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+    
+    def _remove_callback(self, callback: Callable[[], Any]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
 
 
 class JobService:
     """
     Manages async jobs with persistence in SQLite.
     
-    Jobs survive server restarts and can be monitored via API.
+    Jobs survive server restarts and can be monitored via API. They run on
+    the bounded worker pool of the job scheduler and stay PENDING, with a
+    queue position, until a worker is free.
+    
+    The jobs table doubles as a durable queue: each queued or running job
+    holds a lease owned by this process, renewed by a heartbeat thread.
+    Jobs whose lease expires (process crashed or restarted) are requeued if
+    they were created with `enqueue` (registered task + JSON payload), or
+    marked FAILED otherwise.
+    
+    Progress updates (`step`, `set_total_steps`, `update_job` without a
+    status) are coalesced in memory and written in one transaction every
+    JOB_PROGRESS_FLUSH_INTERVAL; status changes, errors and results are
+    written immediately. Reads through this service see the buffered values.
+    Every change is also published on the job event bus for streaming
+    clients (SSE / WebSocket).
+    
+    Cancellation is cooperative: `cancel` marks the job CANCELLED (final,
+    later writes from its worker are ignored) and trips the job's
+    CancelToken, which tasks check between steps.
     """
     
     def __init__(self):
         self._lock = threading.Lock()
+        self.scheduler = job_scheduler
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: Dict[str, Callable] = {}
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+        self.progress = ProgressBuffer()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_stop = threading.Event()
+        self._cancel_tokens: Dict[str, CancelToken] = {}
     
     # =========================================================================
     # JOB CRUD
@@ -28,7 +124,10 @@ class JobService:
         db: Session,
         job_type: str,
         univers_slug: Optional[str] = None,
-        total_steps: int = 0
+        total_steps: int = 0,
+        payload: Optional[Dict] = None,
+        priority: int = 0,
+        leased: bool = False
     ) -> Job:
         """
         Create a new job in PENDING state.
@@ -38,6 +137,9 @@ class JobService:
             job_type: Type of job (e.g., "generate_images", "sync_pull")
             univers_slug: Related universe slug (optional)
             total_steps: Total number of steps for progress tracking
+            payload: JSON task arguments (makes the job recoverable)
+            priority: Scheduler priority
+            leased: Take the lease for this process (the job is being queued here)
         
         Returns:
             Created Job object
@@ -48,8 +150,14 @@ class JobService:
             status=JobStatus.PENDING,
             progress=0,
             total_steps=total_steps,
-            current_step=0
+            current_step=0,
+            payload=json.dumps(payload) if payload is not None else None,
+            priority=priority,
+            attempts=0
         )
+        if leased:
+            job.lease_owner = self.worker_id
+            job.lease_expires_at = datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_TTL)
         
         db.add(job)
         db.commit()
@@ -58,37 +166,58 @@ class JobService:
         return job
     
     def get_job(self, db: Session, job_id: str) -> Optional[Job]:
-        """Get a job by ID."""
-        return db.query(Job).filter(Job.id == job_id).first()
+        """Get a job by ID (with its buffered progress)."""
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job:
+            self._overlay(job)
+        return job
     
     def get_jobs(
         self,
         db: Session,
         univers_slug: Optional[str] = None,
         status: Optional[JobStatus] = None,
-        limit: int = 50
-    ) -> List[Job]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Job], Optional[str]]:
         """
-        Get jobs with optional filters.
+        Get jobs with optional filters, newest first (keyset pagination).
         
         Args:
             db: Database session
             univers_slug: Filter by universe
             status: Filter by status
             limit: Max number of jobs to return
+            cursor: Cursor returned with the previous page
         
         Returns:
-            List of jobs
-        """
-        query = db.query(Job)
+            (jobs, next_cursor); next_cursor is None on the last page
         
+        Raises:
+            ValueError: Malformed cursor
+        """
+        query = self._filter_jobs(db.query(Job), univers_slug, status)
+        jobs, next_cursor = keyset_page(query, Job.created_at, Job.id, limit, cursor)
+        for job in jobs:
+            self._overlay(job)
+        return jobs, next_cursor
+    
+    def count_jobs(
+        self,
+        db: Session,
+        univers_slug: Optional[str] = None,
+        status: Optional[JobStatus] = None
+    ) -> int:
+        """Number of jobs matching the filters."""
+        return self._filter_jobs(db.query(func.count(Job.id)), univers_slug, status).scalar()
+    
+    @staticmethod
+    def _filter_jobs(query, univers_slug: Optional[str], status: Optional[JobStatus]):
         if univers_slug:
             query = query.filter(Job.univers_slug == univers_slug)
-        
         if status:
             query = query.filter(Job.status == status)
-        
-        return query.order_by(Job.created_at.desc()).limit(limit).all()
+        return query
     
     def update_job(
         self,
@@ -103,21 +232,33 @@ class JobService:
         """
         Update job progress/status.
         
-        Thread-safe - can be called from background threads.
+        Thread-safe - can be called from background threads. Progress-only
+        updates are buffered; anything else is written at once, together
+        with the buffered progress.
         """
+        if status is None and error is None and result is None:
+            self._buffer(job_id, progress=progress, current_step=current_step, message=message)
+            return
+        
         with self._lock:
+            pending = self.progress.pop(job_id)
             db = SessionLocal()
             try:
                 job = db.query(Job).filter(Job.id == job_id).first()
-                if not job:
-                    return
+                if not job or job.status == JobStatus.CANCELLED:
+                    return  # Cancelled is final: the worker's late writes are dropped
+                
+                for field, value in (pending or {}).items():
+                    setattr(job, field, value)
                 
                 if status:
                     job.status = status
                     if status == JobStatus.RUNNING and not job.started_at:
                         job.started_at = datetime.utcnow()
-                    elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+                    elif status in FINAL_STATUSES:
                         job.completed_at = datetime.utcnow()
+                        job.lease_owner = None
+                        job.lease_expires_at = None
                 
                 if progress is not None:
                     job.progress = progress
@@ -137,13 +278,14 @@ class JobService:
                     job.result = json.dumps(result) if not isinstance(result, str) else result
                 
                 db.commit()
+                self._publish(job)
                 
             finally:
                 db.close()
     
     def delete_old_jobs(self, db: Session, days: int = 7) -> int:
         """
-        Delete completed/failed jobs older than X days.
+        Delete completed/failed/cancelled jobs older than X days.
         
         Returns:
             Number of deleted jobs
@@ -153,7 +295,7 @@ class JobService:
         cutoff = datetime.utcnow() - timedelta(days=days)
         
         result = db.query(Job)\
-            .filter(Job.status.in_([JobStatus.COMPLETED, JobStatus.FAILED]))\
+            .filter(Job.status.in_(FINAL_STATUSES))\
             .filter(Job.completed_at < cutoff)\
             .delete()
         
@@ -171,71 +313,465 @@ class JobService:
         task_func: Callable,
         univers_slug: Optional[str] = None,
         total_steps: int = 0,
+        priority: int = 0,
         **kwargs
     ) -> Job:
         """
-        Create a job and run task in background thread.
+        Create a job and queue an ad-hoc task on the job scheduler.
+        
+        The task is a Python callable, so it cannot be re-run after a
+        restart; prefer `enqueue` with a registered task for long jobs.
         
         Args:
             db: Database session
-            job_type: Type of job
+            job_type: Type of job (per-type concurrency limits)
             task_func: Function to execute (receives job_id as first arg)
             univers_slug: Related universe
             total_steps: Total steps for progress
+            priority: Higher runs first among waiting jobs (default 0)
             **kwargs: Additional args passed to task_func
         
         Returns:
-            Created Job object (execution continues in background)
+            Created Job object, PENDING until a worker picks it up
+        """
+        job = self.create_job(db, job_type, univers_slug, total_steps, priority=priority, leased=True)
+        self._submit(job.id, job_type, priority, lambda job_id, resume: task_func(job_id, **kwargs))
+        return job
+    
+    def task(self, job_type: str):
         """
-        # Create job
-        job = self.create_job(db, job_type, univers_slug, total_steps)
-        job_id = job.id
+        Register the task run for a job type (decorator).
         
-        # Define wrapper
-        def run_task():
+        The function is called as `func(job_id, resume=..., **payload)`.
+        `resume` is True when the job runs again after an interruption, so
+        the task can skip work already done (files already generated, ...).
+        """
+        def register(func: Callable) -> Callable:
+            self._tasks[job_type] = func
+            return func
+        return register
+    
+    def enqueue(
+        self,
+        db: Session,
+        job_type: str,
+        univers_slug: Optional[str] = None,
+        total_steps: int = 0,
+        priority: int = 0,
+        preempt: bool = False,
+        preempt_keys: Tuple[str, ...] = (),
+        **payload
+    ) -> Job:
+        """
+        Create a durable job running the task registered for `job_type`.
+        
+        Args:
+            db: Database session
+            job_type: Type of job (must have a registered task)
+            univers_slug: Related universe
+            total_steps: Total steps for progress
+            priority: Higher runs first among waiting jobs (default 0)
+            preempt: Cancel the unfinished jobs of the same type for the
+                same universe (superseded by this one)
+            preempt_keys: Payload fields that must also match for a job to
+                be preempted (e.g. "language" for per-language music)
+            **payload: JSON-serializable task arguments, stored on the job
+        
+        Returns:
+            Created Job object, PENDING until a worker picks it up
+        
+        Raises:
+            ValueError: No task registered for job_type
+        """
+        if job_type not in self._tasks:
+            raise ValueError(f"No task registered for job type '{job_type}'")
+        superseded = []
+        if preempt:
+            match = {key: payload.get(key) for key in preempt_keys}
+            superseded = self._active_job_ids(db, job_type, univers_slug, match)
+        job = self.create_job(db, job_type, univers_slug, total_steps, payload, priority, leased=True)
+        for old_id in superseded:
+            self.cancel(old_id, message=f"Preempted by job {job.id}")
+        self._submit(job.id, job_type, priority)
+        return job
+    
+    @staticmethod
+    def _active_job_ids(db: Session, job_type: str, univers_slug: Optional[str], match: Dict) -> List[str]:
+        """Unfinished jobs of a type and universe whose payload has the `match` values."""
+        rows = db.query(Job.id, Job.payload)\
+            .filter(Job.type == job_type, Job.univers_slug == univers_slug)\
+            .filter(Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))
+        active = []
+        for job_id, payload in rows:
+            data = json.loads(payload) if payload else {}
+            if all(data.get(key) == value for key, value in match.items()):
+                active.append(job_id)
+        return active
+    
+    def save_checkpoint(self, job_id: str, **data):
+        """Merge `data` into a durable job's payload (seen by the task on resume)."""
+        with self._lock:
+            db = SessionLocal()
             try:
-                # Ensure environment variables are available in background thread
-                import os
-                from config import settings
-
-                # Replicate API token for generation jobs
-                if hasattr(settings, 'REPLICATE_API_TOKEN') and settings.REPLICATE_API_TOKEN:
-                    os.environ["REPLICATE_API_TOKEN"] = settings.REPLICATE_API_TOKEN
-
-                # Supabase credentials for sync jobs
-                if hasattr(settings, 'SUPABASE_URL') and settings.SUPABASE_URL:
-                    os.environ["SUPABASE_URL"] = settings.SUPABASE_URL
-                if hasattr(settings, 'SUPABASE_SERVICE_ROLE_KEY') and settings.SUPABASE_SERVICE_ROLE_KEY:
-                    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = settings.SUPABASE_SERVICE_ROLE_KEY
+                job = db.query(Job).filter(Job.id == job_id).first()
+                if job and job.payload is not None:
+                    job.payload = json.dumps({**json.loads(job.payload), **data})
+                    db.commit()
+            finally:
+                db.close()
+    
+    def _submit(self, job_id: str, job_type: str, priority: int = 0, task_func: Optional[Callable] = None):
+        self._start_heartbeat()
+        self.scheduler.submit(job_id, job_type, lambda: self._execute(job_id, task_func), priority)
+    
+    def _claim(self, job_id: str) -> Optional[Tuple[str, int, Optional[str]]]:
+        """
+        PENDING -> RUNNING with a fresh lease for this process, atomically.
+        
+        Returns:
+            (type, attempts, payload), or None if the job is no longer
+            pending (finished, or claimed by another process)
+        """
+        now = datetime.utcnow()
+        self.progress.pop(job_id)  # Left over from an earlier attempt here
+        with self._lock:
+            db = SessionLocal()
+            try:
+                claimed = db.query(Job)\
+                    .filter(Job.id == job_id, Job.status == JobStatus.PENDING)\
+                    .update({
+                        Job.status: JobStatus.RUNNING,
+                        Job.attempts: func.coalesce(Job.attempts, 0) + 1,
+                        Job.lease_owner: self.worker_id,
+                        Job.lease_expires_at: now + timedelta(seconds=settings.JOB_LEASE_TTL),
+                        Job.heartbeat_at: now,
+                        Job.started_at: func.coalesce(Job.started_at, now),
+                        Job.message: "Starting..."
+                    }, synchronize_session=False)
+                db.commit()
+                if not claimed:
+                    return None
+                job_events.publish(job_id, status=JobStatus.RUNNING.value, message="Starting...", queue_position=None)
+                return tuple(db.query(Job.type, Job.attempts, Job.payload).filter(Job.id == job_id).one())
+            finally:
+                db.close()
+    
+    def _execute(self, job_id: str, task_func: Optional[Callable] = None):
+        """Run a queued job on a scheduler worker."""
+        # Registered before the claim: a cancel right after it is not missed
+        self._cancel_tokens[job_id] = CancelToken(job_id)
+        try:
+            claimed = self._claim(job_id)
+            if claimed is not None:
+                self._run_claimed(job_id, *claimed, task_func)
+        finally:
+            self._cancel_tokens.pop(job_id, None)
+    
+    def _run_claimed(self, job_id: str, job_type: str, attempts: int, payload: Optional[str], task_func: Optional[Callable]):
+        """Run a claimed job's task and record how it ended."""
+        try:
+            # Ensure environment variables are available in background thread
+            # Replicate API token for generation jobs
+            if hasattr(settings, 'REPLICATE_API_TOKEN') and settings.REPLICATE_API_TOKEN:
+                os.environ["REPLICATE_API_TOKEN"] = settings.REPLICATE_API_TOKEN
 
-                self.update_job(job_id, status=JobStatus.RUNNING, message="Starting...")
+            # Supabase credentials for sync jobs
+            if hasattr(settings, 'SUPABASE_URL') and settings.SUPABASE_URL:
+                os.environ["SUPABASE_URL"] = settings.SUPABASE_URL
+            if hasattr(settings, 'SUPABASE_SERVICE_ROLE_KEY') and settings.SUPABASE_SERVICE_ROLE_KEY:
+                os.environ["SUPABASE_SERVICE_ROLE_KEY"] = settings.SUPABASE_SERVICE_ROLE_KEY
 
-                # Execute task
-                result = task_func(job_id, **kwargs)
+            # Execute task
+            resume = attempts > 1
+            if task_func is not None:
+                result = task_func(job_id, resume)
+            else:
+                result = self._tasks[job_type](job_id, resume=resume, **json.loads(payload or "{}"))
 
-                self.update_job(
-                    job_id,
-                    status=JobStatus.COMPLETED,
-                    progress=100,
-                    message="Completed successfully",
-                    result=result
-                )
+            self.update_job(
+                job_id,
+                status=JobStatus.COMPLETED,
+                progress=100,
+                message="Completed successfully",
+                result=result
+            )
 
+        except JobCancelled:
+            print(f"🛑 Job {job_id} stopped after cancellation")
+        
+        except Exception as e:
+            if self.is_cancelled(job_id):
+                # Interrupted by its cancellation (e.g. a cancelled prediction)
+                print(f"🛑 Job {job_id} stopped after cancellation ({type(e).__name__})")
+                return
+            error_msg = f"{str(e)}\n{traceback.format_exc()}"
+            print(f"Job {job_id} failed: {error_msg}")  # Debug logging
+            self.update_job(
+                job_id,
+                status=JobStatus.FAILED,
+                error=error_msg,
+                message=f"Failed: {str(e)}"
+            )
+    
+    # =========================================================================
+    # CANCELLATION
+    # =========================================================================
+    
+    def cancel(self, job_id: str, message: str = "Cancelled") -> bool:
+        """
+        Cancel a queued or running job.
+        
+        The job is CANCELLED at once. A queued job never starts; a running
+        one is told to stop through its CancelToken and stops at its next
+        check (in-flight predictions are cancelled). A job running in
+        another process is stopped by that process's next heartbeat.
+        
+        Args:
+            job_id: Job ID
+            message: Message shown on the job (e.g. why it was cancelled)
+        
+        Returns:
+            False if the job does not exist or had already finished
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            db = SessionLocal()
+            try:
+                cancelled = db.query(Job)\
+                    .filter(Job.id == job_id, Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))\
+                    .update({
+                        Job.status: JobStatus.CANCELLED,
+                        Job.completed_at: now,
+                        Job.message: message,
+                        Job.lease_owner: None,
+                        Job.lease_expires_at: None
+                    }, synchronize_session=False)
+                db.commit()
+                if cancelled:
+                    self.progress.pop(job_id)
+                    job = db.query(Job).filter(Job.id == job_id).one()
+                    self._publish(job)
+            finally:
+                db.close()
+        
+        if not cancelled:
+            return False
+        self.scheduler.cancel(job_id)
+        token = self._cancel_tokens.get(job_id)
+        if token:
+            token.cancel()
+        print(f"🛑 Job {job_id} cancelled: {message}")
+        return True
+    
+    def cancel_token(self, job_id: str) -> Optional[CancelToken]:
+        """Token of a job running in this process (None otherwise)."""
+        return self._cancel_tokens.get(job_id)
+    
+    def is_cancelled(self, job_id: Optional[str]) -> bool:
+        token = self._cancel_tokens.get(job_id) if job_id else None
+        return token is not None and token.cancelled
+    
+    def raise_if_cancelled(self, job_id: Optional[str]):
+        """
+        Cancellation check for tasks, between steps.
+        
+        Raises:
+            JobCancelled: The job was cancelled
+        """
+        token = self._cancel_tokens.get(job_id) if job_id else None
+        if token:
+            token.raise_if_cancelled()
+    
+    def _publish(self, job: Job):
+        """Publish a job's stored state to streaming clients."""
+        job_events.publish(
+            job.id,
+            status=job.status.value,
+            progress=job.progress,
+            total_steps=job.total_steps,
+            current_step=job.current_step,
+            message=job.message,
+            error=job.error,
+            started_at=job.started_at.isoformat() if job.started_at else None,
+            completed_at=job.completed_at.isoformat() if job.completed_at else None,
+            queue_position=self.queue_position(job.id)
+        )
+    
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a PENDING job in the scheduler queue (None if not waiting)."""
+        return self.scheduler.queue_position(job_id)
+    
+    # =========================================================================
+    # LEASES & RECOVERY
+    # =========================================================================
+    
+    def _start_heartbeat(self):
+        if self._heartbeat and self._heartbeat.is_alive():
+            return
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        self._heartbeat.start()
+    
+    def _heartbeat_loop(self):
+        while not self._heartbeat_stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            try:
+                self.heartbeat()
+                self.requeue_expired()
             except Exception as e:
-                error_msg = f"{str(e)}\n{traceback.format_exc()}"
-                print(f"Job {job_id} failed: {error_msg}")  # Debug logging
+                print(f"⚠️ Job heartbeat failed: {e}")
+    
+    def heartbeat(self) -> int:
+        """
+        Renew the leases of the jobs this process holds (queued or running),
+        and stop those cancelled meanwhile by another process.
+        
+        Returns:
+            Number of renewed leases
+        """
+        job_ids = self.scheduler.job_ids()
+        if not job_ids:
+            return 0
+        now = datetime.utcnow()
+        with self._lock:
+            db = SessionLocal()
+            try:
+                renewed = db.query(Job)\
+                    .filter(Job.id.in_(job_ids), Job.lease_owner == self.worker_id)\
+                    .filter(Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))\
+                    .update({
+                        Job.heartbeat_at: now,
+                        Job.lease_expires_at: now + timedelta(seconds=settings.JOB_LEASE_TTL)
+                    }, synchronize_session=False)
+                db.commit()
+                # Cancelled through another process: stop the local worker
+                cancelled = [
+                    row[0] for row in db.query(Job.id)
+                    .filter(Job.id.in_(job_ids), Job.status == JobStatus.CANCELLED)
+                ]
+            finally:
+                db.close()
+        
+        for job_id in cancelled:
+            self.scheduler.cancel(job_id)
+            token = self._cancel_tokens.get(job_id)
+            if token and not token.cancelled:
+                token.cancel()
+        return renewed
+    
+    def requeue_expired(self) -> Dict[str, List[str]]:
+        """
+        Recover jobs whose lease expired (their process died or was stopped).
+        
+        Durable jobs (registered task + payload) under JOB_MAX_ATTEMPTS go
+        back to PENDING on this process and resume; the others are FAILED.
+        RUNNING jobs without any lease predate the durable queue and are
+        treated as expired.
+        
+        Returns:
+            Dict with `requeued` and `failed` job IDs
+        """
+        now = datetime.utcnow()
+        held = self.scheduler.job_ids()  # Already queued here: never twice
+        requeued: List[Tuple[str, str, int]] = []
+        failed: List[str] = []
+        with self._lock:
+            db = SessionLocal()
+            try:
+                expired = db.query(Job)\
+                    .filter(Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))\
+                    .filter(or_(
+                        Job.lease_expires_at < now,
+                        (Job.status == JobStatus.RUNNING) & Job.lease_expires_at.is_(None)
+                    ))\
+                    .filter(Job.id.notin_(held))\
+                    .all()
+                for job in expired:
+                    resumable = job.payload is not None and job.type in self._tasks
+                    if resumable and (job.attempts or 0) < settings.JOB_MAX_ATTEMPTS:
+                        if job.status == JobStatus.RUNNING:
+                            job.message = f"Requeued after interruption (attempt {job.attempts} lost)"
+                        job.status = JobStatus.PENDING
+                        job.lease_owner = self.worker_id
+                        job.lease_expires_at = now + timedelta(seconds=settings.JOB_LEASE_TTL)
+                        requeued.append((job.id, job.type, job.priority or 0))
+                    else:
+                        job.status = JobStatus.FAILED
+                        job.completed_at = now
+                        job.lease_owner = None
+                        job.lease_expires_at = None
+                        job.message = "Interrupted: the server stopped before the job finished"
+                        job.error = job.message if resumable else f"{job.message} (not resumable)"
+                        failed.append(job.id)
+                db.commit()
+                for job in expired:
+                    self._publish(job)
+            finally:
+                db.close()
+        
+        for job_id, job_type, priority in requeued:
+            self._submit(job_id, job_type, priority)
+        return {"requeued": [job_id for job_id, _, _ in requeued], "failed": failed}
+    
+    def recover(self) -> Dict[str, List[str]]:
+        """
+        Startup recovery pass: requeue or fail jobs with expired leases, and
+        start the heartbeat that keeps doing so for jobs whose lease expires
+        later (e.g. held by a process that crashed moments ago).
+        """
+        outcome = self.requeue_expired()
+        self._start_heartbeat()
+        if outcome["requeued"] or outcome["failed"]:
+            print(f"♻️  Jobs recovered: {len(outcome['requeued'])} requeued, {len(outcome['failed'])} failed")
+        return outcome
+    
+    def _release(self, job_ids: List[str]):
+        """Expire this process's leases now so the next start recovers the jobs at once."""
+        if not job_ids:
+            return
+        with self._lock:
+            db = SessionLocal()
+            try:
+                db.query(Job)\
+                    .filter(Job.id.in_(job_ids), Job.lease_owner == self.worker_id)\
+                    .filter(Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))\
+                    .update({Job.lease_expires_at: datetime.utcnow()}, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+    
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Drain the scheduler (app shutdown): running jobs get `timeout`
+        seconds to finish. Durable jobs left queued or still running keep
+        their row and are recovered on the next start; ad-hoc jobs that
+        never started are marked FAILED.
+        """
+        self._heartbeat_stop.set()
+        outcome = self.scheduler.shutdown(timeout)
+        
+        durable = set()
+        if outcome["unstarted"]:
+            db = SessionLocal()
+            try:
+                durable = {
+                    row[0] for row in db.query(Job.id)
+                    .filter(Job.id.in_(outcome["unstarted"]), Job.payload.isnot(None))
+                }
+            finally:
+                db.close()
+        for job_id in outcome["unstarted"]:
+            if job_id not in durable:
                 self.update_job(
                     job_id,
                     status=JobStatus.FAILED,
-                    error=error_msg,
-                    message=f"Failed: {str(e)}"
+                    message="Server shut down before the job started"
                 )
         
-        # Start background thread
-        thread = threading.Thread(target=run_task, daemon=True)
-        thread.start()
-        
-        return job
+        self._flusher_stop.set()
+        self.flush()
+        self._release(list(durable) + outcome["unfinished"])
+        if outcome["unfinished"]:
+            print(f"⚠️ {len(outcome['unfinished'])} job(s) still running at shutdown: {', '.join(outcome['unfinished'])}")
     
     # =========================================================================
     # PROGRESS HELPERS
@@ -243,33 +779,80 @@ class JobService:
     
     def step(self, job_id: str, message: Optional[str] = None):
         """Increment current step by 1."""
-        with self._lock:
-            db = SessionLocal()
-            try:
-                job = db.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    job.current_step += 1
-                    if job.total_steps > 0:
-                        job.progress = int((job.current_step / job.total_steps) * 100)
-                    if message:
-                        job.message = message
-                    db.commit()
-            finally:
-                db.close()
+        self._buffer(job_id, step=True, message=message)
     
     def set_total_steps(self, job_id: str, total: int):
         """Update total steps (useful when count is determined during execution)."""
-        self.update_job(job_id, current_step=0)
+        self._buffer(job_id, total_steps=total, current_step=0)
+    
+    # =========================================================================
+    # PROGRESS BUFFER
+    # =========================================================================
+    
+    def _buffer(self, job_id: str, **changes):
+        if self.is_cancelled(job_id):
+            return  # Winding down: its row is final
+        if self.progress.apply(job_id, lambda: self._load_progress(job_id), **changes):
+            job_events.publish(job_id, **self.progress.get(job_id))
+            self._start_flusher()
+    
+    def _load_progress(self, job_id: str) -> Optional[JobProgress]:
+        db = SessionLocal()
+        try:
+            row = db.query(Job.progress, Job.current_step, Job.total_steps, Job.message)\
+                .filter(Job.id == job_id)\
+                .first()
+            return JobProgress(*row) if row else None
+        finally:
+            db.close()
+    
+    def _overlay(self, job: Job):
+        """Show buffered progress on a loaded job without marking it modified."""
+        values = self.progress.get(job.id)
+        if values and job.status not in FINAL_STATUSES:
+            for field, value in values.items():
+                set_committed_value(job, field, value)
+    
+    def flush(self) -> int:
+        """
+        Write buffered progress in one transaction.
         
+        Returns:
+            Number of jobs written
+        """
         with self._lock:
+            pending = self.progress.drain()
+            if not pending:
+                return 0
             db = SessionLocal()
             try:
-                job = db.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    job.total_steps = total
-                    db.commit()
+                for job_id, values in pending.items():
+                    # A job finished meanwhile keeps its final row
+                    db.query(Job)\
+                        .filter(Job.id == job_id)\
+                        .filter(Job.status.notin_(FINAL_STATUSES))\
+                        .update(values, synchronize_session=False)
+                db.commit()
             finally:
                 db.close()
+        return len(pending)
+    
+    def _start_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._flusher_stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="job-progress-flush", daemon=True)
+            self._flusher.start()
+    
+    def _flush_loop(self):
+        while not self._flusher_stop.wait(settings.JOB_PROGRESS_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Job progress flush failed: {e}")
 
 
 # Singleton instance
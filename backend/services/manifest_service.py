@@ -0,0 +1,127 @@
+"""Manifest service - Incremental per-file hashes of universe media for delta sync."""
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+
+from database import MediaManifestEntry
+from services.storage_service import storage_service
+
+
+class ManifestService:
+    """
+    Maintains the `media_manifest` table for each universe folder.
+
+    Each entry records the file's size, mtime and SHA-256, plus the hash and
+    remote eTag it had at the last successful push/pull. Scanning only
+    re-hashes files whose size or mtime changed since the previous scan.
+    """
+
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        self.storage = storage_service
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """SHA-256 of a file, read in chunks."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(ManifestService.HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_entries(self, db: Session, slug: str) -> Dict[str, MediaManifestEntry]:
+        """Manifest entries of a universe, keyed by remote path."""
+        db.flush()  # SessionLocal does not autoflush; include pending entries
+        rows = db.query(MediaManifestEntry).filter(MediaManifestEntry.univers_slug == slug).all()
+        return {row.path: row for row in rows}
+
+    def scan(self, db: Session, slug: str) -> Dict[str, MediaManifestEntry]:
+        """
+        Refresh the manifest from the local universe folder.
+
+        New files and files whose size/mtime changed are hashed; unchanged
+        files keep their stored hash. Files that disappeared keep their entry
+        with `sha256=None` so a push can delete them remotely.
+
+        Returns:
+            All manifest entries of the universe, keyed by remote path
+        """
+        entries = self.get_entries(db, slug)
+        universe_path = self.storage.get_universe_path(slug)
+        seen = set()
+        hashed = 0
+
+        if universe_path.exists():
+            for file_path in universe_path.rglob("*"):
+                if not file_path.is_file():
+                    continue
+                remote_path = file_path.relative_to(self.storage.bucket_path).as_posix()
+                seen.add(remote_path)
+                stat = file_path.stat()
+
+                entry = entries.get(remote_path)
+                if entry is None:
+                    entry = MediaManifestEntry(univers_slug=slug, path=remote_path)
+                    db.add(entry)
+                    entries[remote_path] = entry
+                elif entry.sha256 and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+                    continue
+
+                entry.size = stat.st_size
+                entry.mtime = stat.st_mtime
+                entry.sha256 = self.hash_file(file_path)
+                hashed += 1
+
+        for remote_path, entry in entries.items():
+            if remote_path not in seen and entry.sha256 is not None:
+                entry.size = entry.mtime = entry.sha256 = None
+
+        db.flush()
+        print(f"[SYNC][MANIFEST] '{slug}': {len(seen)} files, {hashed} hashed")
+        return entries
+
+    def mark_synced(
+        self,
+        db: Session,
+        slug: str,
+        remote_path: str,
+        remote_etag: Optional[str],
+        entry: Optional[MediaManifestEntry] = None
+    ) -> MediaManifestEntry:
+        """
+        Record that the local file now matches the remote object.
+
+        The local file is re-stat'ed (and re-hashed if it changed, e.g. right
+        after a download) so the next scan sees it as unchanged.
+        """
+        if entry is None:
+            entry = db.query(MediaManifestEntry).filter(
+                MediaManifestEntry.univers_slug == slug,
+                MediaManifestEntry.path == remote_path
+            ).first()
+        if entry is None:
+            entry = MediaManifestEntry(univers_slug=slug, path=remote_path)
+            db.add(entry)
+
+        file_path = self.storage.bucket_path / remote_path
+        stat = file_path.stat()
+        if not entry.sha256 or entry.size != stat.st_size or entry.mtime != stat.st_mtime:
+            entry.size = stat.st_size
+            entry.mtime = stat.st_mtime
+            entry.sha256 = self.hash_file(file_path)
+
+        entry.synced_sha256 = entry.sha256
+        entry.remote_etag = remote_etag
+        entry.synced_at = datetime.utcnow()
+        return entry
+
+    def forget(self, db: Session, entry: MediaManifestEntry):
+        """Drop a manifest entry (file removed on both sides)."""
+        db.delete(entry)
+
+
+# Singleton instance
+manifest_service = ManifestService()
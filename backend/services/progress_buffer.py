@@ -0,0 +1,132 @@
+"""Progress buffer - Coalesces job progress updates in memory between flushes."""
+import threading
+from typing import Callable, Dict, Optional
+
+
+class JobProgress:
+    """Latest progress fields of one job."""
+
+    FIELDS = ("progress", "current_step", "total_steps", "message")
+
+    def __init__(self, progress: int = 0, current_step: int = 0, total_steps: int = 0, message: Optional[str] = None):
+        self.progress = progress or 0
+        self.current_step = current_step or 0
+        self.total_steps = total_steps or 0
+        self.message = message
+        self.dirty = False
+
+    def values(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class ProgressBuffer:
+    """
+    In-memory progress of running jobs, written to the database in batches.
+
+    A job's worker is the only writer of its progress, so the buffer keeps
+    absolute values: the row is read once when a job is first touched, then
+    every step only updates memory. `drain()` hands the changed jobs to the
+    caller to write in one transaction. An entry stays one flush cycle after
+    it is written, so steps arriving while that write commits never reload
+    a stale row.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, JobProgress] = {}
+        self.updates = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    def apply(
+        self,
+        job_id: str,
+        load: Callable[[], Optional[JobProgress]],
+        step: bool = False,
+        progress: Optional[int] = None,
+        current_step: Optional[int] = None,
+        total_steps: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> bool:
+        """
+        Record a progress update.
+
+        Args:
+            job_id: Job ID
+            load: Reads the job's stored progress (first update only)
+            step: Increment current_step by one
+            progress: Explicit progress (0-100)
+            current_step: Absolute current step (recomputes progress)
+            total_steps: New total number of steps
+            message: Progress message
+
+        Returns:
+            False if the job does not exist
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+        if entry is None:
+            loaded = load()  # Outside the lock: other jobs keep stepping
+            if loaded is None:
+                return False
+            with self._lock:
+                entry = self._entries.setdefault(job_id, loaded)
+
+        with self._lock:
+            if total_steps is not None:
+                entry.total_steps = total_steps
+            if progress is not None:
+                entry.progress = progress
+            if step:
+                entry.current_step += 1
+            if current_step is not None:
+                entry.current_step = current_step
+            if (step or current_step is not None) and entry.total_steps > 0:
+                entry.progress = int((entry.current_step / entry.total_steps) * 100)
+            if message:
+                entry.message = message
+            entry.dirty = True
+            self.updates += 1
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Latest known progress of a job (None if it has no entry)."""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            return entry.values() if entry else None
+
+    def pop(self, job_id: str) -> Optional[Dict]:
+        """Remove a job's entry; returns its values if not written yet."""
+        with self._lock:
+            entry = self._entries.pop(job_id, None)
+            return entry.values() if entry and entry.dirty else None
+
+    def drain(self) -> Dict[str, Dict]:
+        """
+        Take the changes to write.
+
+        Returns:
+            {job_id: values} of the jobs changed since the last drain
+        """
+        with self._lock:
+            for job_id in [job_id for job_id, entry in self._entries.items() if not entry.dirty]:
+                del self._entries[job_id]
+            pending = {}
+            for job_id, entry in self._entries.items():
+                pending[job_id] = entry.values()
+                entry.dirty = False
+            if pending:
+                self.flushes += 1
+                self.rows_written += len(pending)
+            return pending
+
+    def snapshot(self) -> Dict:
+        """Buffered jobs and how many updates were coalesced into how many writes."""
+        with self._lock:
+            return {
+                "buffered_jobs": len(self._entries),
+                "pending_jobs": sum(1 for entry in self._entries.values() if entry.dirty),
+                "updates": self.updates,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written
+            }
@@ -0,0 +1,168 @@
+"""Replicate backend - Async prediction client over a shared HTTP pool."""
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config import settings
+from services.download_service import download_service
+
+
+# Prediction states that will not change any more
+TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
+
+
+class ReplicateError(RuntimeError):
+    """A prediction failed, was canceled or timed out."""
+
+
+class PredictionTimeout(ReplicateError):
+    """A prediction did not finish within REPLICATE_PREDICTION_TIMEOUT."""
+
+
+class AsyncReplicateBackend:
+    """
+    Replicate predictions with create + poll on one `httpx.AsyncClient`.
+
+    Predictions and status polls share a single connection pool, so one
+    event loop can keep dozens of predictions in flight: a waiting
+    prediction costs a pending coroutine, not a thread. Outputs are
+    streamed to disk by the download service.
+
+    Anything with the same coroutine methods (`run`, `download_to`, `aclose`)
+    can stand in for it, e.g. tests/fake_replicate.py.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Shared client, created on the running loop (a client cannot move between loops)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=settings.REPLICATE_API_URL,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=settings.REPLICATE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.REPLICATE_MAX_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(30.0, read=120.0),
+                follow_redirects=True
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def _api(self, method: str, url: str, **kwargs) -> Dict:
+        """Authenticated API call; honours Retry-After on 429."""
+        headers = {"Authorization": f"Bearer {settings.REPLICATE_API_TOKEN}"}
+        for attempt in range(5):
+            response = await self._http().request(method, url, headers=headers, **kwargs)
+            if response.status_code != 429 or attempt == 4:
+                break
+            await asyncio.sleep(float(response.headers.get("Retry-After", settings.REPLICATE_POLL_INTERVAL)))
+        response.raise_for_status()
+        return response.json()
+
+    async def get_model(self, model: str) -> Dict:
+        """Model metadata ("owner/name"); raises httpx.HTTPStatusError if unknown."""
+        return await self._api("GET", f"/models/{model}")
+
+    # =========================================================================
+    # PREDICTIONS
+    # =========================================================================
+
+    async def create_prediction(self, model: str, input: Dict) -> Dict:
+        """
+        Start a prediction.
+
+        Args:
+            model: "owner/name" (latest version) or "owner/name:version"
+            input: Model input
+
+        Returns:
+            Prediction JSON (id, status, urls, output, error)
+        """
+        if ":" in model:
+            _, version = model.split(":", 1)
+            return await self._api("POST", "/predictions", json={"version": version, "input": input})
+        return await self._api("POST", f"/models/{model}/predictions", json={"input": input})
+
+    async def get_prediction(self, prediction_id: str) -> Dict:
+        return await self._api("GET", f"/predictions/{prediction_id}")
+
+    async def wait(self, prediction: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Poll a prediction until it reaches a terminal status.
+
+        Raises:
+            ReplicateError: Prediction failed, was canceled or timed out
+        """
+        timeout = settings.REPLICATE_PREDICTION_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while prediction.get("status") not in TERMINAL_STATUSES:
+            if time.monotonic() >= deadline:
+                raise PredictionTimeout(f"Prediction {prediction.get('id')} timed out after {timeout:.0f}s")
+            await asyncio.sleep(settings.REPLICATE_POLL_INTERVAL)
+            prediction = await self.get_prediction(prediction["id"])
+
+        if prediction["status"] != "succeeded":
+            raise ReplicateError(
+                f"Prediction {prediction.get('id')} {prediction['status']}: {prediction.get('error')}"
+            )
+        return prediction
+
+    async def cancel_prediction(self, prediction_id: str) -> Dict:
+        """Stop a prediction (frees Replicate capacity; billing stops)."""
+        return await self._api("POST", f"/predictions/{prediction_id}/cancel")
+
+    async def run(self, model: str, input: Dict) -> Any:
+        """
+        Create a prediction, wait for it and return its output.
+
+        If the waiting coroutine is cancelled (job cancelled) or times out,
+        the prediction is cancelled on Replicate instead of left running.
+        """
+        prediction = await self.create_prediction(model, input)
+        try:
+            prediction = await self.wait(prediction)
+        except (asyncio.CancelledError, PredictionTimeout):
+            await self._cancel_quietly(prediction["id"])
+            raise
+        return prediction.get("output")
+
+    async def _cancel_quietly(self, prediction_id: str):
+        try:
+            # Shielded: the caller is being cancelled, this request must still go out
+            await asyncio.shield(self.cancel_prediction(prediction_id))
+            print(f"🛑 Cancelled prediction {prediction_id}")
+        except (Exception, asyncio.CancelledError) as e:
+            print(f"⚠️ Failed to cancel prediction {prediction_id}: {e}")
+
+    # =========================================================================
+    # OUTPUTS
+    # =========================================================================
+
+    async def download_to(self, url: str, local_path: Path) -> Path:
+        """
+        Stream an output file to disk (delivery URLs are public, no auth header).
+
+        Goes through the shared download service: chunked writes, atomic
+        rename and Range resume, never the whole file in memory.
+        """
+        return await download_service.download(url, local_path)
+
+    async def aclose(self):
+        """Close the connection pool (must run on the loop that created it)."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
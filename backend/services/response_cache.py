@@ -0,0 +1,283 @@
+"""Response cache - In-process LRU of serialized GET responses with stale-while-revalidate."""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from services.storage_service import storage_service
+
+
+class CachedResponse:
+    """A serialized JSON body with the validators it was built from."""
+
+    def __init__(self, body: bytes, etag: str, last_modified: Optional[datetime] = None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+        self.tags: Set[str] = set()
+
+
+class ResponseCache:
+    """
+    Bounded LRU of built API responses, keyed by route + parameters.
+
+    - Entries are evicted least-recently-used first when either
+      RESPONSE_CACHE_MAX_ENTRIES or RESPONSE_CACHE_MAX_BYTES is exceeded
+    - Entries carry tags ("universes", "univers:{slug}"); writes invalidate
+      the tags they affect so the next request rebuilds
+    - Fresh for RESPONSE_CACHE_TTL; then served stale for up to
+      RESPONSE_CACHE_STALE_TTL while one background refresh rebuilds it.
+      The TTL only bounds staleness for changes that bypass invalidation
+      (e.g. files edited outside the backend)
+
+    A build that overlaps an invalidation is returned but not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.enabled = settings.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.RESPONSE_CACHE_MAX_BYTES
+        self.ttl = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.stale_ttl = settings.RESPONSE_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._generation = 0  # Bumped by every invalidation
+        self._refreshing: Set[Hashable] = set()
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    @property
+    def generation(self) -> int:
+        """Read before building an entry and pass to `put()`."""
+        with self._lock:
+            return self._generation
+
+    def get(
+        self,
+        key: Hashable,
+        refresh: Optional[Callable[[Session], CachedResponse]] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key
+            refresh: Rebuilds the entry with a fresh session; when given, a
+                stale entry is returned and refreshed in the background
+
+        Returns:
+            The entry (fresh or stale), or None on miss
+        """
+        if not self.enabled:
+            return None
+
+        schedule = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            age = time.monotonic() - entry.stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+
+            if refresh is None or age >= self.ttl + self.stale_ttl:
+                self._remove(key)
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["stale_hits"] += 1
+            if key not in self._refreshing:
+                self._refreshing.add(key)
+                schedule = True
+            tags = set(entry.tags)
+            generation = self._generation
+
+        if schedule:
+            self._get_refresh_pool().submit(self._refresh, key, refresh, tags, generation)
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        entry: CachedResponse,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Store an entry, evicting least-recently-used ones over the bounds.
+
+        Args:
+            key: Cache key
+            entry: Built response
+            tags: Invalidation tags
+            generation: `generation` read before the build started; the entry
+                is dropped if an invalidation happened since
+
+        Returns:
+            True if stored
+        """
+        if not self.enabled or len(entry.body) > self.max_bytes:
+            return False
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+
+            self._remove(key)
+            entry.tags = set(tags)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._stats["stores"] += 1
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+        return True
+
+    def _remove(self, key: Hashable):
+        """Drop one entry (caller holds lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    # =========================================================================
+    # BACKGROUND REFRESH
+    # =========================================================================
+
+    def _get_refresh_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+            return self._refresh_pool
+
+    def _refresh(
+        self,
+        key: Hashable,
+        build: Callable[[Session], CachedResponse],
+        tags: Set[str],
+        generation: int
+    ):
+        """Rebuild a stale entry with its own session."""
+        db = SessionLocal()
+        try:
+            entry = build(db)
+            if entry is not None:
+                self.put(key, entry, tags, generation)
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            print(f"⚠️  Response cache refresh failed for {key}: {e}")
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing.discard(key)
+
+    # =========================================================================
+    # INVALIDATION
+    # =========================================================================
+
+    def invalidate(self, *tags: str):
+        """Drop every entry carrying one of the tags."""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+            self._stats["invalidations"] += 1
+
+    def invalidate_universe(self, slug: Optional[str] = None):
+        """Drop the listings and the detail of a universe (all universes if None)."""
+        if slug is None:
+            self.clear()
+        else:
+            self.invalidate("universes", f"univers:{slug}")
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+            self._stats["invalidations"] += 1
+
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hit rate, size and memory footprint."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hit_rate": round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0,
+                **stats
+            }
+
+    def reset_stats(self):
+        """Reset counters (entries are kept)."""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+# Singleton instance
+response_cache = ResponseCache()
+
+# Media changes (generation, sync downloads, deletions) change embedded URLs
+storage_service.add_change_listener(response_cache.invalidate_universe)
@@ -2,8 +2,11 @@
 import os
 import shutil
 import mimetypes
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, List, BinaryIO, Union
+from typing import Callable, Dict, FrozenSet, Optional, List, BinaryIO, Tuple, Union
 from config import settings
 
 
@@ -19,12 +22,24 @@ class StorageService:
             ├── fr.mp3
             ├── en.mp3
             └── ...
+    
+    URL helpers resolve existence against a per-universe index of file names
+    (one `os.scandir` per folder) instead of stat'ing every file. The index is
+    invalidated by every write/delete made through this service and expires
+    after STORAGE_INDEX_TTL to pick up changes made outside the backend.
     """
     
     def __init__(self):
         self.bucket_name = settings.SUPABASE_BUCKET_NAME
         self.bucket_path = settings.BUCKETS_PATH / self.bucket_name
         self.bucket_path.mkdir(parents=True, exist_ok=True)
+        self.index_ttl = settings.STORAGE_INDEX_TTL
+        self._index_lock = threading.Lock()
+        self._indexes: Dict[str, Tuple[float, FrozenSet[str]]] = {}  # slug -> (scanned_at, names)
+        self._index_versions: Dict[str, int] = {}  # Bumped on invalidation or detected change
+        self._storage_version = 0  # Bumped on any change (all universes)
+        self._boot_id = uuid.uuid4().hex[:8]  # Versions restart at 0 with the process
+        self._listeners: List[Callable[[Optional[str]], None]] = []
     
     # =========================================================================
     # PATH HELPERS
@@ -51,6 +66,98 @@ class StorageService:
         """Get path for music file in a specific language (flat structure)."""
         return self.get_universe_path(slug) / f"{language}.mp3"
     
+    # =========================================================================
+    # DIRECTORY INDEX
+    # =========================================================================
+    
+    def get_universe_index(self, slug: str) -> FrozenSet[str]:
+        """
+        Names of the files directly inside a universe folder (cached).
+        
+        Args:
+            slug: Universe slug
+        
+        Returns:
+            Set of file names (empty if the folder does not exist)
+        """
+        now = time.monotonic()
+        with self._index_lock:
+            cached = self._indexes.get(slug)
+            if cached and now - cached[0] < self.index_ttl:
+                return cached[1]
+            version = self._index_versions.get(slug, 0)
+        
+        try:
+            with os.scandir(self.get_universe_path(slug)) as entries:
+                names = frozenset(entry.name for entry in entries if entry.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            names = frozenset()
+        
+        changed = False
+        with self._index_lock:
+            # Don't cache a listing that raced with a write
+            if self._index_versions.get(slug, 0) == version:
+                previous = self._indexes.get(slug)
+                if previous and previous[1] != names:
+                    # Changed outside the backend since the last scan
+                    self._index_versions[slug] = version + 1
+                    self._storage_version += 1
+                    changed = True
+                self._indexes[slug] = (now, names)
+        if changed:
+            self._notify(slug)
+        return names
+    
+    def get_universe_version(self, slug: str) -> str:
+        """
+        Version of a universe folder, changed whenever its files change.
+        
+        Used in HTTP ETags of responses that embed media URLs.
+        """
+        self.get_universe_index(slug)  # Refresh an expired listing first
+        with self._index_lock:
+            return f"{self._boot_id}.{self._index_versions.get(slug, 0)}"
+    
+    def get_storage_version(self) -> str:
+        """Version of the whole bucket (any universe folder change)."""
+        with self._index_lock:
+            return f"{self._boot_id}.{self._storage_version}"
+    
+    def invalidate_index(self, slug: Optional[str] = None):
+        """Drop the cached listing of one universe (or all of them)."""
+        with self._index_lock:
+            slugs = [slug] if slug else list(self._indexes)
+            for s in slugs:
+                self._indexes.pop(s, None)
+                self._index_versions[s] = self._index_versions.get(s, 0) + 1
+            self._storage_version += 1
+        self._notify(slug)
+    
+    def add_change_listener(self, callback: Callable[[Optional[str]], None]):
+        """Call `callback(slug)` whenever a universe folder changes (None = all)."""
+        self._listeners.append(callback)
+    
+    def _notify(self, slug: Optional[str]):
+        for callback in self._listeners:
+            callback(slug)
+    
+    def _invalidate_remote_path(self, remote_path: str):
+        """Invalidate the universe owning a bucket-relative path."""
+        self.invalidate_index(Path(remote_path).parts[0] if remote_path else None)
+    
+    def _invalidate_local_path(self, local_path: Path):
+        """Invalidate the universe owning an absolute local path."""
+        try:
+            self._invalidate_remote_path(local_path.relative_to(self.bucket_path).as_posix())
+        except ValueError:
+            pass  # Outside the bucket
+    
+    def _indexed_file_exists(self, slug: str, name: str) -> bool:
+        """Existence check through the index (flat files only)."""
+        if "/" in name or self.index_ttl <= 0:
+            return (self.get_universe_path(slug) / name).is_file()
+        return name in self.get_universe_index(slug)
+    
     # =========================================================================
     # URL GENERATION (for API responses)
     # =========================================================================
@@ -69,30 +176,26 @@ class StorageService:
 
     def get_asset_image_url(self, slug: str, image_name: str) -> Optional[str]:
         """Get public URL for an asset image if it exists."""
-        path = self.get_asset_image_path(slug, image_name)
-        if path.exists():
+        if self._indexed_file_exists(slug, image_name):
             return self.get_public_url(f"{slug}/{image_name}")
         return None
 
     def get_asset_video_url(self, slug: str, image_name: str) -> Optional[str]:
         """Get public URL for an asset video if it exists."""
         video_name = Path(image_name).stem + ".mp4"
-        path = self.get_asset_video_path(slug, image_name)
-        if path.exists():
+        if self._indexed_file_exists(slug, video_name):
             return self.get_public_url(f"{slug}/{video_name}")
         return None
 
     def get_thumbnail_url(self, slug: str) -> Optional[str]:
         """Get public URL for universe thumbnail if it exists."""
-        path = self.get_thumbnail_path(slug)
-        if path.exists():
+        if self._indexed_file_exists(slug, "thumbnail.jpg"):
             return self.get_public_url(f"{slug}/thumbnail.jpg")
         return None
 
     def get_music_url(self, slug: str, language: str) -> Optional[str]:
         """Get public URL for music file if it exists."""
-        path = self.get_music_file_path(slug, language)
-        if path.exists():
+        if self._indexed_file_exists(slug, f"{language}.mp3"):
             return self.get_public_url(f"{slug}/{language}.mp3")
         return None
     
@@ -129,8 +232,59 @@ class StorageService:
             with open(local_path, 'wb') as f:
                 shutil.copyfileobj(content, f)
         
+        self._invalidate_remote_path(remote_path)
         return self.get_public_url(remote_path)
     
+    def write_file(self, local_path: Path, content: bytes) -> Path:
+        """
+        Write bytes to a local path inside the bucket (e.g. generated media).
+        
+        The content goes to a partial file first and is renamed into place,
+        so readers never see a half-written file.
+        
+        Args:
+            local_path: Absolute path (from get_asset_image_path & co.)
+            content: File content
+        
+        Returns:
+            The written path
+        """
+        partial_path = self.get_partial_path(local_path, uuid.uuid4().hex[:8])
+        partial_path.write_bytes(content)
+        return self.commit_file(partial_path, local_path)
+    
+    def get_partial_path(self, local_path: Path, key: str = "") -> Path:
+        """
+        Staging path for a file being written to `local_path`.
+        
+        Partial files live under `.partial/` at the bucket root: same
+        filesystem as the target (atomic rename) and outside every universe
+        folder, so they never appear in listings, manifests or the index.
+        
+        Args:
+            local_path: Final absolute path
+            key: Distinguishes sources (e.g. a URL hash) so a resumed
+                download never appends to another file's bytes
+        
+        Returns:
+            Partial file path (parent directory created)
+        """
+        try:
+            relative = local_path.relative_to(self.bucket_path)
+            partial_dir = self.bucket_path / ".partial" / relative.parent
+        except ValueError:
+            partial_dir = local_path.parent  # Outside the bucket
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        suffix = f".{key}.part" if key else ".part"
+        return partial_dir / f".{local_path.name}{suffix}"
+    
+    def commit_file(self, partial_path: Path, local_path: Path) -> Path:
+        """Atomically move a completed partial file into place."""
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(partial_path, local_path)
+        self._invalidate_local_path(local_path)
+        return local_path
+    
     def download_file(self, remote_path: str) -> Optional[bytes]:
         """
         Download/read a file from local storage.
@@ -159,6 +313,7 @@ class StorageService:
         local_path = self.bucket_path / remote_path
         if local_path.exists():
             local_path.unlink()
+            self._invalidate_remote_path(remote_path)
             return True
         return False
     
@@ -176,6 +331,7 @@ class StorageService:
         universe_path = self.get_universe_path(slug)
         universe_path.mkdir(parents=True, exist_ok=True)
         # Plus de sous-dossiers - structure plate
+        self.invalidate_index(slug)
         return universe_path
     
     def delete_universe_folder(self, slug: str) -> bool:
@@ -183,6 +339,7 @@ class StorageService:
         universe_path = self.get_universe_path(slug)
         if universe_path.exists():
             shutil.rmtree(universe_path)
+            self.invalidate_index(slug)
             return True
         return False
     
@@ -267,6 +424,7 @@ class StorageService:
         dst = self.bucket_path / dest_path
         dst.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy(src, dst)
+        self._invalidate_remote_path(dest_path)
         return self.get_public_url(dest_path)
 
 
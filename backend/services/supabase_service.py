@@ -1,8 +1,10 @@
 """Supabase service - Interface with Supabase DB and Storage."""
 import os
+import uuid
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
 from config import settings
 
 
@@ -13,8 +15,15 @@ class SupabaseService:
     - Storage bucket (media files)
     """
     
+    # Max IDs per in_() filter (keeps request URLs short)
+    IN_CHUNK_SIZE = 100
+    
+    # Max rows per bulk upsert request
+    BULK_CHUNK_SIZE = 500
+    
     def __init__(self):
         self.client: Optional[Client] = None
+        self._embedded_select_supported = settings.SUPABASE_EMBEDDED_SELECT
         self._init_client()
     
     def _init_client(self):
@@ -149,30 +158,18 @@ class SupabaseService:
         return response.data
     
     def upsert_univers_translation(self, univers_id: int, language: str, name: str) -> Dict[str, Any]:
-        """Insert or update a universe translation."""
-        self._require_client()
-        
-        # Check if exists
-        existing = self.client.table("univers_translations")\
-            .select("id")\
-            .eq("univers_id", univers_id)\
-            .eq("language", language)\
-            .execute()
-        
-        data = {
+        """Insert or update a universe translation (by univers_id + language)."""
+        rows = self.upsert_univers_translations([{
             "univers_id": univers_id,
             "language": language,
             "name": name
-        }
-        
-        if existing.data:
-            data["id"] = existing.data[0]["id"]
+        }])
         
-        response = self.client.table("univers_translations")\
-            .upsert(data)\
-            .execute()
-        
-        return response.data[0] if response.data else None
+        return rows[0] if rows else None
+    
+    def upsert_univers_translations(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk insert or update universe translations (by univers_id + language)."""
+        return self._upsert_by_language("univers_translations", "univers_id", rows)
     
     def delete_univers_translations(self, univers_id: int):
         """Delete all translations for a universe."""
@@ -199,6 +196,22 @@ class SupabaseService:
         
         return response.data
     
+    def get_asset_versions(self, univers_id: int) -> Dict[str, Optional[str]]:
+        """
+        Fetch asset ids with their last modification time (for incremental sync).
+
+        Returns:
+            Dict mapping asset id to its updated_at (or created_at) ISO string
+        """
+        self._require_client()
+
+        response = self.client.table("univers_assets")\
+            .select("id, created_at, updated_at")\
+            .eq("univers_id", univers_id)\
+            .execute()
+
+        return {row["id"]: row.get("updated_at") or row.get("created_at") for row in response.data}
+
     def get_asset_by_id(self, asset_id: str) -> Optional[Dict[str, Any]]:
         """Fetch an asset by ID."""
         self._require_client()
@@ -221,6 +234,10 @@ class SupabaseService:
         
         return response.data[0] if response.data else None
     
+    def upsert_assets(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk insert or update assets (by id)."""
+        return self._bulk_upsert("univers_assets", rows, on_conflict="id")
+    
     def delete_asset(self, asset_id: str) -> bool:
         """Delete an asset by ID."""
         self._require_client()
@@ -232,6 +249,16 @@ class SupabaseService:
         
         return True
     
+    def delete_assets(self, asset_ids: List[str]):
+        """Delete several assets by ID."""
+        self._require_client()
+
+        for i in range(0, len(asset_ids), self.IN_CHUNK_SIZE):
+            self.client.table("univers_assets")\
+                .delete()\
+                .in_("id", asset_ids[i:i + self.IN_CHUNK_SIZE])\
+                .execute()
+
     def delete_all_assets(self, univers_id: int):
         """Delete all assets for a universe."""
         self._require_client()
@@ -268,6 +295,10 @@ class SupabaseService:
         
         return response.data[0] if response.data else None
     
+    def upsert_assets_prompts(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk insert or update asset prompts (by asset_id)."""
+        return self._bulk_upsert("univers_assets_prompts", rows, on_conflict="asset_id")
+    
     # =========================================================================
     # ASSET TRANSLATIONS OPERATIONS
     # =========================================================================
@@ -284,30 +315,18 @@ class SupabaseService:
         return response.data
     
     def upsert_asset_translation(self, asset_id: str, language: str, display_name: str) -> Dict[str, Any]:
-        """Insert or update an asset translation."""
-        self._require_client()
-        
-        # Check if exists
-        existing = self.client.table("univers_assets_translations")\
-            .select("id")\
-            .eq("asset_id", asset_id)\
-            .eq("language", language)\
-            .execute()
-        
-        data = {
+        """Insert or update an asset translation (by asset_id + language)."""
+        rows = self.upsert_assets_translations([{
             "asset_id": asset_id,
             "language": language,
             "display_name": display_name
-        }
-        
-        if existing.data:
-            data["id"] = existing.data[0]["id"]
-        
-        response = self.client.table("univers_assets_translations")\
-            .upsert(data)\
-            .execute()
+        }])
         
-        return response.data[0] if response.data else None
+        return rows[0] if rows else None
+    
+    def upsert_assets_translations(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk insert or update asset translations (by asset_id + language)."""
+        return self._upsert_by_language("univers_assets_translations", "asset_id", rows)
     
     def delete_asset_translations(self, asset_id: str):
         """Delete all translations for an asset."""
@@ -318,6 +337,74 @@ class SupabaseService:
             .eq("asset_id", asset_id)\
             .execute()
     
+    def delete_assets_translations(self, asset_ids: List[str]):
+        """Delete all translations for several assets."""
+        self._require_client()
+        
+        for i in range(0, len(asset_ids), self.IN_CHUNK_SIZE):
+            self.client.table("univers_assets_translations")\
+                .delete()\
+                .in_("asset_id", asset_ids[i:i + self.IN_CHUNK_SIZE])\
+                .execute()
+    
+    # =========================================================================
+    # BULK HELPERS
+    # =========================================================================
+    
+    def _bulk_upsert(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Upsert many rows with one request per BULK_CHUNK_SIZE rows.
+        
+        The conflict target lets PostgREST resolve insert vs update, so no
+        existence check is needed.
+        """
+        self._require_client()
+        
+        written = []
+        for i in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            response = self.client.table(table)\
+                .upsert(rows[i:i + self.BULK_CHUNK_SIZE], on_conflict=on_conflict)\
+                .execute()
+            written.extend(response.data or [])
+        
+        return written
+    
+    def _upsert_by_language(
+        self,
+        table: str,
+        parent_column: str,
+        rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Upsert per-language rows of tables without a (parent, language)
+        unique constraint, so PostgREST cannot use it as conflict target.
+        
+        Existing IDs are resolved with one in_() select per IN_CHUNK_SIZE
+        parents; new rows get a fresh UUID. Rows are then upserted on `id`.
+        """
+        self._require_client()
+        if not rows:
+            return []
+        
+        parents = list({row[parent_column] for row in rows})
+        ids = {
+            (row[parent_column], row["language"]): row["id"]
+            for row in self._select_in(table, parent_column, parents, columns=f"id,{parent_column},language")
+        }
+        
+        resolved = {}
+        for row in rows:
+            key = (row[parent_column], row["language"])
+            row_id = ids.setdefault(key, row.get("id") or str(uuid.uuid4()))
+            resolved[key] = {**row, "id": row_id}  # Last row wins for duplicated keys
+        
+        return self._bulk_upsert(table, list(resolved.values()), on_conflict="id")
+    
     # =========================================================================
     # STORAGE OPERATIONS
     # =========================================================================
@@ -410,6 +497,12 @@ class SupabaseService:
             print(f"List failed: {e}")
             return []
     
+    def get_bucket(self):
+        """Get the raw storage bucket client (used by the transfer engine)."""
+        self._require_client()
+        
+        return self.client.storage.from_(settings.SUPABASE_BUCKET_NAME)
+    
     def get_storage_public_url(self, remote_path: str) -> str:
         """Get public URL for a file in Supabase Storage."""
         self._require_client()
@@ -421,37 +514,96 @@ class SupabaseService:
     # FULL UNIVERSE FETCH (with all relations)
     # =========================================================================
     
+    # Nested PostgREST select used to fetch a whole universe in one request
+    FULL_UNIVERS_SELECT = (
+        "*, "
+        "univers_prompts(*), "
+        "univers_translations(*), "
+        "univers_music_prompts(*), "
+        "univers_assets(*, univers_assets_prompts(*), univers_assets_translations(*))"
+    )
+    
     def get_full_univers(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         Fetch a complete universe with all related data.
         
+        Uses a single embedded select when the PostgREST schema exposes the
+        relationships, otherwise falls back to one bulk query per table.
+        
         Returns:
             Dict with: univers, prompts, translations, assets (with their prompts/translations)
         """
         self._require_client()
         
-        # Get universe
+        if self._embedded_select_supported:
+            try:
+                return self._get_full_univers_embedded(slug)
+            except APIError as e:
+                # Relationship missing from the schema cache: stop trying
+                print(f"⚠️ Embedded select not supported, using bulk queries: {e}")
+                self._embedded_select_supported = False
+            except Exception as e:
+                print(f"⚠️ Embedded select failed, falling back to bulk queries: {e}")
+        
+        return self._get_full_univers_bulk(slug)
+    
+    def _get_full_univers_embedded(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Fetch a universe and all its relations in one request."""
+        response = self.client.table("univers")\
+            .select(self.FULL_UNIVERS_SELECT)\
+            .eq("slug", slug)\
+            .limit(1)\
+            .execute()
+        
+        if not response.data:
+            return None
+        
+        univers = dict(response.data[0])
+        prompts = self._one_or_none(univers.pop("univers_prompts", None))
+        translations = univers.pop("univers_translations", None) or []
+        music_prompts = univers.pop("univers_music_prompts", None) or []
+        
+        assets = []
+        for embedded in sorted(univers.pop("univers_assets", None) or [], key=lambda a: a["sort_order"]):
+            asset = dict(embedded)
+            asset["prompts"] = self._one_or_none(asset.pop("univers_assets_prompts", None))
+            asset["translations"] = asset.pop("univers_assets_translations", None) or []
+            assets.append(asset)
+        
+        return {
+            "univers": univers,
+            "prompts": prompts,
+            "translations": translations,
+            "music_prompts": music_prompts,
+            "assets": assets
+        }
+    
+    def _get_full_univers_bulk(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Fetch a universe with one query per table (no per-asset queries)."""
         univers = self.get_univers_by_slug(slug)
         if not univers:
             return None
         
         univers_id = univers["id"]
         
-        # Get prompts
         prompts = self.get_univers_prompts(univers_id)
-        
-        # Get translations
         translations = self.get_univers_translations(univers_id)
-        
-        # Get music prompts
         music_prompts = self.get_univers_music_prompts(univers_id)
-
-        # Get assets with their relations
         assets = self.get_assets(univers_id)
+        
+        asset_ids = [asset["id"] for asset in assets]
+        prompts_by_asset = {
+            row["asset_id"]: row
+            for row in self._select_in("univers_assets_prompts", "asset_id", asset_ids)
+        }
+        translations_by_asset: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._select_in("univers_assets_translations", "asset_id", asset_ids):
+            translations_by_asset.setdefault(row["asset_id"], []).append(row)
+        
         for asset in assets:
-            asset["prompts"] = self.get_asset_prompts(asset["id"])
-            asset["translations"] = self.get_asset_translations(asset["id"])
-
+            asset["prompts"] = prompts_by_asset.get(asset["id"])
+            asset["translations"] = translations_by_asset.get(asset["id"], [])
+        
         return {
             "univers": univers,
             "prompts": prompts,
@@ -459,6 +611,24 @@ class SupabaseService:
             "music_prompts": music_prompts,
             "assets": assets
         }
+    
+    def _select_in(self, table: str, column: str, values: List[Any], columns: str = "*") -> List[Dict[str, Any]]:
+        """Select all rows whose column is in values, chunking long lists."""
+        rows = []
+        for i in range(0, len(values), self.IN_CHUNK_SIZE):
+            response = self.client.table(table)\
+                .select(columns)\
+                .in_(column, values[i:i + self.IN_CHUNK_SIZE])\
+                .execute()
+            rows.extend(response.data)
+        return rows
+    
+    @staticmethod
+    def _one_or_none(embedded: Any) -> Optional[Dict[str, Any]]:
+        """Embedded one-to-one relations come back as an object or a 0/1-item list."""
+        if isinstance(embedded, list):
+            return embedded[0] if embedded else None
+        return embedded or None
 
     def get_univers_music_prompts(self, univers_id: int) -> List[Dict[str, Any]]:
         """Get music prompts for a universe."""
@@ -470,17 +640,17 @@ class SupabaseService:
         return response.data
 
     def upsert_univers_music_prompt(self, univers_id: int, language: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Upsert music prompt."""
-        self._require_client()
-        data_with_id = {
+        """Upsert music prompt (by univers_id + language)."""
+        rows = self.upsert_univers_music_prompts([{
             "univers_id": univers_id,
             "language": language,
             **data
-        }
-        response = self.client.table("univers_music_prompts")\
-            .upsert(data_with_id)\
-            .execute()
-        return response.data[0]
+        }])
+        return rows[0]
+
+    def upsert_univers_music_prompts(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk upsert music prompts (by univers_id + language)."""
+        return self._bulk_upsert("univers_music_prompts", rows, on_conflict="univers_id,language")
 
     def delete_univers_music_prompts(self, univers_id: int):
         """Delete all music prompts for a universe."""
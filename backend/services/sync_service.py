@@ -1,27 +1,46 @@
 """Sync service - Bidirectional sync between local SQLite and Supabase."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Tuple, Dict, Any
-from datetime import datetime
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session, selectinload
+
+from config import settings
 
 from database import (
-    Univers, UniversPrompts, UniversTranslation,
+    SessionLocal, Univers, UniversPrompts, UniversTranslation,
     UniversAsset, UniversAssetPrompts, UniversAssetTranslation, UniversMusicPrompts
 )
 from services.storage_service import storage_service
 from services.supabase_service import supabase_service
-from schemas import SyncResponse, SyncInitResponse
+from services.transfer_service import transfer_engine
+from services.manifest_service import manifest_service
+from services.job_service import job_service
+from services.response_cache import response_cache
+from schemas import SyncResponse, SyncInitResponse, SyncRowStats, TransferStats
 
 
 class SyncService:
     """
     Handles synchronization between local SQLite database and Supabase.
     
-    Strategy: "Last Write Wins" - The source being synced FROM always overwrites.
+    Strategy (settings.SYNC_MODE):
+        - "last_write_wins": the source being synced FROM always overwrites.
+        - "timestamp_merge": per asset, the side with the newer updated_at wins,
+          and rows created on the destination since the last sync are kept.
+
+    Assets are diffed against the universe's `last_synced_at` watermark, so
+    only inserted, changed and deleted rows are written. `force=True` falls
+    back to a full replace.
     """
     
     def __init__(self):
         self.storage = storage_service
         self.supabase = supabase_service
+        self.transfer = transfer_engine
+        self.manifest = manifest_service
+        # Serializes SQLite write transactions across concurrent syncs
+        self._write_lock = threading.RLock()
     
     # =========================================================================
     # PULL: Supabase -> Local
@@ -41,6 +60,7 @@ class SyncService:
         """
         errors = []
         synced_items = 0
+        sync_started = datetime.utcnow()
         
         try:
             # Check Supabase connection
@@ -62,73 +82,77 @@ class SyncService:
             
             remote_univers = remote_data["univers"]
             
-            # Check if exists locally
-            local_univers = db.query(Univers).filter(Univers.slug == slug).first()
+            # Apply rows (SQLite writes go through a single writer)
+            with self._write_lock:
+                # Check if exists locally
+                local_univers = db.query(Univers).filter(Univers.slug == slug).first()
+                watermark = local_univers.last_synced_at if local_univers else None
             
-            # Create or update universe
-            if local_univers:
-                # Update existing
-                local_univers.name = remote_univers["name"]
-                local_univers.thumbnail_url = remote_univers.get("thumbnail_url")
-                local_univers.is_public = remote_univers.get("is_public", True)
-                local_univers.background_music = remote_univers.get("background_music")
-                local_univers.background_color = remote_univers.get("background_color")
-                local_univers.supabase_id = remote_univers["id"]
-                local_univers.last_synced_at = datetime.utcnow()
-            else:
-                # Create new
-                local_univers = Univers(
-                    name=remote_univers["name"],
-                    slug=remote_univers["slug"],
-                    thumbnail_url=remote_univers.get("thumbnail_url"),
-                    is_public=remote_univers.get("is_public", True),
-                    background_music=remote_univers.get("background_music"),
-                    background_color=remote_univers.get("background_color"),
-                    supabase_id=remote_univers["id"],
-                    last_synced_at=datetime.utcnow()
-                )
-                db.add(local_univers)
-            
-            db.flush()  # Get ID
-            synced_items += 1
+                # Create or update universe
+                if local_univers:
+                    # Update existing
+                    local_univers.name = remote_univers["name"]
+                    local_univers.thumbnail_url = remote_univers.get("thumbnail_url")
+                    local_univers.is_public = remote_univers.get("is_public", True)
+                    local_univers.background_music = remote_univers.get("background_music")
+                    local_univers.background_color = remote_univers.get("background_color")
+                    local_univers.supabase_id = remote_univers["id"]
+                else:
+                    # Create new
+                    local_univers = Univers(
+                        name=remote_univers["name"],
+                        slug=remote_univers["slug"],
+                        thumbnail_url=remote_univers.get("thumbnail_url"),
+                        is_public=remote_univers.get("is_public", True),
+                        background_music=remote_univers.get("background_music"),
+                        background_color=remote_univers.get("background_color"),
+                        supabase_id=remote_univers["id"]
+                    )
+                    db.add(local_univers)
             
-            # Sync prompts
-            if remote_data.get("prompts"):
-                self._sync_univers_prompts(db, local_univers.id, remote_data["prompts"])
+                db.flush()  # Get ID
                 synced_items += 1
             
-            # Sync translations
-            self._sync_univers_translations(db, local_univers.id, remote_data.get("translations", []))
-            synced_items += len(remote_data.get("translations", []))
+                # Sync prompts
+                if remote_data.get("prompts"):
+                    self._sync_univers_prompts(db, local_univers.id, remote_data["prompts"])
+                    synced_items += 1
+            
+                # Sync translations
+                self._sync_univers_translations(db, local_univers.id, remote_data.get("translations", []))
+                synced_items += len(remote_data.get("translations", []))
 
-            # Sync music prompts
-            self._sync_univers_music_prompts(db, local_univers.id, remote_data.get("music_prompts", []))
-            synced_items += len(remote_data.get("music_prompts", []))
+                # Sync music prompts
+                self._sync_univers_music_prompts(db, local_univers.id, remote_data.get("music_prompts", []))
+                synced_items += len(remote_data.get("music_prompts", []))
 
-            # Delete existing assets (replace all)
-            db.query(UniversAsset).filter(UniversAsset.univers_id == local_univers.id).delete()
-            
-            # Sync assets
-            for remote_asset in remote_data.get("assets", []):
-                try:
-                    self._sync_asset(db, local_univers.id, slug, remote_asset)
-                    synced_items += 1
-                except Exception as e:
-                    errors.append(f"Asset {remote_asset.get('id')}: {str(e)}")
+                # Sync assets (only rows changed since the last sync)
+                rows = self._pull_assets(
+                    db, local_univers.id, remote_data.get("assets", []),
+                    watermark=None if force else watermark,
+                    merge=self._merge_mode(force),
+                    sync_started=sync_started,
+                    errors=errors
+                )
+                synced_items += rows.inserted + rows.updated + rows.deleted
+                local_univers.last_synced_at = sync_started
+                db.commit()
+                response_cache.invalidate_universe(slug)
             
             # Create local storage folder
             self.storage.create_universe_folder(slug)
             
             # Download media files
-            files_downloaded = self._download_universe_files(slug)
-            
-            db.commit()
+            transfer = self._download_universe_files(db, slug)
+            errors.extend(transfer.errors)
             
             return SyncResponse(
                 success=True,
                 message=f"Successfully pulled '{slug}' from Supabase",
-                synced_items=synced_items + files_downloaded,
-                errors=errors
+                synced_items=synced_items + transfer.files,
+                errors=errors,
+                transfer=transfer,
+                rows=rows
             )
             
         except Exception as e:
@@ -142,10 +166,18 @@ class SyncService:
                 errors=[str(e)]
             )
     
-    def pull_all(self, db: Session) -> SyncInitResponse:
+    def pull_all(self, max_workers: Optional[int] = None, job_id: Optional[str] = None) -> SyncInitResponse:
         """
         Pull ALL universes from Supabase (init sync).
         
+        Universes are pulled concurrently by a bounded worker pool, each with
+        its own session, so one failing universe does not affect the others.
+        Network work runs in parallel; SQLite writes go through a single writer.
+        
+        Args:
+            max_workers: Universes pulled in parallel (default: SYNC_PULL_CONCURRENCY)
+            job_id: Optional job ID for progress updates
+        
         Returns:
             SyncInitResponse with counts
         """
@@ -158,35 +190,57 @@ class SyncService:
         try:
             # Get all universes from Supabase
             remote_universes = self.supabase.get_all_univers()
-            
-            universes_synced = 0
-            assets_synced = 0
-            files_downloaded = 0
-            errors = []
-            
-            for remote_univers in remote_universes:
-                slug = remote_univers["slug"]
-                result = self.pull_universe(db, slug, force=True)
-                
-                if result.success:
-                    universes_synced += 1
-                    assets_synced += result.synced_items
-                else:
-                    errors.extend(result.errors)
-            
-            return SyncInitResponse(
-                success=True,
-                message=f"Initialized local database from Supabase",
-                universes_synced=universes_synced,
-                assets_synced=assets_synced,
-                files_downloaded=files_downloaded
-            )
-            
         except Exception as e:
             return SyncInitResponse(
                 success=False,
                 message=f"Init sync failed: {str(e)}"
             )
+        
+        slugs = [remote_univers["slug"] for remote_univers in remote_universes]
+        if job_id:
+            job_service.set_total_steps(job_id, len(slugs))
+        
+        universes_synced = 0
+        assets_synced = 0
+        files_downloaded = 0
+        errors = []
+        
+        def pull_one(slug: str) -> SyncResponse:
+            session = SessionLocal()
+            try:
+                return self.pull_universe(session, slug, force=True)
+            finally:
+                session.close()
+        
+        workers = max(1, min(max_workers or settings.SYNC_PULL_CONCURRENCY, len(slugs) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-pull") as pool:
+            futures = {pool.submit(pull_one, slug): slug for slug in slugs}
+            for future in as_completed(futures):
+                slug = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = SyncResponse(success=False, message=f"Failed to pull '{slug}'", errors=[str(e)])
+                
+                if result.success:
+                    universes_synced += 1
+                    if result.rows:
+                        assets_synced += result.rows.inserted + result.rows.updated
+                    if result.transfer:
+                        files_downloaded += result.transfer.files
+                errors.extend(f"{slug}: {error}" for error in result.errors)
+                
+                if job_id:
+                    job_service.step(job_id, f"Pulled {slug} ({universes_synced}/{len(slugs)})")
+        
+        return SyncInitResponse(
+            success=True,
+            message=f"Initialized local database from Supabase",
+            universes_synced=universes_synced,
+            assets_synced=assets_synced,
+            files_downloaded=files_downloaded,
+            errors=errors
+        )
     
     # =========================================================================
     # PUSH: Local -> Supabase
@@ -206,6 +260,7 @@ class SyncService:
         """
         errors = []
         synced_items = 0
+        sync_started = datetime.utcnow()
         
         try:
             if not self.supabase.is_connected:
@@ -215,8 +270,14 @@ class SyncService:
                     errors=["SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not configured"]
                 )
             
-            # Get local universe
-            local_univers = db.query(Univers).filter(Univers.slug == slug).first()
+            # Get local universe (asset relations loaded up front for bulk push)
+            local_univers = db.query(Univers)\
+                .options(
+                    selectinload(Univers.assets).selectinload(UniversAsset.prompts),
+                    selectinload(Univers.assets).selectinload(UniversAsset.translations)
+                )\
+                .filter(Univers.slug == slug)\
+                .first()
             if not local_univers:
                 return SyncResponse(
                     success=False,
@@ -225,8 +286,9 @@ class SyncService:
                 )
             
             # Upload media files first
-            files_uploaded = self._upload_universe_files(slug)
-            synced_items += files_uploaded
+            transfer = self._upload_universe_files(db, slug)
+            synced_items += transfer.files
+            errors.extend(transfer.errors)
             
             # Push universe to Supabase
             univers_data = {
@@ -243,8 +305,8 @@ class SyncService:
             synced_items += 1
             
             # Update local with Supabase ID
+            watermark = local_univers.last_synced_at
             local_univers.supabase_id = remote_id
-            local_univers.last_synced_at = datetime.utcnow()
             
             # Push prompts
             if local_univers.prompts:
@@ -256,35 +318,49 @@ class SyncService:
             
             # Push translations
             self.supabase.delete_univers_translations(remote_id)
-            for trans in local_univers.translations:
-                self.supabase.upsert_univers_translation(remote_id, trans.language, trans.name)
-                synced_items += 1
+            self.supabase.upsert_univers_translations([
+                {"univers_id": remote_id, "language": trans.language, "name": trans.name}
+                for trans in local_univers.translations
+            ])
+            synced_items += len(local_univers.translations)
 
             # Push music prompts
             self.supabase.delete_univers_music_prompts(remote_id)
-            for prompt in local_univers.music_prompts:
-                self.supabase.upsert_univers_music_prompt(remote_id, prompt.language, {
+            self.supabase.upsert_univers_music_prompts([
+                {
+                    "univers_id": remote_id,
+                    "language": prompt.language,
                     "prompt": prompt.prompt,
                     "lyrics": prompt.lyrics
-                })
-                synced_items += 1
+                }
+                for prompt in local_univers.music_prompts
+            ])
+            synced_items += len(local_univers.music_prompts)
 
-            # Push assets
-            self.supabase.delete_all_assets(remote_id)
-            for asset in local_univers.assets:
-                try:
-                    self._push_asset(remote_id, asset)
-                    synced_items += 1
-                except Exception as e:
-                    errors.append(f"Asset {asset.id}: {str(e)}")
+            # Push assets (only rows changed since the last sync)
+            rows = SyncRowStats()
+            try:
+                rows = self._push_assets_incremental(
+                    remote_id, local_univers.assets,
+                    watermark=None if force else watermark,
+                    merge=self._merge_mode(force),
+                    full=force
+                )
+                synced_items += rows.inserted + rows.updated + rows.deleted
+                local_univers.last_synced_at = sync_started
+            except Exception as e:
+                errors.append(f"Assets: {str(e)}")
             
             db.commit()
+            response_cache.invalidate_universe(slug)  # last_synced_at is listed
             
             return SyncResponse(
                 success=True,
                 message=f"Successfully pushed '{slug}' to Supabase",
                 synced_items=synced_items,
-                errors=errors
+                errors=errors,
+                transfer=transfer,
+                rows=rows
             )
             
         except Exception as e:
@@ -343,136 +419,424 @@ class SyncService:
             )
             db.add(prompt)
 
-    def _sync_asset(self, db: Session, univers_id: int, slug: str, remote_asset: dict):
-        """Sync a single asset from remote."""
-        asset = UniversAsset(
-            id=remote_asset["id"],
-            univers_id=univers_id,
-            sort_order=remote_asset["sort_order"],
-            image_name=remote_asset["image_name"],
-            display_name=remote_asset["display_name"]
-        )
-        db.add(asset)
+    # =========================================================================
+    # INCREMENTAL ASSET SYNC
+    # =========================================================================
+
+    @staticmethod
+    def _merge_mode(force: bool) -> bool:
+        """Whether conflicting rows are resolved by timestamp rather than direction."""
+        return settings.SYNC_MODE == "timestamp_merge" and not force
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[datetime]:
+        """Parse a PostgREST/SQLite timestamp into a naive UTC datetime."""
+        if not value:
+            return None
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def _isoformat(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    def _row_timestamp(self, asset: UniversAsset) -> Optional[datetime]:
+        """Last modification time of a local asset."""
+        return self._parse_timestamp(asset.updated_at or asset.created_at)
+
+    @staticmethod
+    def _changed_since(timestamp: Optional[datetime], watermark: Optional[datetime]) -> bool:
+        """True if a row changed after the watermark (unknown times count as changed)."""
+        if watermark is None or timestamp is None:
+            return True
+        return timestamp > watermark
+
+    @staticmethod
+    def _newer(a: Optional[datetime], b: Optional[datetime]) -> bool:
+        """True if `a` is strictly newer than `b` (unknown times never win)."""
+        return a is not None and (b is None or a > b)
+
+    def _pull_assets(
+        self,
+        db: Session,
+        univers_id: int,
+        remote_assets: List[Dict[str, Any]],
+        watermark: Optional[datetime],
+        merge: bool,
+        sync_started: datetime,
+        errors: List[str]
+    ) -> SyncRowStats:
+        """
+        Apply remote asset rows locally: insert new, update changed, delete removed.
+
+        Args:
+            db: Database session
+            univers_id: Local universe ID
+            remote_assets: Assets from get_full_univers (with prompts/translations)
+            watermark: Universe last_synced_at (None = treat every row as changed)
+            merge: Resolve conflicts by updated_at (timestamp_merge)
+            sync_started: Timestamp the new watermark will be set to
+            errors: Per-asset errors are appended here
+
+        Returns:
+            SyncRowStats with the row changes applied
+        """
+        stats = SyncRowStats()
+        local_assets = {
+            asset.id: asset
+            for asset in db.query(UniversAsset)
+                .options(selectinload(UniversAsset.prompts), selectinload(UniversAsset.translations))
+                .filter(UniversAsset.univers_id == univers_id)
+                .all()
+        }
+
+        for remote_asset in remote_assets:
+            remote_ts = self._parse_timestamp(remote_asset.get("updated_at") or remote_asset.get("created_at"))
+            asset = local_assets.get(remote_asset["id"])
+
+            if asset is not None:
+                local_ts = self._row_timestamp(asset)
+                remote_changed = self._changed_since(remote_ts, watermark)
+                local_changed = self._changed_since(local_ts, watermark)
+
+                if merge:
+                    if not remote_changed:
+                        stats.skipped += 1
+                        continue
+                    if local_changed and self._newer(local_ts, remote_ts):
+                        stats.conflicts += 1
+                        continue
+                elif not (remote_changed or local_changed):
+                    stats.skipped += 1
+                    continue
+
+            try:
+                if asset is None:
+                    asset = UniversAsset(id=remote_asset["id"], univers_id=univers_id)
+                    db.add(asset)
+                    stats.inserted += 1
+                else:
+                    stats.updated += 1
+                self._apply_remote_asset(asset, remote_asset, remote_ts or sync_started)
+            except Exception as e:
+                errors.append(f"Asset {remote_asset.get('id')}: {str(e)}")
+
+        # Local rows missing remotely were deleted there, unless created locally
+        # since the last sync (timestamp_merge keeps those)
+        remote_ids = {remote_asset["id"] for remote_asset in remote_assets}
+        for asset_id, asset in local_assets.items():
+            if asset_id in remote_ids:
+                continue
+            if merge and self._changed_since(self._row_timestamp(asset), watermark):
+                stats.skipped += 1
+                continue
+            db.delete(asset)
+            stats.deleted += 1
+
         db.flush()
-        
+        print(f"[SYNC][ROWS] pull: {stats.inserted} inserted, {stats.updated} updated, "
+              f"{stats.deleted} deleted, {stats.skipped} unchanged, {stats.conflicts} conflicts")
+        return stats
+
+    def _apply_remote_asset(self, asset: UniversAsset, remote_asset: Dict[str, Any], updated_at: datetime):
+        """Copy a remote asset row (with prompts and translations) onto a local asset."""
+        asset.sort_order = remote_asset["sort_order"]
+        asset.image_name = remote_asset["image_name"]
+        asset.display_name = remote_asset["display_name"]
+        # Keep the remote time so the row is not seen as a local change next sync
+        asset.updated_at = updated_at
+
         # Sync asset prompts
-        if remote_asset.get("prompts"):
-            prompts = UniversAssetPrompts(
-                asset_id=asset.id,
-                custom_image_prompt=remote_asset["prompts"].get("custom_image_prompt"),
-                custom_video_prompt=remote_asset["prompts"].get("custom_video_prompt"),
-                generation_count=remote_asset["prompts"].get("generation_count", 1)
-            )
-            db.add(prompts)
-        
-        # Sync asset translations
-        for trans in remote_asset.get("translations", []):
-            translation = UniversAssetTranslation(
-                asset_id=asset.id,
-                language=trans["language"],
-                display_name=trans["display_name"]
-            )
-            db.add(translation)
-    
-    def _push_asset(self, remote_univers_id: int, asset: UniversAsset):
-        """Push a single asset to Supabase."""
-        asset_data = {
-            "id": asset.id,
-            "univers_id": remote_univers_id,
-            "sort_order": asset.sort_order,
-            "image_name": asset.image_name,
-            "display_name": asset.display_name
+        remote_prompts = remote_asset.get("prompts")
+        if remote_prompts:
+            if asset.prompts is None:
+                asset.prompts = UniversAssetPrompts()
+            asset.prompts.custom_image_prompt = remote_prompts.get("custom_image_prompt")
+            asset.prompts.custom_video_prompt = remote_prompts.get("custom_video_prompt")
+            asset.prompts.generation_count = remote_prompts.get("generation_count", 1)
+        elif asset.prompts is not None:
+            asset.prompts = None
+
+        # Sync asset translations (replace)
+        asset.translations = [
+            UniversAssetTranslation(language=trans["language"], display_name=trans["display_name"])
+            for trans in remote_asset.get("translations", [])
+        ]
+
+    def _push_assets_incremental(
+        self,
+        remote_univers_id: int,
+        assets: List[UniversAsset],
+        watermark: Optional[datetime],
+        merge: bool,
+        full: bool = False
+    ) -> SyncRowStats:
+        """
+        Push local asset changes: upsert new/changed rows, delete removed ones.
+
+        Args:
+            remote_univers_id: Universe ID in Supabase
+            assets: Local assets (prompts/translations loaded)
+            watermark: Universe last_synced_at (None = treat every row as changed)
+            merge: Resolve conflicts by updated_at (timestamp_merge)
+            full: Replace every remote asset (force push)
+
+        Returns:
+            SyncRowStats with the row changes applied
+        """
+        stats = SyncRowStats()
+
+        if full:
+            self.supabase.delete_all_assets(remote_univers_id)
+            stats.inserted = self._push_assets(remote_univers_id, assets)
+            return stats
+
+        remote_versions = {
+            asset_id: self._parse_timestamp(value)
+            for asset_id, value in self.supabase.get_asset_versions(remote_univers_id).items()
         }
+
+        to_push = []
+        for asset in assets:
+            if asset.id not in remote_versions:
+                to_push.append(asset)
+                stats.inserted += 1
+                continue
+
+            local_ts = self._row_timestamp(asset)
+            remote_ts = remote_versions[asset.id]
+            local_changed = self._changed_since(local_ts, watermark)
+            remote_changed = self._changed_since(remote_ts, watermark)
+
+            if merge:
+                if not local_changed:
+                    stats.skipped += 1
+                    continue
+                if remote_changed and self._newer(remote_ts, local_ts):
+                    stats.conflicts += 1
+                    continue
+            elif not (local_changed or remote_changed):
+                stats.skipped += 1
+                continue
+
+            to_push.append(asset)
+            stats.updated += 1
+
+        # Remote rows missing locally were deleted here, unless created remotely
+        # since the last sync (timestamp_merge keeps those)
+        local_ids = {asset.id for asset in assets}
+        to_delete = []
+        for asset_id, remote_ts in remote_versions.items():
+            if asset_id in local_ids:
+                continue
+            if merge and self._changed_since(remote_ts, watermark):
+                stats.skipped += 1
+                continue
+            to_delete.append(asset_id)
+
+        if to_delete:
+            self.supabase.delete_assets(to_delete)
+            stats.deleted = len(to_delete)
+
+        self._push_assets(remote_univers_id, to_push)
+
+        print(f"[SYNC][ROWS] push: {stats.inserted} inserted, {stats.updated} updated, "
+              f"{stats.deleted} deleted, {stats.skipped} unchanged, {stats.conflicts} conflicts")
+        return stats
+
+    def _push_assets(self, remote_univers_id: int, assets: List[UniversAsset]) -> int:
+        """
+        Push assets with their prompts and translations to Supabase.
         
-        remote_asset = self.supabase.upsert_asset(asset_data)
+        Uses one bulk request per table (chunked for large universes)
+        instead of several requests per asset.
+        
+        Returns:
+            Number of assets pushed
+        """
+        if not assets:
+            return 0
+        
+        self.supabase.upsert_assets([
+            {
+                "id": asset.id,
+                "univers_id": remote_univers_id,
+                "sort_order": asset.sort_order,
+                "image_name": asset.image_name,
+                "display_name": asset.display_name,
+                "updated_at": self._isoformat(self._row_timestamp(asset))
+            }
+            for asset in assets
+        ])
         
         # Push prompts
-        if asset.prompts:
-            self.supabase.upsert_asset_prompts(asset.id, {
+        self.supabase.upsert_assets_prompts([
+            {
+                "asset_id": asset.id,
                 "custom_image_prompt": asset.prompts.custom_image_prompt,
                 "custom_video_prompt": asset.prompts.custom_video_prompt,
                 "generation_count": asset.prompts.generation_count
-            })
+            }
+            for asset in assets if asset.prompts
+        ])
+        
+        # Push translations (replace: languages removed locally disappear remotely)
+        self.supabase.delete_assets_translations([asset.id for asset in assets])
+        self.supabase.upsert_assets_translations([
+            {
+                "asset_id": asset.id,
+                "language": trans.language,
+                "display_name": trans.display_name
+            }
+            for asset in assets for trans in asset.translations
+        ])
         
-        # Push translations
-        self.supabase.delete_asset_translations(asset.id)
-        for trans in asset.translations:
-            self.supabase.upsert_asset_translation(asset.id, trans.language, trans.display_name)
+        return len(assets)
     
-    def _download_universe_files(self, slug: str) -> int:
-        """Download all media files for a universe from Supabase Storage."""
+    def _remote_folders(self, slug: str) -> List[str]:
+        """Remote folders holding a universe's media."""
+        return [f"{slug}", f"{slug}/assets", f"{slug}/music"]
+
+    @staticmethod
+    def _remote_etag(file_info: Dict[str, Any]) -> Optional[str]:
+        """eTag of a storage3 file listing entry."""
+        return (file_info.get("metadata") or {}).get("eTag")
+
+    def _download_universe_files(self, db: Session, slug: str) -> TransferStats:
+        """
+        Download new or changed media files for a universe from Supabase Storage.
+
+        A remote file is skipped when its eTag matches the one recorded at the
+        last sync and the local copy is unchanged since then. Local files that
+        were synced before but are gone remotely are deleted.
+        """
         if not self.supabase.is_connected:
             print(f"[SYNC][MEDIA] Supabase not connected, skipping media download for {slug}")
-            return 0
-
-        files_downloaded = 0
+            return TransferStats()
 
         try:
-            folders_to_check = [
-                f"{slug}",
-                f"{slug}/assets",
-                f"{slug}/music"
-            ]
+            bucket = self.supabase.get_bucket()
+            with self._write_lock:
+                self.manifest.scan(db, slug)
+                db.commit()
+            entries = self.manifest.get_entries(db, slug)  # One query reloads the committed rows
+            remote_files = {
+                f["path"]: f
+                for f in self.transfer.list_remote_files(bucket, self._remote_folders(slug), strict=True)
+            }
 
-            print(f"[SYNC][MEDIA] Downloading media for universe '{slug}'...")
-            for folder in folders_to_check:
-                try:
-                    print(f"[SYNC][MEDIA] Listing folder: {folder}")
-                    files = self.supabase.list_storage_folder(folder)
-                    print(f"[SYNC][MEDIA] Found {len(files)} files in {folder}")
-                    for file_info in files:
-                        if file_info.get("name") and not file_info["name"].endswith("/"):
-                            remote_path = f"{folder}/{file_info['name']}"
-                            print(f"[SYNC][MEDIA] Downloading file: {remote_path}")
-                            content = self.supabase.download_from_storage(remote_path)
-                            if content:
-                                self.storage.upload_file(content, remote_path)
-                                print(f"[SYNC][MEDIA] Downloaded and saved: {remote_path}")
-                                files_downloaded += 1
-                            else:
-                                print(f"[SYNC][MEDIA][WARN] No content for: {remote_path}")
-                except Exception as e:
-                    print(f"[SYNC][MEDIA][ERROR] Error listing {folder}: {e}")
+            to_download = []
+            for path, file_info in remote_files.items():
+                entry = entries.get(path)
+                if (
+                    entry is None
+                    or entry.sha256 is None
+                    or entry.sha256 != entry.synced_sha256
+                    or entry.remote_etag != self._remote_etag(file_info)
+                ):
+                    to_download.append(path)
+
+            print(f"[SYNC][MEDIA] Downloading {len(to_download)}/{len(remote_files)} files for '{slug}'...")
+            downloaded = []
+            stats = self.transfer.download_files(bucket, to_download, on_complete=downloaded.append)
+            stats.skipped = len(remote_files) - len(to_download)
+
+            with self._write_lock:
+                for path in downloaded:
+                    self.manifest.mark_synced(db, slug, path, self._remote_etag(remote_files[path]), entries.get(path))
+
+                # Removed remotely since the last sync
+                for path, entry in entries.items():
+                    if path in remote_files or entry.remote_etag is None:
+                        continue
+                    if entry.sha256 is not None:
+                        self.storage.delete_file(path)
+                        stats.deleted += 1
+                    self.manifest.forget(db, entry)
+                db.commit()
 
-            print(f"[SYNC][MEDIA] Total files downloaded for '{slug}': {files_downloaded}")
-            return files_downloaded
+            print(f"[SYNC][MEDIA] '{slug}': {stats.files} downloaded, {stats.skipped} unchanged, "
+                  f"{stats.deleted} deleted ({stats.bytes_per_second:.0f} B/s, {stats.failed} failed)")
+            return stats
 
         except Exception as e:
             print(f"[SYNC][MEDIA][ERROR] Error downloading files for {slug}: {e}")
-            return files_downloaded
-    
-    def _upload_universe_files(self, slug: str) -> int:
-        """Upload all media files for a universe to Supabase Storage."""
+            return TransferStats(errors=[str(e)])
+
+    def _upload_universe_files(self, db: Session, slug: str) -> TransferStats:
+        """
+        Upload new or changed media files for a universe to Supabase Storage.
+
+        A local file is uploaded when its hash differs from the last synced
+        hash, or when the remote object is missing or was changed by someone
+        else. Files deleted locally since the last sync are deleted remotely.
+        """
         if not self.supabase.is_connected:
-            return 0
-        
-        files_uploaded = 0
-        universe_path = self.storage.get_universe_path(slug)
-        
-        if not universe_path.exists():
-            return 0
-        
+            return TransferStats()
+
         try:
-            # Upload all files recursively
-            for file_path in universe_path.rglob("*"):
-                if file_path.is_file():
-                    relative_path = file_path.relative_to(self.storage.bucket_path)
-                    remote_path = str(relative_path)
-                    
-                    # Determine content type
-                    content_type = self.storage.get_mime_type(remote_path) or "application/octet-stream"
-                    
-                    # Read and upload
-                    content = file_path.read_bytes()
-                    self.supabase.upload_to_storage(content, remote_path, content_type)
-                    files_uploaded += 1
-            
-            return files_uploaded
-            
-        except Exception as e:
-            print(f"Error uploading files for {slug}: {e}")
-            return files_uploaded
+            bucket = self.supabase.get_bucket()
+            with self._write_lock:
+                self.manifest.scan(db, slug)
+                db.commit()
+            entries = self.manifest.get_entries(db, slug)  # One query reloads the committed rows
+            folders = self._remote_folders(slug)
+            remote_files = {f["path"]: f for f in self.transfer.list_remote_files(bucket, folders, strict=True)}
 
+            to_upload = []
+            for path, entry in entries.items():
+                if entry.sha256 is None:
+                    continue
+                remote = remote_files.get(path)
+                if (
+                    remote is None
+                    or entry.sha256 != entry.synced_sha256
+                    or entry.remote_etag != self._remote_etag(remote)
+                ):
+                    to_upload.append(path)
+
+            uploaded = []
+            stats = self.transfer.upload_files(
+                bucket,
+                [self.storage.bucket_path / path for path in to_upload],
+                on_complete=uploaded.append
+            )
+            stats.skipped = len([e for e in entries.values() if e.sha256 is not None]) - len(to_upload)
+
+            # New eTags are only known after a fresh listing
+            if uploaded:
+                remote_files = {f["path"]: f for f in self.transfer.list_remote_files(bucket, folders)}
+
+            # Deleted locally since the last sync
+            removed = [entry for entry in entries.values() if entry.sha256 is None]
+            to_remove = [
+                entry.path for entry in removed
+                if entry.synced_sha256 is not None and entry.path in remote_files
+            ]
+            if to_remove:
+                stats.deleted = self.transfer.remove_files(bucket, to_remove)
+
+            with self._write_lock:
+                for path in uploaded:
+                    etag = self._remote_etag(remote_files[path]) if path in remote_files else None
+                    self.manifest.mark_synced(db, slug, path, etag, entries[path])
+                for entry in removed:
+                    self.manifest.forget(db, entry)
+                db.commit()
+
+            print(f"[SYNC][MEDIA] '{slug}': {stats.files} uploaded, {stats.skipped} unchanged, "
+                  f"{stats.deleted} deleted ({stats.bytes_per_second:.0f} B/s, {stats.failed} failed)")
+            return stats
+
+        except Exception as e:
+            print(f"[SYNC][MEDIA][ERROR] Error uploading files for {slug}: {e}")
+            return TransferStats(errors=[str(e)])
 
 # Singleton instance
 sync_service = SyncService()
@@ -0,0 +1,216 @@
+"""Transfer service - Parallel media transfers between local storage and a remote bucket."""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from schemas import TransferStats
+from services.storage_service import storage_service
+
+
+class TransferEngine:
+    """
+    Moves media files between the local bucket and a remote storage bucket.
+
+    The remote side is any object exposing the storage3 bucket API
+    (`list`, `download`, `upload`), so tests can drive the engine against a
+    local fake bucket instead of Supabase Storage.
+
+    - Bounded worker pool (SYNC_TRANSFER_CONCURRENCY)
+    - Per-file retry with exponential backoff (SYNC_TRANSFER_RETRIES)
+    - Aggregate throughput stats (bytes/s, files/s)
+    """
+
+    REMOVE_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None
+    ):
+        self.storage = storage_service
+        self.max_workers = max_workers or settings.SYNC_TRANSFER_CONCURRENCY
+        self.max_retries = max_retries if max_retries is not None else settings.SYNC_TRANSFER_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else settings.SYNC_TRANSFER_BACKOFF
+
+    # =========================================================================
+    # RETRY
+    # =========================================================================
+
+    def _with_retry(
+        self,
+        action: Callable[[], Any],
+        label: str,
+        counters: Optional[Dict[str, int]] = None,
+        lock: Optional[threading.Lock] = None
+    ) -> Any:
+        """
+        Run a transfer action, retrying with exponential backoff + jitter.
+
+        Returns:
+            The action's result (bytes transferred for uploads/downloads)
+        """
+        attempt = 0
+        while True:
+            try:
+                return action()
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_base * (2 ** attempt) * (1 + random.random() * 0.25)
+                print(f"[SYNC][MEDIA][RETRY] {label} failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                if counters is not None:
+                    with lock:
+                        counters["retries"] += 1
+                time.sleep(delay)
+                attempt += 1
+
+    def _run(
+        self,
+        jobs: List[Tuple[str, Callable[[], int]]],
+        on_complete: Optional[Callable[[str], None]] = None
+    ) -> TransferStats:
+        """
+        Execute (label, action) jobs on the worker pool and aggregate stats.
+
+        `on_complete(label)` is called from the calling thread for each
+        successful job, so it may safely use the caller's DB session.
+        """
+        counters = {"files": 0, "bytes": 0, "failed": 0, "retries": 0}
+        errors: List[str] = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+
+        if jobs:
+            workers = max(1, min(self.max_workers, len(jobs)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transfer") as pool:
+                futures = {
+                    pool.submit(self._with_retry, action, label, counters, lock): label
+                    for label, action in jobs
+                }
+                for future in as_completed(futures):
+                    label = futures[future]
+                    try:
+                        size = future.result()
+                        with lock:
+                            counters["files"] += 1
+                            counters["bytes"] += size
+                        if on_complete:
+                            on_complete(label)
+                    except Exception as e:
+                        print(f"[SYNC][MEDIA][ERROR] {label}: {e}")
+                        with lock:
+                            counters["failed"] += 1
+                        errors.append(f"{label}: {e}")
+
+        elapsed = time.perf_counter() - start
+        return TransferStats(
+            files=counters["files"],
+            bytes=counters["bytes"],
+            failed=counters["failed"],
+            retries=counters["retries"],
+            seconds=round(elapsed, 3),
+            files_per_second=round(counters["files"] / elapsed, 2) if elapsed > 0 else 0.0,
+            bytes_per_second=round(counters["bytes"] / elapsed, 2) if elapsed > 0 else 0.0,
+            errors=errors
+        )
+
+    # =========================================================================
+    # LISTING
+    # =========================================================================
+
+    def list_remote_files(self, bucket: Any, folders: List[str], strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        List files (not sub-folders) under several remote folders.
+
+        Args:
+            bucket: Remote storage bucket
+            folders: Folder prefixes to list
+            strict: Raise on listing errors instead of skipping the folder
+                (required when the listing is used to detect deletions)
+
+        Returns:
+            List of storage3 file info dicts with an added "path" key
+        """
+        files = []
+        for folder in folders:
+            try:
+                entries = self._with_retry(lambda: bucket.list(folder), folder)
+            except Exception as e:
+                print(f"[SYNC][MEDIA][ERROR] Error listing {folder}: {e}")
+                if strict:
+                    raise
+                continue
+            for entry in entries:
+                name = entry.get("name")
+                # Folder placeholders have no id/metadata
+                if not name or name.endswith("/") or entry.get("id") is None:
+                    continue
+                files.append({**entry, "path": f"{folder}/{name}"})
+        return files
+
+    # =========================================================================
+    # DOWNLOAD / UPLOAD
+    # =========================================================================
+
+    def download_files(
+        self,
+        bucket: Any,
+        remote_paths: List[str],
+        on_complete: Optional[Callable[[str], None]] = None
+    ) -> TransferStats:
+        """Download remote files into the local bucket (same relative paths)."""
+        def download(remote_path: str) -> Callable[[], int]:
+            def action() -> int:
+                content = bucket.download(remote_path)
+                if not content:
+                    raise ValueError("empty response")
+                self.storage.upload_file(content, remote_path)
+                return len(content)
+            return action
+
+        return self._run([(remote_path, download(remote_path)) for remote_path in remote_paths], on_complete)
+
+    def upload_files(
+        self,
+        bucket: Any,
+        local_files: List[Path],
+        on_complete: Optional[Callable[[str], None]] = None
+    ) -> TransferStats:
+        """Upload local files to the remote bucket, overwriting existing objects."""
+        def upload(file_path: Path, remote_path: str) -> Callable[[], int]:
+            def action() -> int:
+                content_type = self.storage.get_mime_type(remote_path) or "application/octet-stream"
+                with open(file_path, "rb") as f:
+                    bucket.upload(remote_path, f, {"content-type": content_type, "x-upsert": "true"})
+                return file_path.stat().st_size
+            return action
+
+        jobs = []
+        for file_path in local_files:
+            remote_path = file_path.relative_to(self.storage.bucket_path).as_posix()
+            jobs.append((remote_path, upload(file_path, remote_path)))
+
+        return self._run(jobs, on_complete)
+
+    def remove_files(self, bucket: Any, remote_paths: List[str]) -> int:
+        """
+        Delete remote objects in batches (one request per REMOVE_BATCH_SIZE paths).
+
+        Returns:
+            Number of paths removed
+        """
+        removed = 0
+        for i in range(0, len(remote_paths), self.REMOVE_BATCH_SIZE):
+            batch = remote_paths[i:i + self.REMOVE_BATCH_SIZE]
+            self._with_retry(lambda: bucket.remove(batch), "remove")
+            removed += len(batch)
+        return removed
+
+
+# Singleton instance
+transfer_engine = TransferEngine()
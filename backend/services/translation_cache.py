@@ -0,0 +1,252 @@
+"""Translation cache - Persistent translation memory in SQLite with an LRU front."""
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from database import SessionLocal, TranslationMemory
+
+
+CacheKey = Tuple[str, str, str]
+
+
+class TranslationCache:
+    """
+    Two-level translation memory.
+
+    - In-memory LRU (bounded by TRANSLATION_CACHE_MEMORY_SIZE)
+    - SQLite table `translation_memory` (bounded by TRANSLATION_CACHE_MAX_ENTRIES)
+
+    Entries older than TRANSLATION_CACHE_TTL_DAYS are treated as misses so
+    they get re-translated. Keys are (source_lang, target_lang, normalized text).
+    """
+
+    # Prune the SQLite table every N writes rather than on every write
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        memory_size: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl_days: Optional[int] = None
+    ):
+        self.memory_size = memory_size if memory_size is not None else settings.TRANSLATION_CACHE_MEMORY_SIZE
+        self.max_entries = max_entries if max_entries is not None else settings.TRANSLATION_CACHE_MAX_ENTRIES
+        self.ttl = timedelta(days=ttl_days if ttl_days is not None else settings.TRANSLATION_CACHE_TTL_DAYS)
+
+        self._memory: "OrderedDict[CacheKey, Tuple[str, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+    # =========================================================================
+    # KEYS
+    # =========================================================================
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize text for keying (unicode NFC, collapsed spaces, trimmed lines).
+
+        Line breaks are kept: lyrics that differ only in their line layout
+        are different texts and get their own translation.
+        """
+        text = unicodedata.normalize("NFC", text)
+        lines = [re.sub(r"[^\S\n]+", " ", line).strip() for line in text.split("\n")]
+        return "\n".join(lines).strip()
+
+    def _key(self, text: str, source_lang: str, target_lang: str) -> CacheKey:
+        return (source_lang.lower(), target_lang.lower(), self.normalize(text))
+
+    def _is_expired(self, created_at: Optional[datetime]) -> bool:
+        if created_at is None:
+            return False
+        if created_at.tzinfo is not None:
+            created_at = created_at.replace(tzinfo=None)
+        return datetime.utcnow() - created_at > self.ttl
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """
+        Look up a cached translation.
+
+        Returns:
+            Translated text, or None on miss (or expired entry)
+        """
+        key = self._key(text, source_lang, target_lang)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and not self._is_expired(cached[1]):
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return cached[0]
+            if cached:
+                del self._memory[key]
+
+        db = SessionLocal()
+        try:
+            row = db.query(TranslationMemory).filter(
+                TranslationMemory.source_lang == key[0],
+                TranslationMemory.target_lang == key[1],
+                TranslationMemory.source_text == key[2]
+            ).first()
+
+            if not row or self._is_expired(row.created_at):
+                with self._lock:
+                    self._stats["misses"] += 1
+                return None
+
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_used_at = datetime.utcnow()
+            db.commit()
+
+            translated, created_at = row.translated_text, row.created_at
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, translated, created_at)
+
+        return translated
+
+    def put(self, text: str, source_lang: str, target_lang: str, translated: str):
+        """Store a translation in memory and in SQLite."""
+        key = self._key(text, source_lang, target_lang)
+        now = datetime.utcnow()
+
+        db = SessionLocal()
+        try:
+            row = db.query(TranslationMemory).filter(
+                TranslationMemory.source_lang == key[0],
+                TranslationMemory.target_lang == key[1],
+                TranslationMemory.source_text == key[2]
+            ).first()
+
+            if row:
+                row.translated_text = translated
+                row.created_at = now
+                row.last_used_at = now
+            else:
+                db.add(TranslationMemory(
+                    source_lang=key[0],
+                    target_lang=key[1],
+                    source_text=key[2],
+                    translated_text=translated,
+                    created_at=now,
+                    last_used_at=now
+                ))
+            db.commit()
+        except IntegrityError:
+            # Another thread stored the same key first
+            db.rollback()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["writes"] += 1
+            self._remember(key, translated, now)
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= self.PRUNE_EVERY
+            if should_prune:
+                self._writes_since_prune = 0
+
+        if should_prune:
+            self.prune()
+
+    def _remember(self, key: CacheKey, translated: str, created_at: Optional[datetime]):
+        """Insert into the in-memory LRU (caller holds lock)."""
+        self._memory[key] = (translated, created_at or datetime.utcnow())
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # =========================================================================
+    # EVICTION
+    # =========================================================================
+
+    def prune(self) -> int:
+        """
+        Evict expired rows, then least recently used rows above max_entries.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = datetime.utcnow() - self.ttl
+
+        db = SessionLocal()
+        try:
+            deleted = db.query(TranslationMemory)\
+                .filter(TranslationMemory.created_at < cutoff)\
+                .delete(synchronize_session=False)
+
+            overflow = db.query(TranslationMemory).count() - self.max_entries
+            if overflow > 0:
+                oldest = db.query(TranslationMemory.id)\
+                    .order_by(TranslationMemory.last_used_at.asc())\
+                    .limit(overflow)
+                deleted += db.query(TranslationMemory)\
+                    .filter(TranslationMemory.id.in_(oldest.scalar_subquery()))\
+                    .delete(synchronize_session=False)
+
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["evictions"] += deleted
+
+        return deleted
+
+    def clear(self):
+        """Drop every cached translation (memory and SQLite)."""
+        db = SessionLocal()
+        try:
+            db.query(TranslationMemory).delete()
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._memory.clear()
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and sizes."""
+        db = SessionLocal()
+        try:
+            stored = db.query(TranslationMemory).count()
+        finally:
+            db.close()
+
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "stored_entries": stored
+            }
+
+
+# Singleton instance
+translation_cache = TranslationCache()
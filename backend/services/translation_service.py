@@ -0,0 +1,264 @@
+"""Translation service - Batched multi-language translation with pluggable backends."""
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from deep_translator import GoogleTranslator
+
+from config import settings
+from services.translation_cache import translation_cache, TranslationCache
+
+
+# Supported languages
+LANGUAGES = ["fr", "en", "es", "it", "de"]
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class TranslatorBackend(ABC):
+    """
+    Interface for translation providers.
+
+    Subclasses implement `translate`; `translate_batch` defaults to one call
+    per item and should be overridden when the provider can do better.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate a single text."""
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        """
+        Translate several texts for one language pair.
+
+        Returns:
+            One entry per input, None where that item failed
+        """
+        results = []
+        for text in texts:
+            try:
+                results.append(self.translate(text, source_lang, target_lang))
+            except Exception as e:
+                print(f"Translation error for '{text}' to {target_lang}: {e}")
+                results.append(None)
+        return results
+
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    """
+    Google Translate via deep_translator.
+
+    Batches are sent as a single newline-joined payload (chunked under the
+    provider's size limit) and split back into items. If the split does not
+    line up with the input, the chunk falls back to one request per item.
+    """
+
+    name = "google"
+    SEPARATOR = "\n"
+    MAX_PAYLOAD_CHARS = 4500  # deep_translator rejects payloads over 5000 chars
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        translator = GoogleTranslator(source=source_lang, target=target_lang)
+        return translator.translate(text)
+
+    def _chunks(self, texts: List[str]) -> List[List[int]]:
+        """Group item indexes into payloads that fit under MAX_PAYLOAD_CHARS."""
+        chunks, current, size = [], [], 0
+        for i, text in enumerate(texts):
+            length = len(text) + len(self.SEPARATOR)
+            if current and size + length > self.MAX_PAYLOAD_CHARS:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(i)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(texts)
+
+        # Items containing the separator cannot be joined safely
+        joinable = [i for i, t in enumerate(texts) if self.SEPARATOR not in t]
+        singles = [i for i, t in enumerate(texts) if self.SEPARATOR in t]
+
+        translator = GoogleTranslator(source=source_lang, target=target_lang)
+        for chunk in self._chunks([texts[i] for i in joinable]):
+            indexes = [joinable[j] for j in chunk]
+            payload = self.SEPARATOR.join(texts[i] for i in indexes)
+            try:
+                parts = (translator.translate(payload) or "").split(self.SEPARATOR)
+            except Exception as e:
+                print(f"Batch translation error to {target_lang}: {e}")
+                parts = []
+
+            if len(parts) == len(indexes):
+                for i, part in zip(indexes, parts):
+                    results[i] = part.strip()
+            else:
+                singles.extend(indexes)
+
+        if singles:
+            fallback = super().translate_batch([texts[i] for i in singles], source_lang, target_lang)
+            for i, translated in zip(singles, fallback):
+                results[i] = translated
+
+        return results
+
+
+class LocalTranslatorBackend(TranslatorBackend):
+    """
+    Offline stand-in for tests and benchmarks.
+
+    Looks up `dictionary[(source, target, text)]`, otherwise returns
+    "[target] text". `latency` simulates one network round-trip per call
+    (per item for `translate`, per batch for `translate_batch`).
+    """
+
+    name = "local"
+
+    def __init__(self, dictionary: Optional[Dict] = None, latency: float = 0.0):
+        self.dictionary = dictionary or {}
+        self.latency = latency
+        self.calls = 0
+
+    def _lookup(self, text: str, source_lang: str, target_lang: str) -> str:
+        return self.dictionary.get((source_lang, target_lang, text), f"[{target_lang}] {text}")
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._lookup(text, source_lang, target_lang)
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._lookup(t, source_lang, target_lang) for t in texts]
+
+
+BACKENDS = {
+    "google": GoogleTranslatorBackend,
+    "local": LocalTranslatorBackend
+}
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class TranslationService:
+    """
+    Translates texts and concept lists through the translation memory and a
+    pluggable backend.
+
+    - Cache hits never reach the backend
+    - Misses for one language pair go out as a single batch
+    - Target languages are translated concurrently
+    - Any item that fails falls back to its original text
+    """
+
+    def __init__(
+        self,
+        backend: Optional[TranslatorBackend] = None,
+        cache: Optional[TranslationCache] = translation_cache
+    ):
+        self.backend = backend or BACKENDS[settings.TRANSLATION_BACKEND]()
+        self.cache = cache
+
+    def set_backend(self, backend: TranslatorBackend):
+        """Swap the translation provider (e.g. LocalTranslatorBackend in tests)."""
+        self.backend = backend
+
+    def translate_text(
+        self,
+        text: str,
+        source_lang: str = "fr",
+        target_lang: str = "en",
+        cached_only: bool = False
+    ) -> Optional[str]:
+        """
+        Translate one text (cache first). Raises on backend failure.
+
+        With `cached_only`, a cache miss returns None instead of calling
+        the backend.
+        """
+        if source_lang == target_lang:
+            return text
+
+        if self.cache:
+            cached = self.cache.get(text, source_lang, target_lang)
+            if cached is not None:
+                return cached
+
+        if cached_only:
+            return None
+
+        translated = self.backend.translate(text, source_lang, target_lang)
+
+        if translated and self.cache:
+            self.cache.put(text, source_lang, target_lang, translated)
+
+        return translated
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        Translate a list of texts for one language pair.
+
+        Returns:
+            Translated texts in input order (original text where translation failed)
+        """
+        if source_lang == target_lang:
+            return list(texts)
+
+        results: List[Optional[str]] = [None] * len(texts)
+        if self.cache:
+            for i, text in enumerate(texts):
+                results[i] = self.cache.get(text, source_lang, target_lang)
+
+        misses = [i for i, r in enumerate(results) if r is None]
+        if misses:
+            try:
+                translated = self.backend.translate_batch([texts[i] for i in misses], source_lang, target_lang)
+            except Exception as e:
+                print(f"Translation error to {target_lang}: {e}")
+                translated = [None] * len(misses)
+
+            for i, value in zip(misses, translated):
+                if value:
+                    results[i] = value
+                    if self.cache:
+                        self.cache.put(texts[i], source_lang, target_lang, value)
+                else:
+                    results[i] = texts[i]  # Fallback to original
+
+        return results
+
+    def translate_concepts(self, concepts: List[str], source_lang: str = "fr") -> Dict[str, List[str]]:
+        """
+        Translate a list of concepts to all supported languages concurrently.
+
+        Returns:
+            Dict mapping language code to translated concepts
+        """
+        targets = [lang for lang in LANGUAGES if lang != source_lang]
+
+        with ThreadPoolExecutor(max_workers=len(targets) or 1, thread_name_prefix="translate") as pool:
+            futures = {
+                lang: pool.submit(self.translate_batch, concepts, source_lang, lang)
+                for lang in targets
+            }
+            translations = {source_lang: concepts}
+            for lang in targets:
+                translations[lang] = futures[lang].result()
+
+        return translations
+
+
+# Singleton instance
+translation_service = TranslationService()
@@ -1,11 +1,33 @@
 """Configuration pytest pour les tests de l'API MagikSwipe."""
 
+import time
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
 from main import app
 
 
+def wait_until(predicate, timeout=5.0):
+    """Attend qu'une condition soit vraie (jobs exécutés sur d'autres threads)."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.01)
+
+
+def get_job(job_id: str):
+    """Job tel qu'écrit en base (hors tampon de progression)."""
+    from database import Job, SessionLocal
+
+    db = SessionLocal()
+    try:
+        return db.query(Job).filter(Job.id == job_id).one()
+    finally:
+        db.close()
+
+
 @pytest.fixture(scope="function")
 def client():
     """Client FastAPI de test."""
@@ -60,4 +82,34 @@ def universe_with_music_prompts(client, test_universe):
         assert response.status_code == 201
         created_prompts.append(response.json())
 
-    return {"universe": test_universe, "prompts": created_prompts}
\ No newline at end of file
+    return {"universe": test_universe, "prompts": created_prompts}
+
+@pytest.fixture(scope="function")
+def fake_replicate():
+    """Branche le service de génération sur un backend Replicate factice (pas de réseau)."""
+    from unittest.mock import patch
+    from services.generation_service import generation_service
+    from tests.fake_replicate import FakeReplicateBackend
+
+    backend = FakeReplicateBackend()
+    with patch.object(generation_service, "backend", backend), \
+            patch("config.settings.REPLICATE_API_TOKEN", "fake_token"):
+        yield backend
+
+
+@pytest.fixture(scope="function")
+def scheduler_options():
+    """Options du planificateur de test (à surcharger dans un module ou via parametrize)."""
+    return {"workers": 2, "type_limits": {}}
+
+
+@pytest.fixture(scope="function")
+def scheduler(client, scheduler_options):
+    """Pool de jobs dédié pour ne pas mêler les jobs d'un test à ceux des autres."""
+    from services.job_scheduler import JobScheduler
+    from services.job_service import job_service
+
+    scheduler = JobScheduler(**scheduler_options)
+    with patch.object(job_service, "scheduler", scheduler):
+        yield scheduler
+        scheduler.shutdown(timeout=5)
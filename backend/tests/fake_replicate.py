@@ -0,0 +1,68 @@
+"""Fake local du backend Replicate pour les tests.
+
+Même interface coroutine que `AsyncReplicateBackend` (`run`, `download_to`,
+`aclose`) : aucune requête réseau, une latence simulée par `asyncio.sleep`,
+et des compteurs pour asserter le nombre d'appels et la concurrence.
+"""
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeReplicateBackend:
+    """Prédictions instantanées (ou retardées) avec sorties configurables par modèle."""
+
+    def __init__(self, latency: float = 0.0, outputs: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            latency: Durée simulée de chaque prédiction (secondes)
+            outputs: Sortie par modèle ; par défaut une URL factice
+                (ou un tableau JSON de concepts pour le LLM)
+        """
+        self.latency = latency
+        self.outputs = outputs or {}
+        self.failures: Dict[str, Exception] = {}
+        self.calls: List[Tuple[str, Dict]] = []
+        self.downloads: List[str] = []
+        self.cancelled: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads = set()
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def _output_for(self, model: str) -> Any:
+        if model in self.outputs:
+            return self.outputs[model]
+        if "llama" in model:
+            return list(json.dumps(["vache", "cochon", "cheval"]))  # Flux de tokens
+        return f"https://replicate.delivery/fake/{len(self.calls)}/{model.replace('/', '_')}.bin"
+
+    async def run(self, model: str, input: Dict) -> Any:
+        with self._lock:
+            self.calls.append((model, input))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.threads.add(threading.current_thread().name)
+        try:
+            await asyncio.sleep(self.latency)
+            if model in self.failures:
+                raise self.failures[model]
+            return self._output_for(model)
+        except asyncio.CancelledError:
+            self.cancelled.append(model)  # Comme le vrai backend : prédiction annulée
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def download_to(self, url: str, local_path: Path) -> Path:
+        from services.storage_service import storage_service
+
+        self.downloads.append(url)
+        return await asyncio.to_thread(storage_service.write_file, local_path, f"fake content of {url}".encode())
+
+    async def aclose(self):
+        self.closed = True
@@ -0,0 +1,293 @@
+"""Fake en mémoire du client Supabase (PostgREST + Storage) pour les tests.
+
+Chaque appel à `execute()` (ou opération Storage) est compté comme une
+requête HTTP dans `client.requests`, ce qui permet d'asserter le nombre
+d'allers-retours réseau.
+"""
+import copy
+import hashlib
+import itertools
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+
+# Relations embarquables : (parent, enfant) -> colonne FK dans l'enfant
+RELATIONS = {
+    ("univers", "univers_prompts"): "univers_id",
+    ("univers", "univers_translations"): "univers_id",
+    ("univers", "univers_music_prompts"): "univers_id",
+    ("univers", "univers_assets"): "univers_id",
+    ("univers_assets", "univers_assets_prompts"): "asset_id",
+    ("univers_assets", "univers_assets_translations"): "asset_id",
+}
+
+# Relations un-à-un (renvoyées comme objet et non comme liste)
+ONE_TO_ONE = {"univers_prompts", "univers_assets_prompts"}
+
+# Clés primaires auto-incrémentées
+SERIAL_TABLES = {"univers"}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+def _split_select(columns: str) -> List[str]:
+    """Découpe "a, b(c, d(e))" au niveau supérieur."""
+    parts, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+class FakeQuery:
+    """Sous-ensemble du query builder postgrest utilisé par SupabaseService."""
+
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.columns = "*"
+        self.filters = []
+        self.payload = None
+        self.on_conflict = None
+        self.order_by = None
+        self.limit_count = None
+        self.single_row = False
+
+    # --- Construction -------------------------------------------------------
+
+    def select(self, columns="*", count=None):
+        self.op, self.columns = "select", columns
+        return self
+
+    def insert(self, data):
+        self.op, self.payload = "insert", data
+        return self
+
+    def upsert(self, data, on_conflict=None, ignore_duplicates=False):
+        self.op, self.payload, self.on_conflict = "upsert", data, on_conflict
+        return self
+
+    def update(self, data):
+        self.op, self.payload = "update", data
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count, **kwargs):
+        self.limit_count = count
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    # --- Exécution ----------------------------------------------------------
+
+    def _matches(self, row):
+        return all(f(row) for f in self.filters)
+
+    def _conflict_keys(self):
+        if self.on_conflict:
+            return [c.strip() for c in self.on_conflict.split(",")]
+        return ["id"]
+
+    def _embed(self, table: str, row: Dict[str, Any], columns: str) -> Dict[str, Any]:
+        result = dict(row)
+        for part in _split_select(columns):
+            match = re.match(r"^(\w+)\((.*)\)$", part)
+            if not match:
+                continue
+            child, child_columns = match.groups()
+            fk = RELATIONS[(table, child)]
+            children = [
+                self._embed(child, r, child_columns)
+                for r in self.client.tables.get(child, [])
+                if r.get(fk) == row.get("id")
+            ]
+            if child in ONE_TO_ONE:
+                result[child] = children[0] if children else None
+            else:
+                result[child] = children
+        return result
+
+    def execute(self):
+        with self.client.lock:
+            self.client.requests.append((self.table, self.op))
+            rows = self.client.tables.setdefault(self.table, [])
+
+            if self.op == "select":
+                data = [self._embed(self.table, r, self.columns) for r in rows if self._matches(r)]
+                if self.order_by:
+                    column, desc = self.order_by
+                    data.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+                if self.limit_count is not None:
+                    data = data[:self.limit_count]
+                if self.single_row:
+                    if len(data) != 1:
+                        raise Exception("JSON object requested, multiple (or no) rows returned")
+                    return FakeResponse(copy.deepcopy(data[0]))
+                return FakeResponse(copy.deepcopy(data))
+
+            if self.op in ("insert", "upsert"):
+                items = self.payload if isinstance(self.payload, list) else [self.payload]
+                keys = self._conflict_keys()
+                written = []
+                for item in items:
+                    item = dict(item)
+                    existing = None
+                    if self.op == "upsert" and all(k in item for k in keys):
+                        existing = next(
+                            (r for r in rows if all(r.get(k) == item[k] for k in keys)),
+                            None
+                        )
+                    if existing is not None:
+                        existing.update(item)
+                        written.append(existing)
+                    else:
+                        if "id" not in item:
+                            item["id"] = next(self.client.ids) if self.table in SERIAL_TABLES \
+                                else f"{self.table}-{next(self.client.ids)}"
+                        rows.append(item)
+                        written.append(item)
+                return FakeResponse(copy.deepcopy(written))
+
+            if self.op == "update":
+                updated = [r for r in rows if self._matches(r)]
+                for r in updated:
+                    r.update(self.payload)
+                return FakeResponse(copy.deepcopy(updated))
+
+            if self.op == "delete":
+                deleted = [r for r in rows if self._matches(r)]
+                self.client.tables[self.table] = [r for r in rows if not self._matches(r)]
+                return FakeResponse(copy.deepcopy(deleted))
+
+        raise NotImplementedError(self.op)
+
+
+class FakeBucket:
+    """Bucket Storage en mémoire."""
+
+    def __init__(self, client: "FakeSupabaseClient"):
+        self.client = client
+
+    def _log(self, op):
+        with self.client.lock:
+            self.client.requests.append(("storage", op))
+
+    def list(self, path: Optional[str] = None, options=None) -> List[Dict[str, Any]]:
+        self._log("list")
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for name, content in self.client.files.items():
+            if not name.startswith(prefix):
+                continue
+            rest = name[len(prefix):]
+            if "/" in rest:
+                folder = rest.split("/", 1)[0]
+                entries[folder] = {"name": folder, "id": None, "metadata": None}
+            else:
+                entries[rest] = {
+                    "name": rest,
+                    "id": rest,
+                    "metadata": {"size": len(content), "eTag": f'"{hashlib.md5(content).hexdigest()}"'}
+                }
+        return list(entries.values())
+
+    def download(self, path: str, options=None) -> bytes:
+        self._log("download")
+        if path not in self.client.files:
+            raise Exception(f"Object not found: {path}")
+        return self.client.files[path]
+
+    def upload(self, path: str, file, file_options=None):
+        self._log("upload")
+        if hasattr(file, "read"):
+            content = file.read()
+        elif isinstance(file, bytes):
+            content = file
+        else:
+            with open(file, "rb") as f:
+                content = f.read()
+        upsert = (file_options or {}).get("x-upsert") == "true"
+        if path in self.client.files and not upsert:
+            raise Exception(f"The resource already exists: {path}")
+        with self.client.lock:
+            self.client.files[path] = content
+        return FakeResponse(None)
+
+    def update(self, path: str, file, file_options=None):
+        return self.upload(path, file, {**(file_options or {}), "x-upsert": "true"})
+
+    def remove(self, paths: List[str]):
+        self._log("remove")
+        with self.client.lock:
+            for path in paths:
+                self.client.files.pop(path, None)
+        return []
+
+    def get_public_url(self, path: str) -> str:
+        return f"https://fake.supabase.co/storage/v1/object/public/univers/{path}"
+
+
+class FakeStorage:
+    def __init__(self, client: "FakeSupabaseClient"):
+        self.bucket = FakeBucket(client)
+
+    def from_(self, bucket_name: str) -> FakeBucket:
+        return self.bucket
+
+
+class FakeSupabaseClient:
+    """Client Supabase factice : tables PostgREST + bucket Storage en mémoire."""
+
+    supabase_url = "https://fake.supabase.co"
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.files: Dict[str, bytes] = {}
+        self.requests: List[tuple] = []
+        self.ids = itertools.count(1)
+        self.lock = threading.RLock()
+        self.storage = FakeStorage(self)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def count(self, table: Optional[str] = None) -> int:
+        """Nombre de requêtes effectuées (optionnellement pour une table)."""
+        return len([r for r in self.requests if table is None or r[0] == table])
+
+    def reset_requests(self):
+        self.requests.clear()
@@ -0,0 +1,52 @@
+"""Tests du profil SQLite (WAL, pragmas, pool)."""
+
+import threading
+
+from sqlalchemy import text
+
+
+class TestSQLiteProfile:
+    """Pragmas effectifs et comportement concurrent."""
+
+    def test_effective_pragmas(self):
+        """Les pragmas configurés sont appliqués à chaque connexion du pool."""
+        from config import settings
+        from database import get_sqlite_pragmas
+
+        pragmas = get_sqlite_pragmas()
+
+        assert pragmas["journal_mode"].lower() == settings.SQLITE_JOURNAL_MODE.lower()
+        assert pragmas["synchronous"] == settings.SQLITE_SYNCHRONOUS
+        assert pragmas["busy_timeout"] == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert pragmas["cache_size"] == -settings.SQLITE_CACHE_SIZE_KB
+        assert pragmas["temp_store"] == settings.SQLITE_TEMP_STORE
+        assert pragmas["foreign_keys"] == 1
+        assert pragmas["pool_size"] == settings.DB_POOL_SIZE
+
+    def test_reader_not_blocked_by_open_write(self, tmp_path):
+        """En WAL, une lecture aboutit pendant qu'une transaction d'écriture est ouverte."""
+        from database.connection import SQLITE_PRAGMAS, create_sqlite_engine
+
+        engine = create_sqlite_engine(tmp_path / "wal.db", pragmas=SQLITE_PRAGMAS)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (v INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        writer = engine.connect()
+        writer.begin()
+        writer.execute(text("UPDATE t SET v = 2"))
+
+        result = {}
+
+        def read():
+            with engine.connect() as conn:
+                result["v"] = conn.execute(text("SELECT v FROM t")).scalar()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join(timeout=2)
+
+        assert result.get("v") == 1  # Snapshot before the uncommitted write
+        writer.rollback()
+        writer.close()
+        engine.dispose()
@@ -0,0 +1,175 @@
+"""Tests du téléchargement en streaming des médias générés (transport HTTP simulé)."""
+
+import asyncio
+import tracemalloc
+import uuid
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from services.download_service import DownloadService, IncompleteDownload
+from services.storage_service import StorageService
+
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """StorageService isolé dans un bucket temporaire."""
+    service = StorageService()
+    service.bucket_path = tmp_path
+    return service
+
+
+@pytest.fixture(autouse=True)
+def fast_settings():
+    with patch("config.settings.DOWNLOAD_CHUNK_SIZE", 64 * 1024), \
+            patch("config.settings.DOWNLOAD_RETRIES", 2), \
+            patch("services.download_service.asyncio.sleep", new=_no_sleep):
+        yield
+
+
+async def _no_sleep(_seconds):
+    return None
+
+
+def serve(payload: bytes, fail_after=None, honour_range=True, requests=None):
+    """Transport simulé servant `payload` par morceaux ; coupe la connexion après N octets."""
+    requests = requests if requests is not None else []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        start, status = 0, 200
+        range_header = request.headers.get("Range")
+        if range_header and honour_range:
+            start, status = int(range_header[6:-1]), 206
+        body = payload[start:]
+        cut = fail_after.pop(0) if fail_after else None
+
+        async def stream():
+            sent = 0
+            for i in range(0, len(body), 64 * 1024):
+                chunk = body[i:i + 64 * 1024]
+                if cut is not None and sent + len(chunk) > cut:
+                    yield chunk[:cut - sent]
+                    raise httpx.ReadError("connection reset")
+                sent += len(chunk)
+                yield chunk
+
+        return httpx.Response(status, headers={"Content-Length": str(len(body))}, content=stream())
+
+    return DownloadService(transport=httpx.MockTransport(handler)), requests
+
+
+def target(storage):
+    slug = f"dl-{uuid.uuid4().hex[:8]}"
+    storage.create_universe_folder(slug)
+    return storage.get_asset_video_path(slug, "00_chat.png")
+
+
+class TestStreamingDownload:
+    """Écriture par morceaux dans un fichier partiel, renommage atomique, reprise."""
+
+    def test_download_streams_and_renames(self, storage):
+        """Le fichier arrive entier, sans fichier partiel visible dans le dossier univers."""
+        payload = bytes(range(256)) * 4096  # 1 Mo
+        service, requests = serve(payload)
+        service.storage = storage
+        path = target(storage)
+
+        assert asyncio.run(service.download("https://replicate.delivery/a.mp4", path)) == path
+        assert path.read_bytes() == payload
+        assert storage.list_universe_files(path.parent.name) == ["00_chat.mp4"]
+        assert not any((storage.bucket_path / ".partial").rglob("*.part"))
+        assert requests[0].headers["Accept-Encoding"] == "identity"
+
+    def test_resume_with_range_after_drop(self, storage):
+        """Après une coupure, la reprise demande seulement les octets manquants."""
+        payload = bytes(range(256)) * 4096
+        service, requests = serve(payload, fail_after=[300 * 1024, 200 * 1024])
+        service.storage = storage
+        path = target(storage)
+
+        asyncio.run(service.download("https://replicate.delivery/b.mp4", path))
+
+        assert path.read_bytes() == payload
+        ranges = [r.headers.get("Range") for r in requests]
+        assert ranges[0] is None
+        # Seuls les morceaux complets reçus avant la coupure sont conservés
+        offsets = [int(r[6:-1]) for r in ranges[1:]]
+        assert len(offsets) == 2
+        assert 0 < offsets[0] <= 300 * 1024 < offsets[1] <= 500 * 1024
+
+    def test_range_ignored_restarts(self, storage):
+        """Un serveur qui ignore Range renvoie tout : le fichier partiel est réécrit."""
+        payload = b"x" * (256 * 1024)
+        service, _ = serve(payload, fail_after=[100 * 1024], honour_range=False)
+        service.storage = storage
+        path = target(storage)
+
+        asyncio.run(service.download("https://replicate.delivery/c.mp4", path))
+
+        assert path.read_bytes() == payload
+
+    def test_gives_up_after_retries(self, storage):
+        """Au-delà de DOWNLOAD_RETRIES, l'erreur remonte et la cible n'existe pas."""
+        service, requests = serve(b"y" * MB, fail_after=[10, 10, 10])
+        service.storage = storage
+        path = target(storage)
+
+        with pytest.raises(httpx.ReadError):
+            asyncio.run(service.download("https://replicate.delivery/d.mp4", path))
+
+        assert len(requests) == 3
+        assert not path.exists()
+
+    def test_truncated_body_is_detected(self, storage):
+        """Un corps plus court que Content-Length n'est jamais renommé en fichier final."""
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Length": "100"}, content=b"z" * 50)
+
+        service = DownloadService(transport=httpx.MockTransport(handler))
+        service.storage = storage
+        path = target(storage)
+
+        with pytest.raises(IncompleteDownload):
+            asyncio.run(service.download("https://replicate.delivery/e.mp4", path))
+        assert not path.exists()
+
+    def test_client_error_is_not_retried(self, storage):
+        """Un 404 échoue immédiatement."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(404)
+
+        service = DownloadService(transport=httpx.MockTransport(handler))
+        service.storage = storage
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(service.download("https://replicate.delivery/f.mp4", target(storage)))
+        assert len(requests) == 1
+
+    def test_memory_stays_flat_for_large_files(self, storage):
+        """Télécharger 32 Mo n'alloue jamais plus que quelques morceaux."""
+        payload = b"v" * (32 * MB)
+        service, _ = serve(payload)
+        service.storage = storage
+        path = target(storage)
+
+        async def scenario():
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            await service.download("https://replicate.delivery/g.mp4", path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak - baseline
+
+        peak = asyncio.run(scenario())
+
+        assert path.stat().st_size == 32 * MB
+        assert peak < 4 * MB
@@ -1,23 +1,21 @@
 """Tests pour la génération IA avec mocks (évite les coûts Replicate)."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 
 class TestGenerationConcepts:
     """Tests génération de concepts (avec mock pour éviter coûts)."""
 
-    @patch('services.generation_service.replicate.run')
-    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
-    def test_generate_concepts_success(self, mock_replicate, client, test_universe):
+    def test_generate_concepts_success(self, client, test_universe, fake_replicate):
         """Test génération de concepts réussie (avec mock)."""
         slug = test_universe["slug"]
 
-        # Mock de la réponse Replicate - retourner un générateur qui produit une string JSON
-        mock_replicate.return_value = ['["vache", "cochon", "cheval"]']
+        # Réponse Replicate factice : flux de tokens formant un tableau JSON
+        fake_replicate.outputs["meta/llama-2-70b-chat"] = ['["vache", ', '"cochon", ', '"cheval"]']
 
         # Mock de la traduction
-        with patch('services.generation_service.GoogleTranslator') as mock_translator:
+        with patch('services.translation_service.GoogleTranslator') as mock_translator:
             mock_translator.return_value.translate.return_value = "translated_concept"
 
             response = client.post(f"/api/generate/{slug}/concepts", json={
@@ -32,6 +30,7 @@ class TestGenerationConcepts:
             assert "concepts" in data
             assert "translations" in data
             assert len(data["concepts"]) == 3
+            assert [model for model, _ in fake_replicate.calls] == ["meta/llama-2-70b-chat"]
 
     def test_generate_concepts_universe_not_found(self, client):
         """Test génération de concepts pour univers inexistant."""
@@ -58,33 +57,20 @@ class TestGenerationConcepts:
 class TestGenerationMusic:
     """Tests génération de musique (avec mock pour éviter coûts)."""
 
-    @patch('services.generation_service.replicate.run')
-    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
-    def test_generate_music_success(self, mock_replicate, client, universe_with_music_prompts):
+    def test_generate_music_success(self, client, universe_with_music_prompts, fake_replicate):
         """Test génération de musique réussie (avec mock)."""
         slug = universe_with_music_prompts["universe"]["slug"]
 
-        # Mock de la réponse Replicate
-        mock_response = MagicMock()
-        mock_response.__str__ = MagicMock(return_value='audio_url_here')
-        mock_replicate.return_value = mock_response
-
-        with patch('services.generation_service.requests.get') as mock_get:
-            mock_response = MagicMock()
-            mock_response.raise_for_status.return_value = None
-            mock_response.content = b'fake_audio_data'
-            mock_get.return_value = mock_response
+        response = client.post(f"/api/generate/{slug}/music", json={
+            "language": "fr"
+        })
 
-            response = client.post(f"/api/generate/{slug}/music", json={
-                "language": "fr"
-            })
-
-            # Devrait créer un job
-            assert response.status_code == 200
-            data = response.json()
-            assert "id" in data
-            assert "type" in data
-            assert data["type"] == "generate_music"
+        # Devrait créer un job
+        assert response.status_code == 200
+        data = response.json()
+        assert "id" in data
+        assert "type" in data
+        assert data["type"] == "generate_music"
 
     def test_generate_music_universe_not_found(self, client):
         """Test génération de musique pour univers inexistant."""
@@ -107,9 +93,7 @@ class TestGenerationMusic:
 class TestGenerationImages:
     """Tests génération d'images (avec mock pour éviter coûts)."""
 
-    @patch('services.generation_service.replicate.run')
-    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
-    def test_generate_images_success(self, mock_replicate, client, test_universe):
+    def test_generate_images_success(self, client, test_universe, fake_replicate):
         """Test génération d'images réussie (avec mock)."""
         slug = test_universe["slug"]
 
@@ -120,25 +104,14 @@ class TestGenerationImages:
         })
         assert asset_response.status_code == 201
 
-        # Mock de la réponse Replicate
-        mock_response = MagicMock()
-        mock_response.__str__ = MagicMock(return_value='image_url_here')
-        mock_replicate.return_value = mock_response
-
-        with patch('services.generation_service.requests.get') as mock_get:
-            mock_response = MagicMock()
-            mock_response.raise_for_status.return_value = None
-            mock_response.content = b'fake_image_data'
-            mock_get.return_value = mock_response
-
-            response = client.post(f"/api/generate/{slug}/images")
+        response = client.post(f"/api/generate/{slug}/images")
 
-            # Devrait créer un job
-            assert response.status_code == 200
-            data = response.json()
-            assert "id" in data
-            assert "type" in data
-            assert data["type"] == "generate_images"
+        # Devrait créer un job
+        assert response.status_code == 200
+        data = response.json()
+        assert "id" in data
+        assert "type" in data
+        assert data["type"] == "generate_images"
 
     @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
     def test_generate_images_no_assets(self, client, test_universe):
@@ -153,9 +126,7 @@ class TestGenerationImages:
 class TestGenerationVideos:
     """Tests génération de vidéos (avec mock pour éviter coûts)."""
 
-    @patch('services.generation_service.replicate.run')
-    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
-    def test_generate_videos_success(self, mock_replicate, client, test_universe):
+    def test_generate_videos_success(self, client, test_universe, fake_replicate):
         """Test génération de vidéos réussie (avec mock)."""
         slug = test_universe["slug"]
 
@@ -177,31 +148,155 @@ class TestGenerationVideos:
 class TestGenerationAll:
     """Tests génération complète (avec mock pour éviter coûts)."""
 
-    @patch('services.generation_service.replicate.run')
-    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
-    def test_generate_all_success(self, mock_replicate, client, test_universe):
+    def test_generate_all_success(self, client, test_universe, fake_replicate):
         """Test génération complète réussie (avec mock)."""
-        # Mock de multiples appels Replicate
-        mock_response = MagicMock()
-        mock_response.__str__ = MagicMock(return_value='content_url_here')
-        mock_replicate.return_value = mock_response
-
-        with patch('services.generation_service.requests.get') as mock_get:
-            mock_response = MagicMock()
-            mock_response.raise_for_status.return_value = None
-            mock_response.content = b'fake_content_data'
-            mock_get.return_value = mock_response
-
-            response = client.post(f"/api/generate/{test_universe['slug']}/all", json={
-                "theme": "test theme",
-                "count": 10,
-                "generate_videos": True,
-                "generate_music": True
-            })
+        response = client.post(f"/api/generate/{test_universe['slug']}/all", json={
+            "theme": "test theme",
+            "count": 10,
+            "generate_videos": True,
+            "generate_music": True
+        })
 
-            # Devrait créer un job
-            assert response.status_code == 200
-            data = response.json()
-            assert "id" in data
-            assert "type" in data
-            assert data["type"] == "generate_all"
\ No newline at end of file
+        # Devrait créer un job
+        assert response.status_code == 200
+        data = response.json()
+        assert "id" in data
+        assert "type" in data
+        assert data["type"] == "generate_all"
+
+    def test_generate_all_task_refreshes_cached_universe(self, client, test_universe):
+        """Les assets créés par la tâche sont visibles tout de suite (cache invalidé)."""
+        from routes.generation import run_generate_all
+        from services.generation_service import generation_service
+
+        slug = test_universe["slug"]
+        assert client.get(f"/api/universes/{slug}").json()["assets"] == []  # Mis en cache
+        result = {"concepts": ["vache", "cochon"], "translations": {"en": ["cow", "pig"]}}
+
+        with patch.object(generation_service, "generate_universe_content", return_value=result):
+            run_generate_all("job", slug, "ferme", 2, False, False)
+
+        assets = client.get(f"/api/universes/{slug}").json()["assets"]
+        assert [a["display_name"] for a in assets] == ["vache", "cochon"]
+
+class TestGenerationImagesConcurrency:
+    """Tests du pool concurrent de génération d'images (sans appel Replicate)."""
+
+    def test_generate_all_images_concurrent_order_and_progress(self, client, test_universe):
+        """Les images sont générées en parallèle, renvoyées dans l'ordre et la progression reste exacte."""
+        import asyncio
+        import threading
+        from database import SessionLocal
+        from services.generation_service import generation_service
+        from services.job_service import job_service
+
+        slug = test_universe["slug"]
+        concepts = [f"concept {i}" for i in range(6)]
+
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        threads = set()
+
+        async def fake_generate_image(prompt, output_path, size="1024x1024"):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                threads.add(threading.current_thread().name)
+            # Les premiers concepts finissent en dernier
+            await asyncio.sleep(0.02 * (len(concepts) - int(output_path.name[:2])))
+            with lock:
+                in_flight -= 1
+            return output_path
+
+        db = SessionLocal()
+        try:
+            job = job_service.create_job(db, "generate_images", slug)
+            job_id = job.id
+        finally:
+            db.close()
+
+        with patch.object(generation_service, "generate_image_async", side_effect=fake_generate_image), \
+                patch.object(generation_service.rate_limiter, "rate", 0):
+            paths = generation_service.generate_all_images(
+                slug, concepts, job_id=job_id, max_concurrency=3
+            )
+
+        assert [p.name[:2] for p in paths] == ["00", "01", "02", "03", "04", "05"]
+        assert 1 < max_in_flight <= 3
+        # Toutes les générations tournent sur la seule boucle d'événements
+        assert threads == {"generation-loop"}
+
+        response = client.get(f"/api/jobs/{job_id}")
+        data = response.json()
+        assert data["current_step"] == len(concepts)
+        assert data["total_steps"] == len(concepts)
+        assert data["progress"] == 100
+
+
+class TestTokenBucket:
+    """Tests du limiteur de débit token bucket."""
+
+    def test_burst_then_throttle(self):
+        """La capacité autorise une rafale puis les appels sont espacés."""
+        from utils import TokenBucket
+
+        bucket = TokenBucket(rate=1000, capacity=2)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert bucket.acquire(timeout=1)
+
+    def test_empty_bucket_times_out(self):
+        """Un bucket vide et lent expire au timeout."""
+        from utils import TokenBucket
+
+        bucket = TokenBucket(rate=0.01, capacity=1)
+        assert bucket.acquire()
+        assert not bucket.acquire(timeout=0.05)
+
+
+class TestGenerationPipeline:
+    """Tests du pipeline image → vidéo de generate_universe_content."""
+
+    def test_videos_start_before_all_images_finish(self, test_universe):
+        """Chaque image terminée part en vidéo ; la musique tourne en parallèle."""
+        import asyncio
+        from services.generation_service import generation_service, LANGUAGES
+
+        slug = test_universe["slug"]
+        concepts = ["chat", "chien", "vache", "poule"]
+        events = []
+
+        async def fake_concepts(*args, **kwargs):
+            return concepts
+
+        async def fake_image(prompt, output_path, size="1024x1024"):
+            await asyncio.sleep(0.05 * (1 + int(output_path.name[:2])))
+            events.append(("image", output_path.name))
+            return output_path
+
+        async def fake_video(image_path, prompt, output_path, duration=3.0):
+            events.append(("video_start", image_path.name))
+            await asyncio.sleep(0.05)
+            return output_path
+
+        async def fake_music(slug, language, *args, **kwargs):
+            await asyncio.sleep(0.1)
+            return generation_service.storage.get_music_file_path(slug, language)
+
+        with patch.object(generation_service, "generate_concepts_async", side_effect=fake_concepts), \
+                patch.object(generation_service, "translate_concepts", return_value={"fr": concepts}), \
+                patch.object(generation_service, "generate_image_async", side_effect=fake_image), \
+                patch.object(generation_service, "generate_video_async", side_effect=fake_video), \
+                patch.object(generation_service, "generate_music_async", side_effect=fake_music):
+            result = generation_service.generate_universe_content(slug, "ferme", concept_count=4)
+
+        assert len(result["images"]) == 4
+        assert [v[-9:] for v in result["videos"]] == [p.replace(".png", ".mp4")[-9:] for p in result["images"]]
+        assert len(result["music"]) == len(LANGUAGES)
+
+        first_video = events.index(next(e for e in events if e[0] == "video_start"))
+        last_image = max(i for i, e in enumerate(events) if e[0] == "image")
+        assert first_video < last_image
@@ -0,0 +1,144 @@
+"""Tests des ETags et du GET conditionnel (304) sur les routes univers."""
+
+import uuid
+import pytest
+
+from services.response_cache import response_cache
+from services.storage_service import storage_service
+
+
+@pytest.fixture
+def slug(client):
+    """Univers avec un asset."""
+    slug = f"etag-{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/universes", json={"name": "ETag", "slug": slug})
+    assert response.status_code == 201
+    response = client.post(f"/api/universes/{slug}/assets", json={"display_name": "Lion"})
+    assert response.status_code == 201
+    return slug
+
+
+def etag_of(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+class TestConditionalGet:
+    """If-None-Match -> 304 sans reconstruire la réponse."""
+
+    @pytest.mark.parametrize("path", ["", "/assets", "/music-prompts"])
+    def test_validators_and_304(self, client, slug, path):
+        """Les vues d'un univers exposent ETag/Last-Modified et répondent 304."""
+        url = f"/api/universes/{slug}{path}"
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "Last-Modified" in response.headers
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+    def test_304_skips_relation_loading(self, client, slug):
+        """Un 304 ne coûte qu'une requête SQL (validateurs), même hors cache serveur."""
+        etag = etag_of(client, f"/api/universes/{slug}")
+        response_cache.clear()
+
+        cached = client.get(f"/api/universes/{slug}", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert int(cached.headers["X-Query-Count"]) == 1
+
+    def test_if_none_match_variants(self, client, slug):
+        """Listes d'ETags, ETags faibles et '*' sont acceptés."""
+        url = f"/api/universes/{slug}"
+        etag = etag_of(client, url)
+
+        assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_unknown_universe_still_404(self, client):
+        """Un univers inconnu reste une 404, même avec If-None-Match."""
+        response = client.get("/api/universes/missing-etag", headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+
+    def test_views_have_distinct_etags(self, client, slug):
+        """Détail, assets et prompts musique n'ont pas le même ETag."""
+        etags = {etag_of(client, f"/api/universes/{slug}{path}") for path in ["", "/assets", "/music-prompts"]}
+        assert len(etags) == 3
+
+
+class TestETagInvalidation:
+    """Toute modification visible dans la réponse change l'ETag."""
+
+    def test_universe_update(self, client, slug):
+        before = etag_of(client, f"/api/universes/{slug}")
+        client.patch(f"/api/universes/{slug}", json={"name": "Renamed"})
+        assert etag_of(client, f"/api/universes/{slug}") != before
+
+    def test_universe_translations_only(self, client, slug):
+        """Modifier seulement les traductions touche l'univers."""
+        before = etag_of(client, f"/api/universes/{slug}")
+        client.patch(f"/api/universes/{slug}", json={"translations": {"fr": "Renommé"}})
+        assert etag_of(client, f"/api/universes/{slug}") != before
+
+    def test_asset_create_and_delete(self, client, slug):
+        before = {path: etag_of(client, f"/api/universes/{slug}{path}") for path in ["", "/assets"]}
+
+        asset = client.post(f"/api/universes/{slug}/assets", json={"display_name": "Tigre"}).json()
+        after_create = {path: etag_of(client, f"/api/universes/{slug}{path}") for path in ["", "/assets"]}
+        assert all(after_create[path] != before[path] for path in before)
+
+        client.delete(f"/api/universes/{slug}/assets/{asset['id']}")
+        after_delete = {path: etag_of(client, f"/api/universes/{slug}{path}") for path in ["", "/assets"]}
+        assert all(after_delete[path] != after_create[path] for path in before)
+
+    def test_asset_translation_update(self, client, slug):
+        """Modifier la traduction d'un asset change l'ETag de l'univers."""
+        asset_id = client.get(f"/api/universes/{slug}/assets").json()[0]["id"]
+        before = etag_of(client, f"/api/universes/{slug}")
+
+        client.patch(f"/api/universes/{slug}/assets/{asset_id}", json={"translations": {"fr": "Lion"}})
+
+        assert etag_of(client, f"/api/universes/{slug}") != before
+
+    def test_music_prompt_changes(self, client, slug):
+        url = f"/api/universes/{slug}/music-prompts"
+        before = etag_of(client, url)
+
+        response = client.post(url, json={"language": "fr", "prompt": "Une berceuse", "lyrics": "Do do"})
+        assert response.status_code == 201
+        after_create = etag_of(client, url)
+        assert after_create != before
+
+        client.patch(f"{url}/fr", json={"lyrics": "La la la"})
+        assert etag_of(client, url) != after_create
+
+    def test_media_file_written(self, client, slug):
+        """Un média ajouté dans le dossier change l'ETag (URLs d'images)."""
+        before = etag_of(client, f"/api/universes/{slug}/assets")
+
+        storage_service.upload_file(b"png", f"{slug}/asset_001.png")
+
+        assert etag_of(client, f"/api/universes/{slug}/assets") != before
+
+    def test_list_changes_with_new_universe(self, client, slug):
+        before = etag_of(client, "/api/universes")
+
+        client.post("/api/universes", json={"name": "Other", "slug": f"etag-{uuid.uuid4().hex[:8]}"})
+
+        assert etag_of(client, "/api/universes") != before
+
+    def test_list_etag_depends_on_query(self, client, slug):
+        assert etag_of(client, "/api/universes?limit=10") != etag_of(client, "/api/universes?limit=20")
+        assert etag_of(client, "/api/universes?is_public=true") != etag_of(client, "/api/universes")
+
+    def test_list_304(self, client, slug):
+        etag = etag_of(client, "/api/universes")
+        assert client.get("/api/universes", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,286 @@
+"""Tests de l'annulation et de la préemption des jobs."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from database import JobStatus, SessionLocal
+from services.job_service import CancelToken, JobCancelled, job_service
+from services.replicate_backend import AsyncReplicateBackend, PredictionTimeout
+from tests.conftest import get_job, wait_until
+
+
+def enqueue(job_type: str, univers_slug=None, preempt=False, **payload) -> str:
+    db = SessionLocal()
+    try:
+        return job_service.enqueue(db, job_type, univers_slug, preempt=preempt, **payload).id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def scheduler_options():
+    """Un seul worker : le second job attend dans la file."""
+    return {"workers": 1, "type_limits": {}}
+
+
+@pytest.fixture
+def blocking_task():
+    """Tâche qui s'arrête au premier contrôle d'annulation suivant son démarrage."""
+    started = threading.Event()
+    runs = []
+
+    def task(job_id, resume=False, **payload):
+        runs.append(job_id)
+        started.set()
+        for _ in range(500):
+            job_service.raise_if_cancelled(job_id)
+            time.sleep(0.01)
+        return {"finished": True}
+
+    with patch.dict(job_service._tasks, {"test_cancel": task}):
+        yield started, runs
+
+
+class TestCancelToken:
+    """Jeton d'annulation partagé avec la tâche."""
+
+    def test_callbacks_run_once_on_cancel(self):
+        token = CancelToken("job")
+        calls = []
+        token.on_cancel(lambda: calls.append("a"))
+        remove = token.on_cancel(lambda: calls.append("b"))
+        remove()
+
+        token.cancel()
+        token.cancel()
+
+        assert calls == ["a"]
+        with pytest.raises(JobCancelled):
+            token.raise_if_cancelled()
+
+    def test_callback_after_cancel_runs_at_once(self):
+        token = CancelToken("job")
+        token.cancel()
+        calls = []
+
+        token.on_cancel(lambda: calls.append(1))
+
+        assert calls == [1]
+
+
+class TestCancelJob:
+    """POST /api/jobs/{id}/cancel."""
+
+    def test_pending_job_never_runs(self, client, scheduler, blocking_task):
+        started, runs = blocking_task
+        first = enqueue("test_cancel")
+        started.wait(5)
+        queued = enqueue("test_cancel")
+        assert scheduler.queue_position(queued) == 1
+
+        response = client.post(f"/api/jobs/{queued}/cancel")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+        assert response.json()["queue_position"] is None
+        assert queued not in scheduler.job_ids()
+        job_service.cancel(first)
+        wait_until(lambda: not scheduler.job_ids())
+        assert runs == [first]
+
+    def test_running_job_stops_and_stays_cancelled(self, client, scheduler, blocking_task):
+        """L'écriture tardive du worker (COMPLETED) ne remplace pas l'annulation."""
+        started, runs = blocking_task
+        job_id = enqueue("test_cancel")
+        started.wait(5)
+
+        response = client.post(f"/api/jobs/{job_id}/cancel")
+        wait_until(lambda: not scheduler.job_ids())
+        job_service.update_job(job_id, status=JobStatus.COMPLETED, message="Completed successfully")
+
+        assert response.status_code == 200
+        job = get_job(job_id)
+        assert job.status == JobStatus.CANCELLED
+        assert job.message == "Cancelled"
+        assert job.result is None
+        assert job.completed_at is not None
+        assert job.lease_owner is None
+
+    def test_finished_job_conflict(self, client):
+        db = SessionLocal()
+        try:
+            job_id = job_service.create_job(db, "test_cancel").id
+        finally:
+            db.close()
+        job_service.update_job(job_id, status=JobStatus.COMPLETED)
+
+        assert client.post(f"/api/jobs/{job_id}/cancel").status_code == 409
+        assert get_job(job_id).status == JobStatus.COMPLETED
+
+    def test_unknown_job(self, client):
+        assert client.post("/api/jobs/does-not-exist/cancel").status_code == 404
+
+    def test_cancelled_status_filter(self, client):
+        db = SessionLocal()
+        try:
+            job_id = job_service.create_job(db, "test_cancel").id
+        finally:
+            db.close()
+        job_service.cancel(job_id)
+
+        listed = client.get("/api/jobs?status=cancelled&limit=100").json()
+
+        assert job_id in [job["id"] for job in listed]
+
+
+class TestPreempt:
+    """Un nouveau job `preempt` remplace les jobs en cours du même type et univers."""
+
+    def test_older_job_cancelled(self, client, scheduler, blocking_task):
+        started, runs = blocking_task
+        first = enqueue("test_cancel", "ferme")
+        other_universe = enqueue("test_cancel", "ocean")
+        started.wait(5)
+
+        second = enqueue("test_cancel", "ferme", preempt=True)
+
+        assert get_job(first).status == JobStatus.CANCELLED
+        assert get_job(first).message == f"Preempted by job {second}"
+        assert get_job(other_universe).status == JobStatus.PENDING
+        job_service.cancel(other_universe)
+        wait_until(lambda: second in runs)
+        job_service.cancel(second)
+
+    def test_preempt_keys_scope_payload(self, client, scheduler, blocking_task):
+        """La musique est préemptée par langue : un job `fr` ne coupe pas le job `en`."""
+        started, _ = blocking_task
+        english = enqueue("test_cancel", "ferme", language="en")
+        started.wait(5)
+        french = enqueue("test_cancel", "ferme", language="fr")
+
+        db = SessionLocal()
+        try:
+            newer = job_service.enqueue(db, "test_cancel", "ferme", preempt=True, preempt_keys=("language",), language="fr").id
+        finally:
+            db.close()
+
+        assert get_job(english).status == JobStatus.RUNNING
+        assert get_job(french).status == JobStatus.CANCELLED
+        for job_id in [english, newer]:
+            job_service.cancel(job_id)
+
+    def test_music_route_preempts_same_language_only(self, client, test_universe):
+        slug = test_universe["slug"]
+        with patch.object(job_service, "_submit"), \
+                patch("config.settings.REPLICATE_API_TOKEN", "fake_token"):  # Jobs laissés en attente
+            english = client.post(f"/api/generate/{slug}/music", json={"language": "en"}).json()["id"]
+            french = client.post(f"/api/generate/{slug}/music", json={"language": "fr"}).json()["id"]
+            client.post(f"/api/generate/{slug}/music", json={"language": "fr", "preempt": True})
+
+        assert get_job(english).status == JobStatus.PENDING
+        assert get_job(french).status == JobStatus.CANCELLED
+        job_service.cancel(english)
+
+    def test_without_preempt_jobs_accumulate(self, client, scheduler, blocking_task):
+        started, _ = blocking_task
+        first = enqueue("test_cancel", "ferme")
+        started.wait(5)
+
+        second = enqueue("test_cancel", "ferme")
+
+        assert get_job(first).status == JobStatus.RUNNING
+        job_service.cancel(first)
+        job_service.cancel(second)
+
+
+class TestCancelPredictions:
+    """Les prédictions Replicate en vol sont annulées avec le job."""
+
+    @pytest.fixture(autouse=True)
+    def fast_polling(self):
+        with patch("config.settings.REPLICATE_POLL_INTERVAL", 0.01), \
+                patch("config.settings.REPLICATE_API_TOKEN", "fake_token"):
+            yield
+
+    @staticmethod
+    def transport(log):
+        def handler(request: httpx.Request) -> httpx.Response:
+            log.append((request.method, request.url.path))
+            if request.method == "POST" and request.url.path.endswith("/cancel"):
+                return httpx.Response(200, json={"id": "p1", "status": "canceled"})
+            if request.method == "POST":
+                return httpx.Response(201, json={"id": "p1", "status": "starting"})
+            return httpx.Response(200, json={"id": "p1", "status": "processing"})
+
+        return httpx.MockTransport(handler)
+
+    def test_cancelled_run_cancels_prediction(self):
+        log = []
+        backend = AsyncReplicateBackend(transport=self.transport(log))
+
+        async def scenario():
+            task = asyncio.create_task(backend.run("owner/model", {"prompt": "x"}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await backend.aclose()
+
+        asyncio.run(scenario())
+
+        assert log[-1] == ("POST", "/v1/predictions/p1/cancel")
+
+    def test_timed_out_prediction_cancelled(self):
+        log = []
+        backend = AsyncReplicateBackend(transport=self.transport(log))
+
+        async def scenario():
+            try:
+                with patch("config.settings.REPLICATE_PREDICTION_TIMEOUT", 0.05):
+                    await backend.run("owner/model", {"prompt": "x"})
+            finally:
+                await backend.aclose()
+
+        with pytest.raises(PredictionTimeout):
+            asyncio.run(scenario())
+        assert ("POST", "/v1/predictions/p1/cancel") in log
+
+    def test_image_batch_stops(self, client, scheduler, test_universe, fake_replicate):
+        """Annulé pendant la première image, le lot ne lance pas les suivantes."""
+        from services.generation_service import generation_service
+
+        fake_replicate.latency = 5
+        started = threading.Event()
+        outcome = {}
+
+        def task(job_id, resume=False):
+            started.set()
+            try:
+                return [str(p) for p in generation_service.generate_all_images(
+                    test_universe["slug"], ["chat", "chien", "lapin"], job_id=job_id, max_concurrency=1
+                )]
+            except JobCancelled as e:
+                outcome["error"] = e
+                raise
+
+        with patch.dict(job_service._tasks, {"test_cancel_images": task}), \
+                patch.object(generation_service.rate_limiter, "rate", 0):
+            job_id = enqueue("test_cancel_images")
+            started.wait(5)
+            wait_until(lambda: fake_replicate.calls)
+
+            begin = time.monotonic()
+            job_service.cancel(job_id)
+            wait_until(lambda: not scheduler.job_ids())
+
+        assert time.monotonic() - begin < 2  # Sans attendre la fin de la prédiction
+        assert isinstance(outcome["error"], JobCancelled)
+        assert len(fake_replicate.calls) == 1
+        wait_until(lambda: fake_replicate.cancelled)  # Déroulé sur la boucle de génération
+        assert len(fake_replicate.cancelled) == 1
+        assert get_job(job_id).status == JobStatus.CANCELLED
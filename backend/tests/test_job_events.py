@@ -0,0 +1,263 @@
+"""Tests du suivi des jobs en push (bus d'événements, SSE, WebSocket)."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+from database import JobStatus, SessionLocal
+from services.job_events import JobEventBus, format_sse, job_events
+from services.job_service import job_service
+from tests.conftest import wait_until
+
+
+def new_job(total_steps=3) -> str:
+    db = SessionLocal()
+    try:
+        return job_service.create_job(db, "test_events", total_steps=total_steps).id
+    finally:
+        db.close()
+
+
+def parse_sse(text: str):
+    """Messages SSE -> [(id, event, data dict)], commentaires exclus."""
+    messages = []
+    for block in text.strip().split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            if line.startswith(":"):
+                continue
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        if "data" in fields:
+            messages.append((fields.get("id"), fields.get("event"), json.loads(fields["data"])))
+    return messages
+
+
+def later(delay, func, *args, **kwargs):
+    threading.Timer(delay, func, args, kwargs).start()
+
+
+def finish(job_id, steps=3):
+    """Fait avancer puis termine un job depuis un autre thread."""
+    for i in range(steps):
+        job_service.step(job_id, f"step {i + 1}")
+    job_service.update_job(job_id, status=JobStatus.COMPLETED, message="Completed successfully")
+
+
+class TestJobEventBus:
+    """Bus pub/sub en mémoire."""
+
+    def test_events_reach_subscriber_from_other_thread(self):
+        bus = JobEventBus()
+
+        async def scenario():
+            subscription = bus.subscribe(["job"])
+            threading.Thread(target=bus.publish, args=("job",), kwargs={"progress": 50}).start()
+            return await subscription.get(timeout=2)
+
+        [(job_id, event_id, fields)] = asyncio.run(scenario())
+        assert (job_id, fields) == ("job", {"progress": 50})
+        assert event_id == bus.last_event_id("job")
+
+    def test_slow_subscriber_gets_merged_latest_state(self):
+        """Contre-pression : pas de file qui grossit, un seul événement fusionné par job."""
+        bus = JobEventBus()
+
+        async def scenario():
+            subscription = bus.subscribe(["job"])
+            for i in range(1, 1001):
+                bus.publish("job", current_step=i, message=f"step {i}")
+            bus.publish("job", status="completed")
+            await asyncio.sleep(0.05)
+            return subscription, await subscription.get(timeout=1)
+
+        subscription, events = asyncio.run(scenario())
+        [(_, event_id, fields)] = events
+        assert fields == {"current_step": 1000, "message": "step 1000", "status": "completed"}
+        assert event_id == bus.last_event_id("job")
+        assert subscription.coalesced == 1000
+
+    def test_unsubscribed_jobs_ignored(self):
+        bus = JobEventBus()
+
+        async def scenario():
+            subscription = bus.subscribe(["a", "b"])
+            bus.unsubscribe(subscription, ["b"])
+            bus.publish("b", progress=1)
+            return await subscription.get(timeout=0.1)
+
+        assert asyncio.run(scenario()) == []
+        assert bus.snapshot()["subscribed_jobs"] == 1
+
+    def test_tracked_jobs_bounded(self):
+        bus = JobEventBus(max_tracked_jobs=2)
+        for job_id in ["a", "b", "c"]:
+            bus.publish(job_id, progress=1)
+
+        assert bus.last_event_id("a") is None
+        assert bus.last_event_id("c") is not None
+
+    def test_format_sse(self):
+        assert format_sse('{"a": 1}', "job", "x-1", 3000) == 'retry: 3000\nid: x-1\nevent: job\ndata: {"a": 1}\n\n'
+
+
+class TestJobEventStream:
+    """GET /api/jobs/{id}/events (Server-Sent Events)."""
+
+    def test_snapshot_then_updates_until_completed(self, client):
+        job_id = new_job()
+        later(0.2, finish, job_id)
+
+        response = client.get(f"/api/jobs/{job_id}/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = parse_sse(response.text)
+        assert messages[0][2]["id"] == job_id
+        assert messages[0][2]["status"] == "pending"
+        assert messages[-1][2]["status"] == "completed"
+        assert all(event == "job" for _, event, _ in messages)
+        assert messages[-1][0] == job_events.last_event_id(job_id)
+
+    def test_finished_job_sends_snapshot_and_closes(self, client):
+        job_id = new_job()
+        finish(job_id)
+
+        messages = parse_sse(client.get(f"/api/jobs/{job_id}/events").text)
+
+        assert len(messages) == 1
+        assert messages[0][2]["status"] == "completed"
+        assert messages[0][2]["current_step"] == 3
+
+    def test_reconnect_with_last_event_id_skips_snapshot(self, client):
+        """Le client déjà à jour ne reçoit pas une seconde fois l'état complet."""
+        job_id = new_job()
+        job_service.step(job_id, "step 1")
+        last_id = job_events.last_event_id(job_id)
+        later(0.2, job_service.update_job, job_id, status=JobStatus.FAILED, error="boom")
+
+        messages = parse_sse(client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": last_id}).text)
+
+        assert [data["status"] for _, _, data in messages] == ["failed"]
+        assert "id" not in messages[0][2]  # Champs modifiés seulement
+
+    def test_stale_last_event_id_gets_snapshot(self, client):
+        job_id = new_job()
+        finish(job_id)
+
+        messages = parse_sse(client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": "old-1"}).text)
+
+        assert messages[0][2]["status"] == "completed"
+
+    def test_heartbeat_while_idle(self, client):
+        job_id = new_job()
+        later(0.3, finish, job_id)
+
+        with patch("config.settings.JOB_EVENTS_HEARTBEAT", 0.05):
+            response = client.get(f"/api/jobs/{job_id}/events")
+
+        assert ": ping" in response.text
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/jobs/does-not-exist/events").status_code == 404
+
+
+class TestJobEventStreamConnections:
+    """Les flux SSE ouverts ne gardent pas de connexion SQLite du pool."""
+
+    @staticmethod
+    async def open_stream(app, job_id, first_chunk, closed):
+        """Requête ASGI brute : le TestClient lit toute la réponse avant de rendre la main."""
+        scope = {
+            "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": f"/api/jobs/{job_id}/events", "raw_path": b"", "root_path": "",
+            "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80)
+        }
+
+        async def receive():
+            await closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                first_chunk.set()
+
+        await app(scope, receive, send)
+
+    def test_open_streams_hold_no_connection(self, client):
+        from database import engine
+        from main import app
+
+        job_ids = [new_job() for _ in range(8)]
+
+        async def scenario():
+            closed = asyncio.Event()
+            started = [asyncio.Event() for _ in job_ids]
+            streams = [
+                asyncio.create_task(self.open_stream(app, job_id, first, closed))
+                for job_id, first in zip(job_ids, started)
+            ]
+            before = engine.pool.checkedout()
+            await asyncio.wait_for(asyncio.gather(*(event.wait() for event in started)), 5)
+            during = engine.pool.checkedout()
+            closed.set()
+            await asyncio.wait_for(asyncio.gather(*streams), 5)
+            return before, during
+
+        before, during = asyncio.run(scenario())
+
+        assert during <= before
+
+class TestJobWebSocket:
+    """WS /api/jobs/ws (plusieurs jobs sur une connexion)."""
+
+    def test_multiplexed_jobs(self, client):
+        first, second = new_job(), new_job()
+
+        with client.websocket_connect("/api/jobs/ws") as ws:
+            ws.send_json({"subscribe": [first, second, "missing"]})
+            snapshots = [ws.receive_json() for _ in range(3)]
+
+            finish(first)
+            finish(second)
+            finished = set()
+            while len(finished) < 2:
+                message = ws.receive_json()
+                assert message["type"] == "job"
+                if message["job"].get("status") == "completed":
+                    finished.add(message["job_id"])
+
+        assert [m["type"] for m in snapshots] == ["job", "job", "error"]
+        assert {m["job_id"] for m in snapshots} == {first, second, "missing"}
+        assert finished == {first, second}
+
+    def test_malformed_message_keeps_socket_open(self, client):
+        """Un message qui n'est pas un objet JSON valide renvoie une erreur sans fermer le socket."""
+        job_id = new_job()
+
+        with client.websocket_connect("/api/jobs/ws") as ws:
+            errors = []
+            for text in ["[1, 2]", "not json", '{"subscribe": "abc"}', '{"subscribe": [{"id": 1}]}']:
+                ws.send_text(text)
+                errors.append(ws.receive_json())
+            ws.send_json({"subscribe": [job_id]})
+            snapshot = ws.receive_json()
+
+        assert all(e["type"] == "error" and e["job_id"] is None for e in errors)
+        assert snapshot["type"] == "job" and snapshot["job_id"] == job_id
+
+    def test_ping_when_idle(self, client):
+        with patch("config.settings.JOB_EVENTS_HEARTBEAT", 0.05):
+            with client.websocket_connect("/api/jobs/ws") as ws:
+                assert ws.receive_json() == {"type": "ping"}
+
+    def test_subscriptions_released_on_disconnect(self, client):
+        job_id = new_job()
+
+        with client.websocket_connect("/api/jobs/ws") as ws:
+            ws.send_json({"subscribe": [job_id]})
+            ws.receive_json()
+            assert job_events.snapshot()["subscribed_jobs"] >= 1
+
+        wait_until(lambda: job_id not in job_events._subscribers)
@@ -0,0 +1,149 @@
+"""Tests du tampon de progression des jobs (écritures regroupées)."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import JobStatus, SessionLocal, engine
+from services.job_service import job_service
+from services.progress_buffer import JobProgress, ProgressBuffer
+from tests.conftest import get_job, wait_until
+
+
+@contextmanager
+def job_updates():
+    """Compte les UPDATE sur la table jobs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE JOBS"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def new_job(total_steps=0) -> str:
+    db = SessionLocal()
+    try:
+        return job_service.create_job(db, "test_progress", total_steps=total_steps).id
+    finally:
+        db.close()
+
+
+class TestProgressBuffer:
+    """Tampon en mémoire (sans base)."""
+
+    def test_steps_coalesced(self):
+        buffer = ProgressBuffer()
+        load = lambda: JobProgress(total_steps=4)
+
+        for _ in range(3):
+            buffer.apply("job", load, step=True, message="step")
+
+        assert buffer.drain() == {"job": {"progress": 75, "current_step": 3, "total_steps": 4, "message": "step"}}
+        assert buffer.drain() == {}
+        assert buffer.snapshot()["rows_written"] == 1
+
+    def test_entry_kept_one_cycle_after_write(self):
+        """Pas de relecture de la base juste après une écriture (valeur potentiellement périmée)."""
+        buffer = ProgressBuffer()
+        loads = []
+
+        def load():
+            loads.append(1)
+            return JobProgress(total_steps=10)
+
+        buffer.apply("job", load, step=True)
+        buffer.drain()
+        buffer.apply("job", load, step=True)
+
+        assert len(loads) == 1
+        assert buffer.get("job")["current_step"] == 2
+
+    def test_clean_entries_dropped(self):
+        buffer = ProgressBuffer()
+        buffer.apply("job", lambda: JobProgress(), message="x")
+        buffer.drain()
+        buffer.drain()
+
+        assert buffer.get("job") is None
+
+    def test_pop_returns_unwritten_values_only(self):
+        buffer = ProgressBuffer()
+        buffer.apply("a", lambda: JobProgress(), message="x")
+        buffer.apply("b", lambda: JobProgress(), message="y")
+        buffer.drain()
+        buffer.apply("a", lambda: JobProgress(), message="z")
+
+        assert buffer.pop("a")["message"] == "z"
+        assert buffer.pop("b") is None
+
+    def test_unknown_job(self):
+        assert ProgressBuffer().apply("missing", lambda: None, step=True) is False
+
+
+class TestJobServiceProgress:
+    """Progression des jobs via JobService."""
+
+    def test_steps_batched_into_few_writes(self, client):
+        job_id = new_job(total_steps=200)
+
+        with job_updates() as updates:
+            for i in range(200):
+                job_service.step(job_id, f"step {i + 1}")
+            job_service.flush()
+
+        assert len(updates) <= 3
+        job = get_job(job_id)
+        assert (job.current_step, job.progress, job.message) == (200, 100, "step 200")
+
+    def test_api_reads_buffered_progress(self, client):
+        job_id = new_job()
+        job_service.set_total_steps(job_id, 4)
+        job_service.step(job_id, "first")
+
+        data = client.get(f"/api/jobs/{job_id}").json()
+
+        assert (data["current_step"], data["total_steps"], data["progress"]) == (1, 4, 25)
+        assert data["message"] == "first"
+        listed = {j["id"]: j for j in client.get("/api/jobs?limit=100").json()}
+        assert listed[job_id]["current_step"] == 1
+
+    def test_final_state_written_immediately(self, client):
+        job_id = new_job(total_steps=2)
+        job_service.step(job_id)
+        job_service.step(job_id)
+
+        job_service.update_job(job_id, status=JobStatus.COMPLETED, message="Completed successfully", result={"ok": True})
+
+        job = get_job(job_id)
+        assert job.status == JobStatus.COMPLETED
+        assert (job.current_step, job.progress) == (2, 100)
+        assert job.message == "Completed successfully"
+        assert job_service.progress.get(job_id) is None
+
+    def test_late_step_does_not_overwrite_final_state(self, client):
+        job_id = new_job(total_steps=2)
+        job_service.update_job(job_id, status=JobStatus.FAILED, message="Failed: boom", error="boom")
+
+        job_service.step(job_id, "late")
+        job_service.flush()
+
+        job = get_job(job_id)
+        assert job.message == "Failed: boom"
+        assert client.get(f"/api/jobs/{job_id}").json()["message"] == "Failed: boom"
+
+    def test_flushed_in_background(self, client):
+        job_id = new_job(total_steps=1)
+        job_service.step(job_id, "done")
+
+        wait_until(lambda: get_job(job_id).current_step == 1)
+
+    def test_metrics_expose_buffer(self, client):
+        data = client.get("/api/metrics/jobs").json()
+
+        assert {"updates", "flushes", "rows_written"} <= set(data["progress"])
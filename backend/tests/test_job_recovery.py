@@ -0,0 +1,222 @@
+"""Tests de la file de jobs durable (baux, reprise après crash, arrêt)."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from database import Job, JobStatus, SessionLocal
+from services.job_service import job_service
+from tests.conftest import get_job, wait_until
+
+
+def insert_job(**fields) -> str:
+    """Insère un job tel qu'un processus disparu l'aurait laissé."""
+    db = SessionLocal()
+    try:
+        job = Job(**{"status": JobStatus.RUNNING, "progress": 0, "total_steps": 0, "current_step": 0, **fields})
+        db.add(job)
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def expired():
+    return datetime.utcnow() - timedelta(minutes=5)
+
+
+class TestLeaseRecovery:
+    """Jobs dont le bail a expiré (processus tué pendant l'exécution)."""
+
+    def test_expired_durable_job_resumes(self, scheduler, test_universe, fake_replicate):
+        """Un job d'images repris garde l'image déjà écrite et ne génère que la manquante."""
+        from services.storage_service import storage_service
+
+        slug = test_universe["slug"]
+        storage_service.create_universe_folder(slug)
+        kept = storage_service.write_file(storage_service.get_asset_image_path(slug, "00_vache.png"), b"already there")
+        job_id = insert_job(
+            type="generate_images",
+            univers_slug=slug,
+            total_steps=2,
+            attempts=1,
+            payload=json.dumps({
+                "slug": slug,
+                "concepts": ["vache", "cochon"],
+                "prompts": ["une vache", "un cochon"],
+                "theme_context": "Ferme"
+            }),
+            lease_owner="dead-host:1:abcdef",
+            lease_expires_at=expired()
+        )
+
+        outcome = job_service.requeue_expired()
+
+        assert job_id in outcome["requeued"]
+        wait_until(lambda: get_job(job_id).status == JobStatus.COMPLETED)
+        job = get_job(job_id)
+        assert job.attempts == 2
+        assert job.lease_owner is None
+        assert kept.read_bytes() == b"already there"
+        assert [input["prompt"] for _, input in fake_replicate.calls] == ["un cochon"]
+        assert job.current_step == 2
+
+    def test_ad_hoc_job_fails(self, scheduler):
+        """Sans payload, la tâche ne peut pas être rejouée : le job passe en échec."""
+        job_id = insert_job(type="test_adhoc", lease_owner="dead-host:1:abcdef", lease_expires_at=expired())
+
+        outcome = job_service.requeue_expired()
+
+        assert job_id in outcome["failed"]
+        job = get_job(job_id)
+        assert job.status == JobStatus.FAILED
+        assert "Interrupted" in job.message
+        assert job.completed_at is not None
+
+    def test_running_job_without_lease_fails(self, scheduler):
+        """Un job RUNNING d'avant la file durable (aucun bail) n'est plus bloqué."""
+        job_id = insert_job(type="test_adhoc")
+
+        assert job_id in job_service.requeue_expired()["failed"]
+        assert get_job(job_id).status == JobStatus.FAILED
+
+    def test_max_attempts_exhausted(self, scheduler):
+        job_id = insert_job(
+            type="generate_music",
+            attempts=3,
+            payload=json.dumps({"slug": "x", "language": "fr", "style": "pop"}),
+            lease_owner="dead-host:1:abcdef",
+            lease_expires_at=expired()
+        )
+
+        with patch("config.settings.JOB_MAX_ATTEMPTS", 3):
+            assert job_id in job_service.requeue_expired()["failed"]
+        assert get_job(job_id).status == JobStatus.FAILED
+
+    def test_live_lease_untouched(self, scheduler):
+        """Un job dont le bail court encore appartient à un autre processus vivant."""
+        job_id = insert_job(
+            type="generate_music",
+            payload=json.dumps({"slug": "x", "language": "fr", "style": "pop"}),
+            lease_owner="other-host:1:abcdef",
+            lease_expires_at=datetime.utcnow() + timedelta(minutes=5)
+        )
+
+        outcome = job_service.requeue_expired()
+
+        assert job_id not in outcome["requeued"] + outcome["failed"]
+        assert get_job(job_id).status == JobStatus.RUNNING
+
+
+class TestClaim:
+    """Réservation atomique PENDING -> RUNNING."""
+
+    def test_job_runs_once(self, scheduler):
+        """Soumis deux fois (ex. deux processus), le job ne s'exécute qu'une fois."""
+        runs = []
+
+        def task(job_id, resume=False, value=None):
+            runs.append(value)
+            return {"value": value}
+
+        with patch.dict(job_service._tasks, {"test_durable": task}):
+            db = SessionLocal()
+            try:
+                job_id = job_service.enqueue(db, "test_durable", value=42).id
+            finally:
+                db.close()
+            job_service._submit(job_id, "test_durable")
+            wait_until(lambda: get_job(job_id).status == JobStatus.COMPLETED)
+            wait_until(lambda: not scheduler.job_ids())
+
+        assert runs == [42]
+        job = get_job(job_id)
+        assert json.loads(job.result) == {"value": 42}
+        assert job.attempts == 1
+
+    def test_enqueue_requires_registered_task(self, scheduler):
+        db = SessionLocal()
+        try:
+            with pytest.raises(ValueError):
+                job_service.enqueue(db, "not_registered")
+        finally:
+            db.close()
+
+    def test_heartbeat_renews_held_leases(self, scheduler):
+        started = threading.Event()
+        release = threading.Event()
+
+        def task(job_id, resume=False):
+            started.set()
+            release.wait(5)
+
+        with patch.dict(job_service._tasks, {"test_durable": task}):
+            db = SessionLocal()
+            try:
+                job_id = job_service.enqueue(db, "test_durable").id
+            finally:
+                db.close()
+            started.wait(5)
+            before = get_job(job_id).lease_expires_at
+
+            time.sleep(0.01)
+            assert job_service.heartbeat() >= 1
+            job = get_job(job_id)
+            release.set()
+
+        assert job.lease_owner == job_service.worker_id
+        assert job.lease_expires_at > before
+        assert job.heartbeat_at is not None
+
+
+class TestShutdown:
+    """Arrêt propre : les jobs durables en attente survivent au redémarrage."""
+
+    def test_queued_jobs_on_shutdown(self, scheduler):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocker(job_id, resume=False):
+            started.set()
+            release.wait(5)
+
+        with patch.dict(job_service._tasks, {"test_durable": blocker}), \
+                patch.object(scheduler, "workers", 1):
+            db = SessionLocal()
+            try:
+                job_service.enqueue(db, "test_durable")
+                started.wait(5)
+                durable_id = job_service.enqueue(db, "test_durable").id
+                adhoc_id = job_service.run_async(db, "test_adhoc", lambda job_id: None).id
+            finally:
+                db.close()
+
+            threading.Timer(0.2, release.set).start()
+            job_service.shutdown(timeout=5)
+
+        durable = get_job(durable_id)
+        assert durable.status == JobStatus.PENDING
+        assert durable.lease_expires_at <= datetime.utcnow()
+        assert get_job(adhoc_id).status == JobStatus.FAILED
+
+
+class TestDurableRoutes:
+    """Les routes de génération créent des jobs rejouables."""
+
+    def test_images_job_stores_payload(self, client, scheduler, test_universe, fake_replicate):
+        slug = test_universe["slug"]
+        client.post(f"/api/generate/{slug}/concepts/apply", json={
+            "concepts": ["vache"],
+            "translations": {"fr": ["vache"]}
+        })
+
+        response = client.post(f"/api/generate/{slug}/images", json={})
+
+        assert response.status_code == 200
+        job = get_job(response.json()["id"])
+        assert json.loads(job.payload)["concepts"] == ["vache"]
+        wait_until(lambda: get_job(job.id).status == JobStatus.COMPLETED)
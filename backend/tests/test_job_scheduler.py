@@ -0,0 +1,184 @@
+"""Tests du planificateur de jobs (pool borné, limites par type, priorités, arrêt)."""
+
+import threading
+import time
+
+import pytest
+
+from services.job_scheduler import JobScheduler
+from tests.conftest import wait_until
+
+
+def blocking_job(started, release, log=None, name=None, counter=None):
+    """Job qui signale son démarrage puis attend qu'on le libère."""
+    def run():
+        if log is not None:
+            log.append(name)
+        if counter is not None:
+            counter.enter()
+        started.set()
+        release.wait(5)
+        if counter is not None:
+            counter.leave()
+    return run
+
+
+class Concurrency:
+    """Compte les jobs simultanés (global et par type)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def leave(self):
+        with self.lock:
+            self.current -= 1
+
+
+@pytest.fixture
+def scheduler_options():
+    return {"workers": 2, "type_limits": {"video": 1}}
+
+
+class TestJobScheduler:
+    """Pool de workers borné avec file d'attente ordonnée."""
+
+    def test_worker_pool_is_bounded(self, scheduler):
+        """Dix jobs soumis d'un coup n'occupent jamais plus de 2 workers."""
+        counter = Concurrency()
+        release = threading.Event()
+        done = []
+
+        def run():
+            counter.enter()
+            release.wait(5)
+            counter.leave()
+            done.append(1)
+
+        for i in range(10):
+            scheduler.submit(f"job-{i}", "images", run)
+
+        wait_until(lambda: counter.current == 2)
+        assert scheduler.snapshot()["queued"] == 8
+        release.set()
+        wait_until(lambda: len(done) == 10)
+        assert counter.peak == 2
+
+    def test_type_limit_does_not_block_other_types(self, scheduler):
+        """Le 2e job vidéo attend, mais un job d'un autre type passe devant lui."""
+        release = threading.Event()
+        video_started = threading.Event()
+        other_started = threading.Event()
+
+        scheduler.submit("video-1", "video", blocking_job(video_started, release))
+        video_started.wait(5)
+        scheduler.submit("video-2", "video", blocking_job(threading.Event(), release))
+        scheduler.submit("music-1", "music", blocking_job(other_started, release))
+
+        assert other_started.wait(5)
+        assert scheduler.queue_position("video-2") == 1
+        assert scheduler.snapshot()["running_by_type"] == {"video": 1, "music": 1}
+        release.set()
+
+    def test_priority_then_fifo(self):
+        """Les jobs en attente partent par priorité décroissante puis dans l'ordre d'arrivée."""
+        scheduler = JobScheduler(workers=1, type_limits={})
+        release = threading.Event()
+        started = threading.Event()
+        order = []
+        try:
+            scheduler.submit("first", "x", blocking_job(started, release))
+            started.wait(5)
+            for job_id, priority in [("low-a", 0), ("low-b", 0), ("high", 5)]:
+                scheduler.submit(job_id, "x", lambda job_id=job_id: order.append(job_id), priority)
+
+            assert [scheduler.queue_position(j) for j in ["high", "low-a", "low-b"]] == [1, 2, 3]
+            assert scheduler.queue_position("first") is None
+
+            release.set()
+            wait_until(lambda: len(order) == 3)
+            assert order == ["high", "low-a", "low-b"]
+        finally:
+            scheduler.shutdown(timeout=5)
+
+    def test_shutdown_drains_running_and_returns_unstarted(self):
+        """L'arrêt attend les jobs en cours et rend les jobs jamais démarrés."""
+        scheduler = JobScheduler(workers=1, type_limits={})
+        started = threading.Event()
+        finished = []
+
+        def slow():
+            started.set()
+            time.sleep(0.1)
+            finished.append("running")
+
+        scheduler.submit("running", "x", slow)
+        started.wait(5)
+        scheduler.submit("queued", "x", lambda: finished.append("queued"))
+
+        outcome = scheduler.shutdown(timeout=5)
+
+        assert outcome == {"unstarted": ["queued"], "unfinished": []}
+        assert finished == ["running"]
+
+        # Le pool redémarre à la soumission suivante
+        done = threading.Event()
+        scheduler.submit("after", "x", done.set)
+        assert done.wait(5)
+        scheduler.shutdown(timeout=5)
+
+    def test_crashing_job_keeps_worker_alive(self, scheduler):
+        """Une exception non gérée ne tue pas le worker."""
+        done = threading.Event()
+
+        def crash():
+            raise RuntimeError("boom")
+
+        scheduler.submit("crash-1", "x", crash)
+        scheduler.submit("crash-2", "x", crash)
+        scheduler.submit("ok", "x", done.set)
+        assert done.wait(5)
+
+
+class TestJobQueueApi:
+    """La position dans la file est visible via l'API des jobs."""
+
+    @pytest.mark.parametrize("scheduler_options", [{"workers": 1, "type_limits": {}}])
+    def test_pending_job_shows_queue_position(self, client, scheduler, test_universe):
+        """Avec un seul worker occupé, le job suivant reste PENDING en position 1."""
+        from database import SessionLocal
+        from services.job_service import job_service
+
+        release = threading.Event()
+        started = threading.Event()
+
+        def first_task(job_id):
+            started.set()
+            release.wait(5)
+            return {"ok": True}
+
+        db = SessionLocal()
+        try:
+            first_id = job_service.run_async(db, "test_block", first_task).id
+            started.wait(5)
+            second_id = job_service.run_async(db, "test_block", lambda job_id: None).id
+        finally:
+            db.close()
+
+        data = client.get(f"/api/jobs/{second_id}").json()
+        assert data["status"] == "pending"
+        assert data["queue_position"] == 1
+        assert client.get(f"/api/jobs/{first_id}").json()["queue_position"] is None
+
+        metrics = client.get("/api/metrics/jobs").json()
+        assert "workers" in metrics
+
+        release.set()
+        wait_until(lambda: client.get(f"/api/jobs/{second_id}").json()["status"] == "completed")
+        assert client.get(f"/api/jobs/{second_id}").json()["queue_position"] is None
@@ -35,6 +35,63 @@ class TestJobsManagement:
         assert "not found" in response.json()["detail"]
 
 
+    def test_list_jobs_cursor_pagination(self, client):
+        """Les pages suivies par X-Next-Cursor couvrent tous les jobs, sans doublon."""
+        import uuid
+        from datetime import datetime, timedelta
+        from database import SessionLocal, Job
+        from services.job_service import job_service
+
+        slug = f"paging-{uuid.uuid4().hex[:8]}"
+        db = SessionLocal()
+        try:
+            created = [job_service.create_job(db, "test_paging", univers_slug=slug).id for _ in range(5)]
+            # created_at explicite (format SQLAlchemy avec microsecondes) mêlé à CURRENT_TIMESTAMP
+            job = Job(type="test_paging", univers_slug=slug, created_at=datetime.utcnow() + timedelta(seconds=5))
+            db.add(job)
+            db.commit()
+            created.append(job.id)
+        finally:
+            db.close()
+
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {"univers_slug": slug, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/jobs", params=params)
+            assert response.status_code == 200
+            seen.extend(j["id"] for j in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert sorted(seen) == sorted(created)
+        assert len(seen) == len(set(seen))
+        assert seen[0] == job.id  # Le plus récent d'abord
+
+        single_page = client.get("/api/jobs", params={"univers_slug": slug, "limit": 100})
+        assert [j["id"] for j in single_page.json()] == seen
+        assert "X-Next-Cursor" not in single_page.headers
+
+    def test_list_jobs_total_and_invalid_cursor(self, client):
+        """X-Total-Count sur demande ; un curseur invalide donne une 400."""
+        response = client.get("/api/jobs", params={"with_total": "true", "limit": 1})
+        assert int(response.headers["X-Total-Count"]) >= len(response.json())
+        assert "X-Total-Count" not in client.get("/api/jobs").headers
+
+        assert client.get("/api/jobs", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    @pytest.mark.parametrize("payload", ['"zz"', '["2026",{"a":1}]', '["2026",null]', '{"a":1}'])
+    def test_list_jobs_malformed_cursor_payload(self, client, payload):
+        """Un curseur décodable mais de forme inattendue donne une 400, pas une 500."""
+        import base64
+
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        assert client.get("/api/jobs", params={"cursor": cursor}).status_code == 400
+
+
 class TestSyncOperations:
     """Tests des opérations de synchronisation avec Supabase."""
 
@@ -102,4 +159,14 @@ class TestSyncOperations:
             assert "message" in data
             assert "universes_synced" in data
             assert "assets_synced" in data
-            assert "files_downloaded" in data
\ No newline at end of file
+            assert "files_downloaded" in data
+
+    def test_sync_init_async(self, client):
+        """Test init sync en tâche de fond (job suivi)."""
+        response = client.post("/api/sync/init/async")
+        assert response.status_code in [200, 503]  # 200 si OK, 503 si pas connecté
+
+        if response.status_code == 200:
+            data = response.json()
+            assert data["type"] == "sync_pull_all"
+            assert client.get(f"/api/jobs/{data['id']}").status_code == 200
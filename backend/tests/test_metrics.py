@@ -0,0 +1,65 @@
+"""Tests de l'instrumentation SQL (timings, requêtes par requête HTTP)."""
+
+
+class TestQueryInstrumentation:
+    """Compteurs par statement et par requête."""
+
+    def test_query_count_header(self, client, test_universe):
+        """Chaque réponse indique le nombre de requêtes SQL exécutées."""
+        response = client.get(f"/api/universes/{test_universe['slug']}")
+
+        assert response.status_code == 200
+        assert int(response.headers["X-Query-Count"]) > 0
+        assert float(response.headers["X-Query-Time-Ms"]) >= 0
+
+    def test_metrics_endpoint_aggregates_routes(self, client, test_universe):
+        """L'endpoint expose les statements, l'histogramme et les compteurs par route."""
+        client.delete("/api/metrics/queries")
+        client.get(f"/api/universes/{test_universe['slug']}")
+        client.get(f"/api/universes/{test_universe['slug']}")
+
+        data = client.get("/api/metrics/queries").json()
+
+        route = data["routes"]["GET /api/universes/{slug}"]
+        assert route["requests"] == 2
+        assert route["avg_queries"] > 0
+        assert data["total_queries"] >= route["avg_queries"] * 2
+        top = data["statements"][0]
+        assert sum(top["histogram"].values()) == top["count"]
+
+    def test_slow_queries_flagged(self):
+        """Les statements au-dessus du seuil sont journalisés."""
+        from database.instrumentation import QueryStats
+
+        stats = QueryStats(slow_query_ms=50)
+        stats.record("SELECT 1", 2.0)
+        stats.record("SELECT * FROM jobs", 120.0)
+
+        snapshot = stats.snapshot()
+        assert [q["statement"] for q in snapshot["slow_queries"]] == ["SELECT * FROM jobs"]
+        assert snapshot["statements"][0]["statement"] == "SELECT * FROM jobs"
+
+    def test_in_lists_grouped(self):
+        """Des IN de tailles différentes comptent comme un même statement."""
+        from database.instrumentation import QueryStats
+
+        stats = QueryStats()
+        stats.record("SELECT * FROM t WHERE id IN (?, ?)", 1.0)
+        stats.record("SELECT *\n  FROM t WHERE id IN (?, ?, ?, ?)", 1.0)
+
+        snapshot = stats.snapshot()
+        assert len(snapshot["statements"]) == 1
+        assert snapshot["statements"][0]["count"] == 2
+
+    def test_track_counts_queries(self):
+        """track() compte les requêtes exécutées dans le bloc."""
+        from database import SessionLocal, Job, query_stats
+
+        db = SessionLocal()
+        try:
+            with query_stats.track() as queries:
+                db.query(Job).limit(1).all()
+                db.query(Job).count()
+            assert queries.count == 2
+        finally:
+            db.close()
@@ -0,0 +1,214 @@
+"""Tests des migrations de schéma et des plans de requête (usage des index)."""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from database import (
+    Base, Job, JobStatus, Univers, UniversAsset, UniversAssetPrompts,
+    UniversAssetTranslation, UniversMusicPrompts, UniversPrompts, UniversTranslation
+)
+from database.connection import create_sqlite_engine
+from database.migrations import MIGRATIONS, get_schema_version, run_migrations
+from services.job_service import job_service
+from utils.pagination import keyset_page
+
+
+DECLARED_INDEXES = sorted(index.name for table in Base.metadata.sorted_tables for index in table.indexes)
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Base "déployée" : tables existantes, sans les index déclarés, schéma v0."""
+    engine = create_sqlite_engine(tmp_path / "legacy.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for name in DECLARED_INDEXES:
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        connection.exec_driver_sql("PRAGMA user_version = 0")
+        connection.exec_driver_sql(
+            "INSERT INTO univers (name, slug, created_at, updated_at) "
+            "VALUES ('Legacy', 'legacy', '2024-01-01 10:00:00', NULL)"
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrated(legacy_engine):
+    """Base migrée + session."""
+    run_migrations(legacy_engine)
+    Session = sessionmaker(bind=legacy_engine, autoflush=False)
+    db = Session()
+    yield legacy_engine, db
+    db.close()
+
+
+def index_names(engine):
+    with engine.connect() as connection:
+        return {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+@contextmanager
+def query_plans(engine):
+    """Exécute le bloc puis fournit le plan (EXPLAIN QUERY PLAN) de chaque SELECT émis."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    plans = []
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            plans.append((statement, " | ".join(row[3] for row in rows)))
+
+
+def seed_universe(db):
+    univers = Univers(name="Plan", slug="plan")
+    db.add(univers)
+    db.flush()
+    db.add(UniversPrompts(univers_id=univers.id, default_image_prompt="x"))
+    db.add(UniversTranslation(univers_id=univers.id, language="fr", name="Plan"))
+    db.add(UniversMusicPrompts(univers_id=univers.id, language="fr", prompt="x", lyrics="y"))
+    for i in range(3):
+        asset = UniversAsset(univers_id=univers.id, sort_order=i, image_name=f"{i}.png", display_name=f"A{i}")
+        db.add(asset)
+        db.flush()
+        db.add(UniversAssetPrompts(asset_id=asset.id, custom_image_prompt="x"))
+        db.add(UniversAssetTranslation(asset_id=asset.id, language="fr", display_name=f"A{i}"))
+    db.commit()
+    return univers
+
+
+class TestSchemaMigrations:
+    """Évolution d'une base existante (create_all ne modifie pas les tables existantes)."""
+
+    def test_adds_declared_indexes(self, legacy_engine):
+        assert not set(DECLARED_INDEXES) & index_names(legacy_engine)
+
+        result = run_migrations(legacy_engine)
+
+        assert sorted(result["created_indexes"]) == DECLARED_INDEXES
+        assert set(DECLARED_INDEXES) <= index_names(legacy_engine)
+
+    def test_expected_indexes_declared(self):
+        """Clés étrangères, filtres de jobs et composites demandés."""
+        assert {
+            "ix_univers_assets_univers_id_sort_order",
+            "ix_univers_assets_translations_asset_id_language",
+            "ix_univers_translations_univers_id_language",
+            "ix_univers_prompts_univers_id",
+            "ix_jobs_univers_slug_created_at",
+            "ix_jobs_status_created_at",
+            "ix_jobs_created_at_id",
+            "ix_univers_created_at_id",
+        } <= set(DECLARED_INDEXES)
+
+    def test_versioned_migrations_applied_once(self, legacy_engine):
+        latest = MIGRATIONS[-1][0]
+
+        first = run_migrations(legacy_engine)
+        second = run_migrations(legacy_engine)
+
+        assert first["from_version"] == 0
+        assert first["applied"] == [version for version, _, _ in MIGRATIONS]
+        assert second["applied"] == []
+        assert second["created_indexes"] == []
+        with legacy_engine.connect() as connection:
+            assert get_schema_version(connection) == latest
+
+    def test_backfill_updated_at(self, legacy_engine):
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as connection:
+            updated_at = connection.exec_driver_sql("SELECT updated_at FROM univers WHERE slug = 'legacy'").scalar()
+        assert updated_at == "2024-01-01 10:00:00"
+
+    def test_adds_job_lease_columns(self, legacy_engine):
+        """Une table jobs antérieure à la file durable reçoit les colonnes de bail."""
+        columns = ["payload", "priority", "attempts", "lease_owner", "lease_expires_at", "heartbeat_at"]
+        with legacy_engine.begin() as connection:
+            for column in columns:
+                connection.exec_driver_sql(f"ALTER TABLE jobs DROP COLUMN {column}")
+            connection.exec_driver_sql(
+                "INSERT INTO jobs (id, type, status) VALUES ('legacy-job', 'generate_images', 'RUNNING')"
+            )
+
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as connection:
+            existing = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(jobs)")}
+            attempts = connection.exec_driver_sql("SELECT attempts FROM jobs WHERE id = 'legacy-job'").scalar()
+        assert set(columns) <= existing
+        assert attempts == 0
+        assert "ix_jobs_status_lease_expires_at" in index_names(legacy_engine)
+
+    def test_app_database_migrated(self, client):
+        """La base de l'application est à jour après le démarrage."""
+        from database import engine
+
+        with engine.connect() as connection:
+            assert get_schema_version(connection) == MIGRATIONS[-1][0]
+        assert set(DECLARED_INDEXES) <= index_names(engine)
+
+
+class TestQueryPlans:
+    """Les requêtes chaudes utilisent les index (pas de SCAN ni de tri temporaire)."""
+
+    def test_relationship_loads(self, migrated):
+        from routes.universes import ASSET_RESPONSE_OPTIONS, UNIVERS_RESPONSE_OPTIONS
+
+        engine, db = migrated
+        seed_universe(db)
+        db.expunge_all()
+
+        with query_plans(engine) as plans:
+            univers = db.query(Univers).options(*UNIVERS_RESPONSE_OPTIONS).filter(Univers.slug == "plan").one()
+            db.query(UniversAsset).options(*ASSET_RESPONSE_OPTIONS)\
+                .filter(UniversAsset.univers_id == univers.id).all()
+
+        assert plans
+        for statement, plan in plans:
+            assert "SCAN" not in plan.replace("SCAN CONSTANT ROW", ""), f"{plan}\n{statement}"
+
+    @pytest.mark.parametrize("filters, index", [
+        ({}, "ix_jobs_created_at_id"),
+        ({"univers_slug": "plan"}, "ix_jobs_univers_slug_created_at"),
+        ({"status": JobStatus.RUNNING}, "ix_jobs_status_created_at"),
+    ])
+    def test_job_listing(self, migrated, filters, index):
+        engine, db = migrated
+        for i in range(5):
+            db.add(Job(type="plan", univers_slug="plan", status=JobStatus.RUNNING))
+        db.commit()
+
+        _, cursor = job_service.get_jobs(db, limit=2, **filters)
+        with query_plans(engine) as plans:
+            job_service.get_jobs(db, limit=2, **filters)
+            job_service.get_jobs(db, limit=2, cursor=cursor, **filters)
+
+        for statement, plan in plans:
+            assert index in plan, f"{plan}\n{statement}"
+            assert "TEMP B-TREE" not in plan, plan
+
+    def test_universe_listing(self, migrated):
+        engine, db = migrated
+        seed_universe(db)
+
+        _, cursor = keyset_page(db.query(Univers), Univers.created_at, Univers.id, 1)
+        with query_plans(engine) as plans:
+            keyset_page(db.query(Univers), Univers.created_at, Univers.id, 1)
+            keyset_page(db.query(Univers), Univers.created_at, Univers.id, 1, cursor)
+
+        for statement, plan in plans:
+            assert "ix_univers_created_at_id" in plan, f"{plan}\n{statement}"
+            assert "TEMP B-TREE" not in plan, plan
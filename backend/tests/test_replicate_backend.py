@@ -0,0 +1,187 @@
+"""Tests du backend Replicate asynchrone (transport HTTP simulé, pas de réseau)."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from services.replicate_backend import AsyncReplicateBackend, ReplicateError
+
+
+def make_transport(statuses, output="https://replicate.delivery/out.png", create_status=201, log=None):
+    """Transport simulé : création puis un statut par poll."""
+    polls = iter(statuses)
+    log = log if log is not None else []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        log.append((request.method, request.url.path))
+        if request.method == "POST":
+            if create_status == 429 and sum(1 for m, _ in log if m == "POST") == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(201, json={"id": "p1", "status": "starting"})
+        status = next(polls)
+        body = {"id": "p1", "status": status, "error": "boom" if status == "failed" else None}
+        if status == "succeeded":
+            body["output"] = output
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler), log
+
+
+@pytest.fixture(autouse=True)
+def fast_polling():
+    with patch("config.settings.REPLICATE_POLL_INTERVAL", 0), \
+            patch("config.settings.REPLICATE_API_TOKEN", "fake_token"):
+        yield
+
+
+class TestAsyncReplicateBackend:
+    """Création + polling d'une prédiction sur le client HTTP partagé."""
+
+    def test_create_and_poll(self):
+        """La prédiction est créée puis interrogée jusqu'au succès."""
+        transport, log = make_transport(["processing", "processing", "succeeded"])
+        backend = AsyncReplicateBackend(transport=transport)
+
+        async def scenario():
+            output = await backend.run("recraft-ai/recraft-v3", {"prompt": "chat"})
+            client = backend._http()
+            await backend.aclose()
+            return output, client
+
+        output, client = asyncio.run(scenario())
+
+        assert output == "https://replicate.delivery/out.png"
+        assert client.is_closed
+        assert log[0] == ("POST", "/v1/models/recraft-ai/recraft-v3/predictions")
+        assert log[1:4] == [("GET", "/v1/predictions/p1")] * 3
+
+    def test_versioned_model_uses_predictions_endpoint(self):
+        """Un modèle "owner/name:version" passe par POST /predictions avec la version."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(201, json={"id": "p2", "status": "succeeded", "output": ["a"]})
+
+        backend = AsyncReplicateBackend(transport=httpx.MockTransport(handler))
+        output = asyncio.run(backend.run("owner/model:abc123", {"x": 1}))
+
+        assert output == ["a"]
+        assert requests[0].url.path == "/v1/predictions"
+        assert json.loads(requests[0].content) == {"version": "abc123", "input": {"x": 1}}
+        assert requests[0].headers["Authorization"] == "Bearer fake_token"
+
+    def test_get_model(self):
+        """Les métadonnées d'un modèle viennent de GET /models/{owner}/{name}."""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"owner": "owner", "name": "model"})
+
+        backend = AsyncReplicateBackend(transport=httpx.MockTransport(handler))
+
+        assert asyncio.run(backend.get_model("owner/model"))["name"] == "model"
+        assert paths == ["/v1/models/owner/model"]
+
+    def test_failed_prediction_raises(self):
+        """Une prédiction en échec lève ReplicateError avec l'erreur distante."""
+        transport, _ = make_transport(["failed"])
+        backend = AsyncReplicateBackend(transport=transport)
+
+        with pytest.raises(ReplicateError, match="boom"):
+            asyncio.run(backend.run("recraft-ai/recraft-v3", {}))
+
+    def test_rate_limited_create_is_retried(self):
+        """Un 429 à la création est rejoué après Retry-After."""
+        transport, log = make_transport(["succeeded"], create_status=429)
+        backend = AsyncReplicateBackend(transport=transport)
+
+        assert asyncio.run(backend.run("recraft-ai/recraft-v3", {})).endswith("out.png")
+        assert [m for m, _ in log].count("POST") == 2
+
+    def test_timeout_raises(self):
+        """Une prédiction qui ne termine pas expire."""
+        transport, _ = make_transport(iter(lambda: "processing", None))
+        backend = AsyncReplicateBackend(transport=transport)
+
+        async def scenario():
+            prediction = await backend.create_prediction("recraft-ai/recraft-v3", {})
+            return await backend.wait(prediction, timeout=0.05)
+
+        with pytest.raises(ReplicateError, match="timed out"):
+            asyncio.run(scenario())
+
+
+class TestAsyncGeneration:
+    """Le service de génération pilote ses prédictions depuis une seule boucle."""
+
+    def test_dozens_of_predictions_on_one_loop(self, test_universe, fake_replicate):
+        """30 images en vol simultanément sur le thread de la boucle, sans pool de threads."""
+        from services.generation_service import generation_service
+
+        slug = test_universe["slug"]
+        concepts = [f"concept {i}" for i in range(30)]
+        fake_replicate.latency = 0.2
+
+        started = time.perf_counter()
+        with patch.object(generation_service.rate_limiter, "rate", 0):
+            paths = generation_service.generate_all_images(slug, concepts, max_concurrency=30)
+        elapsed = time.perf_counter() - started
+
+        assert len(paths) == 30
+        assert fake_replicate.max_in_flight == 30
+        assert fake_replicate.threads == {"generation-loop"}
+        assert elapsed < 2.0  # ~0.2 s en parallèle contre 6 s en série
+        assert paths[0].read_bytes().startswith(b"fake content of")
+
+    def test_failed_prediction_is_skipped(self, test_universe, fake_replicate):
+        """Un échec de prédiction n'interrompt pas le lot."""
+        from services.generation_service import generation_service, MODELS
+
+        fake_replicate.failures[MODELS["image"]] = ReplicateError("boom")
+        with patch.object(generation_service.rate_limiter, "rate", 0):
+            paths = generation_service.generate_all_images(test_universe["slug"], ["chat", "chien"])
+
+        assert paths == []
+        assert len(fake_replicate.calls) == 2
+
+    def test_sync_wrapper_inside_loop_raises(self):
+        """Appeler un wrapper bloquant depuis la boucle lèverait un interblocage : erreur explicite."""
+        from utils import BackgroundLoop
+
+        loop = BackgroundLoop("test-loop")
+        try:
+            async def nested():
+                return loop.run(asyncio.sleep(0))
+
+            with pytest.raises(RuntimeError, match="inside the loop"):
+                loop.run(nested())
+        finally:
+            loop.close()
+        assert not loop.running
+
+    def test_token_bucket_async_does_not_block_loop(self):
+        """acquire_async attend sans bloquer les autres coroutines."""
+        from utils import TokenBucket
+
+        bucket = TokenBucket(rate=20, capacity=1)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await bucket.acquire_async()
+            started = time.perf_counter()
+            await asyncio.gather(bucket.acquire_async(), ticker())
+            return time.perf_counter() - started
+
+        assert asyncio.run(scenario()) >= 0.04
+        assert len(ticks) == 5
@@ -207,15 +207,16 @@ def test_replicate_environment():
     from config import settings
     assert settings.REPLICATE_API_TOKEN, "REPLICATE_API_TOKEN not configured"
 
-    import replicate
+    import httpx
     try:
         # Test basic API connectivity by listing models
-        models_iter = replicate.models.list()
-        models = []
-        for i, model in enumerate(models_iter):
-            models.append(model)
-            if i >= 4:  # Get first 5 models
-                break
+        response = httpx.get(
+            f"{settings.REPLICATE_API_URL}/models",
+            headers={"Authorization": f"Bearer {settings.REPLICATE_API_TOKEN}"},
+            timeout=30
+        )
+        response.raise_for_status()
+        models = response.json().get("results", [])
         assert len(models) > 0, "Cannot connect to Replicate API"
         print(f"✅ Replicate API connected - found at least {len(models)} models")
     except Exception as e:
@@ -224,18 +225,26 @@ def test_replicate_environment():
 
 def test_replicate_models_available():
     """Test that configured models are available."""
+    import asyncio
     from services.generation_service import MODELS
+    from services.replicate_backend import AsyncReplicateBackend
 
-    import replicate
-    for model_type, model_id in MODELS.items():
+    async def check_models():
+        backend = AsyncReplicateBackend()
         try:
-            # Extract model name (remove version if present)
-            model_name = model_id.split(':')[0]
-            model = replicate.models.get(model_name)
-            assert model is not None, f"Model {model_name} not found"
-            print(f"✅ Model {model_name} ({model_type}) is available")
-        except Exception as e:
-            pytest.fail(f"Model {model_name} ({model_type}) not accessible: {e}")
+            for model_type, model_id in MODELS.items():
+                # Extract model name (remove version if present)
+                model_name = model_id.split(':')[0]
+                try:
+                    model = await backend.get_model(model_name)
+                    assert model, f"Model {model_name} not found"
+                    print(f"✅ Model {model_name} ({model_type}) is available")
+                except Exception as e:
+                    pytest.fail(f"Model {model_name} ({model_type}) not accessible: {e}")
+        finally:
+            await backend.aclose()
+
+    asyncio.run(check_models())
 
 
 if __name__ == "__main__":
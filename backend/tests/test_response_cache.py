@@ -0,0 +1,204 @@
+"""Tests du cache de réponses (LRU, invalidation par tags, stale-while-revalidate)."""
+
+import threading
+import time
+import uuid
+import pytest
+
+from services.response_cache import CachedResponse, ResponseCache, response_cache
+from services.storage_service import storage_service
+
+
+def entry(body=b"{}", etag='"v1"'):
+    return CachedResponse(body, etag)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestResponseCacheUnit:
+    """Comportement du cache indépendamment des routes."""
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(max_entries=2, max_bytes=1000, ttl=60, enabled=True)
+        cache.put("a", entry())
+        cache.put("b", entry())
+        cache.get("a")  # "b" devient le moins récent
+        cache.put("c", entry())
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = ResponseCache(max_entries=10, max_bytes=10, ttl=60, enabled=True)
+        cache.put("a", entry(b"x" * 6))
+        cache.put("b", entry(b"y" * 6))
+
+        snapshot = cache.snapshot()
+        assert snapshot["entries"] == 1
+        assert snapshot["bytes"] == 6
+        assert cache.get("b") is not None
+
+    def test_oversized_body_not_stored(self):
+        cache = ResponseCache(max_entries=10, max_bytes=4, ttl=60, enabled=True)
+        assert not cache.put("a", entry(b"too large"))
+
+    def test_invalidate_by_tag(self):
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=60, enabled=True)
+        cache.put("list", entry(), tags=["universes"])
+        cache.put("jungle", entry(), tags=["univers:jungle"])
+        cache.put("ocean", entry(), tags=["univers:ocean"])
+
+        cache.invalidate_universe("jungle")
+
+        assert cache.get("list") is None
+        assert cache.get("jungle") is None
+        assert cache.get("ocean") is not None
+
+    def test_build_overlapping_invalidation_not_stored(self):
+        """Une réponse construite pendant une invalidation n'est pas mise en cache."""
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=60, enabled=True)
+        generation = cache.generation
+        cache.invalidate("universes")
+
+        assert not cache.put("list", entry(), tags=["universes"], generation=generation)
+        assert cache.get("list") is None
+
+    def test_expired_without_refresh_is_miss(self):
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=0, stale_ttl=60, enabled=True)
+        cache.put("a", entry())
+        assert cache.get("a") is None
+
+    def test_stale_while_revalidate(self):
+        """Une entrée périmée est servie pendant qu'un seul rafraîchissement tourne."""
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=0, stale_ttl=60, enabled=True)
+        cache.put("a", entry(etag='"old"'), tags=["universes"])
+        release = threading.Event()
+        builds = []
+
+        def refresh(db):
+            builds.append(db)
+            release.wait(2)
+            return entry(etag='"new"')
+
+        assert cache.get("a", refresh=refresh).etag == '"old"'
+        assert cache.get("a", refresh=refresh).etag == '"old"'
+        release.set()
+
+        assert wait_for(lambda: cache.snapshot()["refreshes"] == 1)
+        assert len(builds) == 1
+        cache.ttl = 60
+        refreshed = cache.get("a")
+        assert refreshed.etag == '"new"'
+        assert refreshed.tags == {"universes"}
+        assert cache.snapshot()["stale_hits"] == 2
+
+    def test_stale_ttl_exceeded_is_miss(self):
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=0, stale_ttl=0, enabled=True)
+        cache.put("a", entry())
+        assert cache.get("a", refresh=lambda db: entry()) is None
+
+    def test_disabled(self):
+        cache = ResponseCache(enabled=False)
+        assert not cache.put("a", entry())
+        assert cache.get("a") is None
+
+    def test_hit_rate(self):
+        cache = ResponseCache(max_entries=10, max_bytes=1000, ttl=60, enabled=True)
+        cache.get("a")
+        cache.put("a", entry(b"12345"))
+        cache.get("a")
+        cache.get("a")
+
+        snapshot = cache.snapshot()
+        assert snapshot["hits"] == 2
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+        assert snapshot["bytes"] == 5
+
+
+class TestResponseCacheRoutes:
+    """Intégration avec GET /universes et /universes/{slug}."""
+
+    @pytest.fixture
+    def slug(self, client):
+        slug = f"cache-{uuid.uuid4().hex[:8]}"
+        assert client.post("/api/universes", json={"name": "Cache", "slug": slug}).status_code == 201
+        return slug
+
+    def test_hit_skips_database(self, client, slug):
+        """La seconde lecture est servie sans requête SQL, à l'identique."""
+        for url in [f"/api/universes/{slug}", "/api/universes?limit=7"]:
+            first = client.get(url)
+            second = client.get(url)
+
+            assert second.status_code == 200
+            assert int(second.headers["X-Query-Count"]) == 0
+            assert second.json() == first.json()
+            assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_universe_update_invalidates(self, client, slug):
+        client.get(f"/api/universes/{slug}")
+        client.get("/api/universes?limit=100")
+
+        client.patch(f"/api/universes/{slug}", json={"name": "Renamed"})
+
+        assert client.get(f"/api/universes/{slug}").json()["name"] == "Renamed"
+        items = {u["slug"]: u for u in client.get("/api/universes?limit=100").json()["items"]}
+        assert items[slug]["name"] == "Renamed"
+
+    def test_asset_routes_invalidate(self, client, slug):
+        client.get("/api/universes?limit=100")
+        client.get(f"/api/universes/{slug}")
+
+        asset = client.post(f"/api/universes/{slug}/assets", json={"display_name": "Lion"}).json()
+
+        items = {u["slug"]: u for u in client.get("/api/universes?limit=100").json()["items"]}
+        assert items[slug]["asset_count"] == 1
+        assert [a["display_name"] for a in client.get(f"/api/universes/{slug}").json()["assets"]] == ["Lion"]
+
+        client.delete(f"/api/universes/{slug}/assets/{asset['id']}")
+        assert client.get(f"/api/universes/{slug}").json()["assets"] == []
+
+    def test_music_prompt_routes_invalidate(self, client, slug):
+        client.get(f"/api/universes/{slug}")
+
+        client.post(f"/api/universes/{slug}/music-prompts", json={"language": "fr", "prompt": "Berceuse", "lyrics": "Do do"})
+
+        assert [p["language"] for p in client.get(f"/api/universes/{slug}").json()["music_prompts"]] == ["fr"]
+
+    def test_delete_universe_invalidates(self, client, slug):
+        client.get(f"/api/universes/{slug}")
+
+        client.delete(f"/api/universes/{slug}")
+
+        assert client.get(f"/api/universes/{slug}").status_code == 404
+
+    def test_media_write_invalidates(self, client, slug):
+        """Un média écrit via le stockage met à jour les URLs servies."""
+        client.post(f"/api/universes/{slug}/assets", json={"display_name": "Lion", "sort_order": 1})
+        assert client.get(f"/api/universes/{slug}").json()["assets"][0]["image_url"] is None
+
+        storage_service.upload_file(b"png", f"{slug}/asset_001.png")
+
+        assert client.get(f"/api/universes/{slug}").json()["assets"][0]["image_url"] is not None
+
+    def test_metrics_endpoint(self, client, slug):
+        client.delete("/api/metrics/cache")
+        client.get(f"/api/universes/{slug}")
+        client.get(f"/api/universes/{slug}")
+
+        data = client.get("/api/metrics/cache").json()
+
+        assert data["hits"] == 1
+        assert data["misses"] == 1
+        assert data["hit_rate"] == 0.5
+        assert data["entries"] == 1
+        assert data["bytes"] > 0
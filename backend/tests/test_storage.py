@@ -0,0 +1,119 @@
+"""Tests de l'index de dossier du stockage local (résolution d'URL sans stat par fichier)."""
+
+import os
+import uuid
+import pytest
+
+from services.storage_service import StorageService
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """StorageService isolé dans un bucket temporaire."""
+    service = StorageService()
+    service.bucket_path = tmp_path
+    return service
+
+
+@pytest.fixture
+def slug(storage):
+    slug = f"index-{uuid.uuid4().hex[:8]}"
+    storage.create_universe_folder(slug)
+    return slug
+
+
+@pytest.fixture
+def count_scandir(monkeypatch):
+    """Compte les appels à os.scandir."""
+    calls = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        calls.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    return calls
+
+
+class TestStorageIndex:
+    """Index par univers : un scandir, invalidé par les écritures du service."""
+
+    def test_urls_resolved_with_single_scan(self, storage, slug, count_scandir):
+        """Résoudre les URLs de 50 assets ne liste le dossier qu'une fois."""
+        for i in range(50):
+            storage.upload_file(b"png", f"{slug}/asset_{i:03d}.png")
+        storage.upload_file(b"mp4", f"{slug}/asset_000.mp4")
+        count_scandir.clear()
+
+        images = [storage.get_asset_image_url(slug, f"asset_{i:03d}.png") for i in range(50)]
+        videos = [storage.get_asset_video_url(slug, f"asset_{i:03d}.png") for i in range(50)]
+
+        assert all(images)
+        assert videos[0] == f"/storage/buckets/{storage.bucket_name}/{slug}/asset_000.mp4"
+        assert videos[1:] == [None] * 49
+        assert len(count_scandir) == 1
+
+    def test_upload_invalidates(self, storage, slug):
+        """Un fichier uploadé est visible immédiatement."""
+        assert storage.get_thumbnail_url(slug) is None
+
+        storage.upload_file(b"jpg", f"{slug}/thumbnail.jpg")
+
+        assert storage.get_thumbnail_url(slug) is not None
+
+    def test_delete_invalidates(self, storage, slug):
+        """Un fichier supprimé disparaît immédiatement."""
+        storage.upload_file(b"mp3", f"{slug}/fr.mp3")
+        assert storage.get_music_url(slug, "fr") is not None
+
+        assert storage.delete_file(f"{slug}/fr.mp3")
+
+        assert storage.get_music_url(slug, "fr") is None
+
+    def test_write_file_invalidates(self, storage, slug):
+        """Les médias générés (write_file) invalident l'index."""
+        assert storage.get_asset_image_url(slug, "asset_001.png") is None
+
+        storage.write_file(storage.get_asset_image_path(slug, "asset_001.png"), b"png")
+
+        assert storage.get_asset_image_url(slug, "asset_001.png") is not None
+
+    def test_delete_universe_folder_invalidates(self, storage, slug):
+        """Supprimer le dossier vide l'index de l'univers."""
+        storage.upload_file(b"png", f"{slug}/asset_001.png")
+        assert storage.get_asset_image_url(slug, "asset_001.png")
+
+        storage.delete_universe_folder(slug)
+
+        assert storage.get_universe_index(slug) == frozenset()
+
+    def test_external_change_visible_after_ttl(self, storage, slug):
+        """Un fichier ajouté hors du service apparaît une fois le TTL expiré."""
+        assert storage.get_asset_image_url(slug, "asset_001.png") is None
+        (storage.get_universe_path(slug) / "asset_001.png").write_bytes(b"png")
+
+        assert storage.get_asset_image_url(slug, "asset_001.png") is None
+
+        storage.index_ttl = 0.0
+        assert storage.get_asset_image_url(slug, "asset_001.png") is not None
+
+    def test_missing_universe(self, storage):
+        """Un univers sans dossier n'a aucun fichier."""
+        assert storage.get_universe_index("missing") == frozenset()
+        assert storage.get_thumbnail_url("missing") is None
+
+    def test_stale_scan_not_cached(self, storage, slug, monkeypatch):
+        """Un listing concurrent d'une écriture n'est pas mis en cache."""
+        real_scandir = os.scandir
+
+        def racing_scandir(path):
+            entries = real_scandir(path)
+            storage.upload_file(b"png", f"{slug}/asset_001.png")
+            return entries
+
+        monkeypatch.setattr(os, "scandir", racing_scandir)
+        storage.get_universe_index(slug)
+        monkeypatch.setattr(os, "scandir", real_scandir)
+
+        assert storage.get_asset_image_url(slug, "asset_001.png") is not None
@@ -0,0 +1,423 @@
+"""Tests du SupabaseService contre un client Supabase factice (pas de réseau)."""
+
+import pytest
+
+from tests.fake_supabase import FakeSupabaseClient
+
+
+def seed_universe(client: FakeSupabaseClient, slug="jungle", asset_count=50):
+    """Crée un univers distant complet avec N assets."""
+    client.tables["univers"] = [{"id": 1, "slug": slug, "name": "Jungle", "is_public": True}]
+    client.tables["univers_prompts"] = [{"id": "p1", "univers_id": 1, "default_image_prompt": "img"}]
+    client.tables["univers_translations"] = [
+        {"id": f"t-{lang}", "univers_id": 1, "language": lang, "name": f"Jungle {lang}"}
+        for lang in ["fr", "en"]
+    ]
+    client.tables["univers_music_prompts"] = [
+        {"id": "m-fr", "univers_id": 1, "language": "fr", "prompt": "doux", "lyrics": "la la"}
+    ]
+    client.tables["univers_assets"] = [
+        {"id": f"a{i}", "univers_id": 1, "sort_order": asset_count - i,
+         "image_name": f"{i:02d}.png", "display_name": f"asset {i}"}
+        for i in range(asset_count)
+    ]
+    client.tables["univers_assets_prompts"] = [
+        {"id": f"ap{i}", "asset_id": f"a{i}", "custom_image_prompt": f"prompt {i}"}
+        for i in range(0, asset_count, 2)
+    ]
+    client.tables["univers_assets_translations"] = [
+        {"id": f"at{i}-{lang}", "asset_id": f"a{i}", "language": lang, "display_name": f"{lang} {i}"}
+        for i in range(asset_count) for lang in ["fr", "en", "de"]
+    ]
+
+
+@pytest.fixture
+def supabase():
+    """SupabaseService branché sur un client factice."""
+    from services.supabase_service import SupabaseService
+
+    service = SupabaseService()
+    service.client = FakeSupabaseClient()
+    service._embedded_select_supported = True
+    seed_universe(service.client)
+    return service
+
+
+def assert_full_univers_shape(data):
+    """Forme attendue par SyncService.pull_universe."""
+    assert set(data) == {"univers", "prompts", "translations", "music_prompts", "assets"}
+    assert data["univers"]["slug"] == "jungle"
+    assert "univers_assets" not in data["univers"]
+    assert data["prompts"]["default_image_prompt"] == "img"
+    assert len(data["translations"]) == 2
+    assert len(data["music_prompts"]) == 1
+
+    assets = data["assets"]
+    assert len(assets) == 50
+    assert [a["sort_order"] for a in assets] == sorted(a["sort_order"] for a in assets)
+    by_id = {a["id"]: a for a in assets}
+    assert by_id["a0"]["prompts"]["custom_image_prompt"] == "prompt 0"
+    assert by_id["a1"]["prompts"] is None
+    assert len(by_id["a1"]["translations"]) == 3
+    assert "univers_assets_translations" not in by_id["a1"]
+
+
+class TestGetFullUnivers:
+    """Récupération d'un univers complet sans N+1."""
+
+    def test_embedded_single_request(self, supabase):
+        """Le select imbriqué ne coûte qu'une requête."""
+        data = supabase.get_full_univers("jungle")
+
+        assert_full_univers_shape(data)
+        assert supabase.client.count() == 1
+
+    def test_bulk_fallback_constant_requests(self, supabase):
+        """Sans relations embarquées : une requête par table, quel que soit le nombre d'assets."""
+        from postgrest.exceptions import APIError
+
+        original_table = supabase.client.table
+
+        def table(name):
+            query = original_table(name)
+            original_select = query.select
+
+            def select(columns="*", **kwargs):
+                if "(" in columns:
+                    raise APIError({"code": "PGRST200", "message": "no relationship"})
+                return original_select(columns, **kwargs)
+
+            query.select = select
+            return query
+
+        supabase.client.table = table
+        data = supabase.get_full_univers("jungle")
+
+        assert_full_univers_shape(data)
+        assert supabase.client.count() == 7
+        assert supabase._embedded_select_supported is False
+
+    def test_not_found(self, supabase):
+        """Un slug inconnu renvoie None."""
+        assert supabase.get_full_univers("missing") is None
+
+
+@pytest.fixture
+def sync(supabase):
+    """SyncService branché sur le SupabaseService factice."""
+    from services.sync_service import SyncService
+
+    service = SyncService()
+    service.supabase = supabase
+    return service
+
+
+def create_local_assets(client, slug, count):
+    """Crée N assets locaux avec prompts et traductions via l'API."""
+    for i in range(count):
+        response = client.post(f"/api/universes/{slug}/assets", json={
+            "display_name": f"asset {i}",
+            "sort_order": i + 1,
+            "custom_image_prompt": f"prompt {i}",
+            "translations": {"fr": f"fr {i}", "en": f"en {i}", "de": f"de {i}"}
+        })
+        assert response.status_code == 201
+
+
+class TestBulkPush:
+    """Push d'un univers en O(tables) requêtes."""
+
+    @pytest.mark.parametrize("asset_count", [5, 40])
+    def test_push_request_count_independent_of_assets(self, client, test_universe, sync, asset_count):
+        """Le nombre de requêtes PostgREST ne dépend pas du nombre d'assets."""
+        from database import SessionLocal
+
+        slug = test_universe["slug"]
+        create_local_assets(client, slug, asset_count)
+        fake = sync.supabase.client
+        fake.reset_requests()
+
+        db = SessionLocal()
+        try:
+            result = sync.push_universe(db, slug)
+        finally:
+            db.close()
+
+        assert result.success, result.errors
+        db_requests = [r for r in fake.requests if r[0] != "storage"]
+        assert len(db_requests) <= 10  # Dont la résolution des IDs de traductions
+
+        remote_id = next(u["id"] for u in fake.tables["univers"] if u["slug"] == slug)
+        remote_assets = [a for a in fake.tables["univers_assets"] if a["univers_id"] == remote_id]
+        asset_ids = {a["id"] for a in remote_assets}
+        assert len(remote_assets) == asset_count
+        assert len([p for p in fake.tables["univers_assets_prompts"] if p["asset_id"] in asset_ids]) == asset_count
+        assert len([t for t in fake.tables["univers_assets_translations"] if t["asset_id"] in asset_ids]) == asset_count * 3
+
+    def test_translation_upsert_resolves_ids(self, supabase):
+        """Sans contrainte unique (asset_id, language) : IDs résolus par un SELECT groupé, upsert sur id."""
+        supabase.upsert_asset_translation("x1", "en", "first")
+        supabase.client.reset_requests()
+        supabase.upsert_assets_translations([
+            {"asset_id": "x1", "language": "en", "display_name": "second"},
+            {"asset_id": "x2", "language": "en", "display_name": "new"}
+        ])
+
+        assert supabase.client.requests == [
+            ("univers_assets_translations", "select"),
+            ("univers_assets_translations", "upsert")
+        ]
+        rows = [t for t in supabase.client.tables["univers_assets_translations"] if t["asset_id"] in ("x1", "x2")]
+        assert sorted((r["asset_id"], r["display_name"]) for r in rows) == [("x1", "second"), ("x2", "new")]
+
+    def test_universe_translation_updated_in_place(self, supabase):
+        """Une traduction d'univers réécrite garde son id (pas de doublon)."""
+        first = supabase.upsert_univers_translation(2, "fr", "Ferme")
+        second = supabase.upsert_univers_translation(2, "fr", "La ferme")
+
+        rows = [t for t in supabase.client.tables["univers_translations"] if t["univers_id"] == 2]
+        assert [r["name"] for r in rows] == ["La ferme"]
+        assert second["id"] == first["id"]
+
+
+def push(sync, slug):
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return sync.push_universe(db, slug)
+    finally:
+        db.close()
+
+
+def pull(sync, slug):
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return sync.pull_universe(db, slug)
+    finally:
+        db.close()
+
+
+def datetime_now_iso():
+    from datetime import datetime, timezone
+    return datetime.now(timezone.utc).isoformat()
+
+
+def seed_remote_assets(client, slug, count, updated_at="2024-01-01T00:00:00+00:00"):
+    """Univers distant avec slug unique et N assets horodatés."""
+    import uuid
+
+    client.tables["univers"] = [{"id": 7, "slug": slug, "name": "Remote", "is_public": True}]
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    client.tables["univers_assets"] = [
+        {"id": asset_id, "univers_id": 7, "sort_order": i, "image_name": f"{i:02d}.png",
+         "display_name": f"remote {i}", "updated_at": updated_at}
+        for i, asset_id in enumerate(ids)
+    ]
+    client.tables["univers_assets_translations"] = [
+        {"id": f"t-{asset_id}", "asset_id": asset_id, "language": "en", "display_name": f"en {i}"}
+        for i, asset_id in enumerate(ids)
+    ]
+    return ids
+
+
+class TestIncrementalSync:
+    """Sync incrémentale des assets (watermarks updated_at / last_synced_at)."""
+
+    def test_push_only_changed_assets(self, client, test_universe, sync):
+        """Un second push n'écrit aucun asset ; seuls les assets modifiés/supprimés repartent."""
+        slug = test_universe["slug"]
+        create_local_assets(client, slug, 6)
+        fake = sync.supabase.client
+
+        first = push(sync, slug)
+        assert first.success, first.errors
+        assert first.rows.inserted == 6
+
+        fake.reset_requests()
+        second = push(sync, slug)
+        assert second.rows.skipped == 6
+        assert second.rows.inserted == second.rows.updated == second.rows.deleted == 0
+        assert fake.count("univers_assets") == 1  # version check only
+
+        assets = client.get(f"/api/universes/{slug}/assets").json()
+        client.patch(f"/api/universes/{slug}/assets/{assets[0]['id']}", json={"translations": {"en": "edited"}})
+        client.delete(f"/api/universes/{slug}/assets/{assets[1]['id']}")
+
+        third = push(sync, slug)
+        assert (third.rows.updated, third.rows.deleted, third.rows.skipped) == (1, 1, 4)
+        remote_ids = {a["id"] for a in fake.tables["univers_assets"]}
+        assert assets[1]["id"] not in remote_ids
+        assert any(t["asset_id"] == assets[0]["id"] and t["display_name"] == "edited"
+                   for t in fake.tables["univers_assets_translations"])
+
+    def test_pull_only_changed_assets(self, client, sync):
+        """Le pull n'applique que les lignes distantes modifiées et conserve les autres."""
+        import uuid
+        from database import SessionLocal, UniversAsset
+
+        slug = f"remote-{uuid.uuid4().hex[:8]}"
+        fake = sync.supabase.client
+        ids = seed_remote_assets(fake, slug, 5)
+
+        assert pull(sync, slug).rows.inserted == 5
+        second = pull(sync, slug)
+        assert second.rows.skipped == 5 and second.rows.updated == 0
+
+        fake.tables["univers_assets"][0].update(display_name="renamed", updated_at="2999-01-01T00:00:00Z")
+        fake.tables["univers_assets"] = [a for a in fake.tables["univers_assets"] if a["id"] != ids[4]]
+
+        third = pull(sync, slug)
+        assert (third.rows.updated, third.rows.deleted, third.rows.skipped) == (1, 1, 3)
+
+        db = SessionLocal()
+        try:
+            local = {a.id: a for a in db.query(UniversAsset).filter(UniversAsset.id.in_(ids)).all()}
+            assert local[ids[0]].display_name == "renamed"
+            assert ids[4] not in local
+            assert [t.display_name for t in local[ids[1]].translations] == ["en 1"]
+        finally:
+            db.close()
+        client.delete(f"/api/universes/{slug}")
+
+    def test_timestamp_merge_keeps_newer_local_edit(self, client, sync, monkeypatch):
+        """timestamp_merge : une modification locale plus récente n'est pas écrasée par le pull."""
+        import uuid
+        from config import settings
+
+        monkeypatch.setattr(settings, "SYNC_MODE", "timestamp_merge")
+        slug = f"remote-{uuid.uuid4().hex[:8]}"
+        fake = sync.supabase.client
+        ids = seed_remote_assets(fake, slug, 2)
+        pull(sync, slug)
+
+        # Remote edit (older), then local edit (newer)
+        fake.tables["univers_assets"][0].update(display_name="remote edit", updated_at=datetime_now_iso())
+        client.patch(f"/api/universes/{slug}/assets/{ids[0]}", json={"display_name": "local edit"})
+        client.post(f"/api/universes/{slug}/assets", json={"display_name": "local only"})
+
+        result = pull(sync, slug)
+        assert result.rows.conflicts == 1
+        assets = {a["display_name"] for a in client.get(f"/api/universes/{slug}/assets").json()}
+        assert {"local edit", "local only", "remote 1"} == assets
+        client.delete(f"/api/universes/{slug}")
+
+    def test_last_write_wins_overwrites_local(self, client, sync):
+        """last_write_wins : le pull écrase la modification locale et supprime les assets locaux."""
+        import uuid
+
+        slug = f"remote-{uuid.uuid4().hex[:8]}"
+        fake = sync.supabase.client
+        ids = seed_remote_assets(fake, slug, 2)
+        pull(sync, slug)
+
+        client.patch(f"/api/universes/{slug}/assets/{ids[0]}", json={"display_name": "local edit"})
+        client.post(f"/api/universes/{slug}/assets", json={"display_name": "local only"})
+
+        result = pull(sync, slug)
+        assert (result.rows.updated, result.rows.deleted) == (1, 1)
+        assets = {a["display_name"] for a in client.get(f"/api/universes/{slug}/assets").json()}
+        assert assets == {"remote 0", "remote 1"}
+        client.delete(f"/api/universes/{slug}")
+
+
+def seed_remote_universes(client, count, assets_per_universe=3):
+    """N univers distants (slugs uniques) avec assets et un fichier média par asset."""
+    import uuid
+
+    prefix = uuid.uuid4().hex[:6]
+    slugs = [f"init-{prefix}-{i}" for i in range(count)]
+    client.tables["univers"] = [
+        {"id": 100 + i, "slug": slug, "name": slug, "is_public": True} for i, slug in enumerate(slugs)
+    ]
+    client.tables["univers_assets"] = [
+        {"id": f"{slug}-a{j}", "univers_id": 100 + i, "sort_order": j,
+         "image_name": f"{j:02d}.png", "display_name": f"asset {j}"}
+        for i, slug in enumerate(slugs) for j in range(assets_per_universe)
+    ]
+    for slug in slugs:
+        for j in range(assets_per_universe):
+            client.files[f"{slug}/{j:02d}.png"] = b"png"
+    return slugs
+
+
+@pytest.fixture
+def remote_universes(client, sync):
+    """Univers distants, supprimés localement (DB + fichiers) après le test."""
+    from services.storage_service import storage_service
+
+    slugs = seed_remote_universes(sync.supabase.client, 6)
+    yield slugs
+    for slug in slugs:
+        client.delete(f"/api/universes/{slug}")
+        storage_service.delete_universe_folder(slug)
+
+
+class TestPullAll:
+    """Init sync concurrente (une session par univers)."""
+
+    def test_parallel_pull_reports_real_counts(self, sync, remote_universes, monkeypatch):
+        """Les univers sont tirés en parallèle et les fichiers téléchargés sont comptés."""
+        import threading
+        import time
+
+        in_flight, peak, lock = [0], [0], threading.Lock()
+        original = sync.supabase.get_full_univers
+
+        def slow_get_full_univers(slug):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            try:
+                return original(slug)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        monkeypatch.setattr(sync.supabase, "get_full_univers", slow_get_full_univers)
+
+        result = sync.pull_all(max_workers=3)
+
+        assert result.success, result.errors
+        assert result.universes_synced == 6
+        assert result.assets_synced == 18
+        assert result.files_downloaded == 18
+        assert 1 < peak[0] <= 3
+
+    def test_failing_universe_does_not_poison_others(self, client, sync, remote_universes, monkeypatch):
+        """Un univers en erreur est reporté sans empêcher les autres d'être écrits."""
+        original = sync.supabase.get_full_univers
+        bad = remote_universes[2]
+
+        def flaky_get_full_univers(slug):
+            if slug == bad:
+                raise RuntimeError("boom")
+            return original(slug)
+
+        monkeypatch.setattr(sync.supabase, "get_full_univers", flaky_get_full_univers)
+
+        result = sync.pull_all(max_workers=4)
+
+        assert result.universes_synced == 5
+        assert any(error.startswith(bad) and "boom" in error for error in result.errors)
+        for slug in remote_universes:
+            expected = 404 if slug == bad else 200
+            assert client.get(f"/api/universes/{slug}").status_code == expected
+
+    def test_progress_reported_to_job(self, sync, remote_universes):
+        """Avec un job_id, chaque univers tiré avance le job d'une étape."""
+        from database import SessionLocal
+        from services.job_service import job_service
+
+        db = SessionLocal()
+        try:
+            job = job_service.create_job(db, "sync_pull_all")
+            sync.pull_all(job_id=job.id)
+            job_service.flush()  # Progress is written in batches
+            db.refresh(job)
+            assert (job.current_step, job.total_steps, job.progress) == (6, 6, 100)
+        finally:
+            db.close()
@@ -0,0 +1,253 @@
+"""Tests du moteur de transfert média (bucket Storage factice, pas de réseau)."""
+
+import threading
+import time
+import uuid
+import pytest
+
+from tests.fake_supabase import FakeSupabaseClient
+
+
+class FlakyBucket:
+    """Bucket factice qui échoue N fois par fichier puis réussit, avec latence."""
+
+    def __init__(self, bucket, failures=0, latency=0.0):
+        self.bucket = bucket
+        self.failures = failures
+        self.latency = latency
+        self.attempts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _call(self, path, fn):
+        with self.lock:
+            self.attempts[path] = self.attempts.get(path, 0) + 1
+            attempt = self.attempts[path]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if attempt <= self.failures:
+                raise ConnectionError("connection reset")
+            return fn()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def list(self, path=None, options=None):
+        return self.bucket.list(path, options)
+
+    def download(self, path, options=None):
+        return self._call(path, lambda: self.bucket.download(path))
+
+    def upload(self, path, file, file_options=None):
+        return self._call(path, lambda: self.bucket.upload(path, file, file_options))
+
+
+@pytest.fixture
+def slug():
+    """Slug unique, dossier local supprimé après le test."""
+    from services.storage_service import storage_service
+
+    value = f"test-transfer-{uuid.uuid4().hex[:8]}"
+    yield value
+    storage_service.delete_universe_folder(value)
+
+
+@pytest.fixture
+def fake():
+    return FakeSupabaseClient()
+
+
+class TestTransferEngine:
+    """Pool de transfert, retry et statistiques."""
+
+    def test_parallel_download_with_stats(self, fake, slug):
+        """Les fichiers sont téléchargés en parallèle et les stats agrégées."""
+        from services.storage_service import storage_service
+        from services.transfer_service import TransferEngine
+
+        for i in range(8):
+            fake.files[f"{slug}/{i:02d}_asset.png"] = b"x" * (100 + i)
+        bucket = FlakyBucket(fake.storage.from_("univers"), latency=0.02)
+
+        engine = TransferEngine(max_workers=4, max_retries=0)
+        files = engine.list_remote_files(bucket, [slug])
+        stats = engine.download_files(bucket, [f["path"] for f in files])
+
+        assert stats.files == 8
+        assert stats.failed == 0
+        assert stats.bytes == sum(100 + i for i in range(8))
+        assert stats.files_per_second > 0 and stats.bytes_per_second > 0
+        assert 1 < bucket.max_in_flight <= 4
+        assert storage_service.download_file(f"{slug}/03_asset.png") == b"x" * 103
+
+    def test_retry_with_backoff(self, fake, slug):
+        """Un fichier qui échoue deux fois réussit à la troisième tentative."""
+        from services.transfer_service import TransferEngine
+
+        fake.files[f"{slug}/thumbnail.jpg"] = b"jpg"
+        bucket = FlakyBucket(fake.storage.from_("univers"), failures=2)
+
+        stats = TransferEngine(max_workers=2, max_retries=3, backoff_base=0.001)\
+            .download_files(bucket, [f"{slug}/thumbnail.jpg"])
+
+        assert stats.files == 1
+        assert stats.retries == 2
+        assert bucket.attempts[f"{slug}/thumbnail.jpg"] == 3
+
+    def test_gives_up_after_max_retries(self, fake, slug):
+        """Au-delà du nombre de retries, l'échec est compté et reporté."""
+        from services.transfer_service import TransferEngine
+
+        fake.files[f"{slug}/fr.mp3"] = b"mp3"
+        bucket = FlakyBucket(fake.storage.from_("univers"), failures=10)
+
+        stats = TransferEngine(max_workers=1, max_retries=1, backoff_base=0.001)\
+            .download_files(bucket, [f"{slug}/fr.mp3"])
+
+        assert stats.files == 0
+        assert stats.failed == 1
+        assert "connection reset" in stats.errors[0]
+
+    def test_upload_overwrites_remote(self, fake, slug):
+        """L'upload écrase l'objet distant sans suppression préalable."""
+        from services.storage_service import storage_service
+        from services.transfer_service import TransferEngine
+
+        storage_service.upload_file(b"new", f"{slug}/00_cat.png")
+        fake.files[f"{slug}/00_cat.png"] = b"old"
+        bucket = fake.storage.from_("univers")
+
+        path = storage_service.get_universe_path(slug) / "00_cat.png"
+        stats = TransferEngine(max_workers=2).upload_files(bucket, [path])
+
+        assert stats.files == 1 and stats.bytes == 3
+        assert fake.files[f"{slug}/00_cat.png"] == b"new"
+        assert ("storage", "remove") not in fake.requests
+
+
+@pytest.fixture
+def delta(fake):
+    """SyncService branché sur un Supabase factice + session DB."""
+    from database import SessionLocal
+    from services.supabase_service import SupabaseService
+    from services.sync_service import SyncService
+
+    supabase = SupabaseService()
+    supabase.client = fake
+    service = SyncService()
+    service.supabase = supabase
+    db = SessionLocal()
+    yield service, db
+    db.close()
+
+
+def storage_requests(fake, op):
+    return len([r for r in fake.requests if r == ("storage", op)])
+
+
+class TestDeltaSync:
+    """Sync média différentielle basée sur le manifeste."""
+
+    def test_push_only_changed_files(self, delta, fake, slug):
+        """Un second push sans changement ne transfère rien ; seul le fichier modifié repart."""
+        from services.storage_service import storage_service
+
+        sync, db = delta
+        for i in range(5):
+            storage_service.upload_file(f"image {i}".encode(), f"{slug}/{i:02d}_asset.png")
+
+        first = sync._upload_universe_files(db, slug)
+        assert first.files == 5 and first.skipped == 0
+
+        fake.reset_requests()
+        second = sync._upload_universe_files(db, slug)
+        assert second.files == 0 and second.skipped == 5
+        assert storage_requests(fake, "upload") == 0
+
+        storage_service.upload_file(b"changed", f"{slug}/02_asset.png")
+        third = sync._upload_universe_files(db, slug)
+        assert third.files == 1 and third.skipped == 4
+        assert fake.files[f"{slug}/02_asset.png"] == b"changed"
+
+    def test_scan_rehashes_only_modified_files(self, delta, slug, monkeypatch):
+        """Seuls les fichiers dont la taille/mtime a changé sont re-hachés."""
+        from services.manifest_service import ManifestService, manifest_service
+        from services.storage_service import storage_service
+
+        sync, db = delta
+        for i in range(4):
+            storage_service.upload_file(b"x" * i, f"{slug}/{i}.png")
+
+        hashed = []
+        original = ManifestService.hash_file
+        monkeypatch.setattr(manifest_service, "hash_file", lambda p: hashed.append(p.name) or original(p))
+
+        manifest_service.scan(db, slug)
+        assert len(hashed) == 4
+
+        hashed.clear()
+        storage_service.upload_file(b"new content", f"{slug}/1.png")
+        entries = manifest_service.scan(db, slug)
+        assert hashed == ["1.png"]
+        assert entries[f"{slug}/1.png"].sha256 == ManifestService.hash_file(
+            storage_service.get_universe_path(slug) / "1.png"
+        )
+
+    def test_push_deletes_only_removed_files(self, delta, fake, slug):
+        """Un fichier supprimé localement est supprimé à distance, les autres restent."""
+        from services.storage_service import storage_service
+
+        sync, db = delta
+        storage_service.upload_file(b"a", f"{slug}/a.png")
+        storage_service.upload_file(b"b", f"{slug}/b.png")
+        fake.files[f"{slug}/remote_only.png"] = b"r"
+        sync._upload_universe_files(db, slug)
+
+        storage_service.delete_file(f"{slug}/a.png")
+        stats = sync._upload_universe_files(db, slug)
+
+        assert stats.deleted == 1
+        assert f"{slug}/a.png" not in fake.files
+        assert f"{slug}/b.png" in fake.files
+        assert f"{slug}/remote_only.png" in fake.files
+
+    def test_pull_only_changed_files(self, delta, fake, slug):
+        """Le pull ne retélécharge que les objets dont l'eTag a changé et supprime les retirés."""
+        from services.storage_service import storage_service
+
+        sync, db = delta
+        for i in range(4):
+            fake.files[f"{slug}/{i}.png"] = f"remote {i}".encode()
+
+        first = sync._download_universe_files(db, slug)
+        assert first.files == 4
+
+        fake.reset_requests()
+        second = sync._download_universe_files(db, slug)
+        assert second.files == 0 and second.skipped == 4
+        assert storage_requests(fake, "download") == 0
+
+        fake.files[f"{slug}/1.png"] = b"remote 1 v2"
+        del fake.files[f"{slug}/3.png"]
+        third = sync._download_universe_files(db, slug)
+
+        assert third.files == 1 and third.deleted == 1
+        assert storage_service.download_file(f"{slug}/1.png") == b"remote 1 v2"
+        assert not storage_service.file_exists(f"{slug}/3.png")
+
+    def test_pull_restores_locally_modified_file(self, delta, fake, slug):
+        """Une copie locale modifiée est écrasée par le pull (la source gagne)."""
+        from services.storage_service import storage_service
+
+        sync, db = delta
+        fake.files[f"{slug}/fr.mp3"] = b"remote"
+        sync._download_universe_files(db, slug)
+
+        storage_service.upload_file(b"local edit", f"{slug}/fr.mp3")
+        stats = sync._download_universe_files(db, slug)
+
+        assert stats.files == 1
+        assert storage_service.download_file(f"{slug}/fr.mp3") == b"remote"
@@ -0,0 +1,211 @@
+"""Tests pour la mémoire de traduction (cache SQLite + LRU)."""
+
+import uuid
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def cache():
+    """Cache de traduction isolé (petit LRU pour tester l'éviction)."""
+    from services.translation_cache import TranslationCache
+    return TranslationCache(memory_size=2, max_entries=1000, ttl_days=30)
+
+
+class TestTranslationCache:
+    """Tests du cache de traduction."""
+
+    def test_miss_then_hit(self, cache):
+        """Un texte inconnu est un miss, puis un hit après stockage."""
+        text = f"bonjour {uuid.uuid4().hex[:6]}"
+        assert cache.get(text, "fr", "en") is None
+
+        cache.put(text, "fr", "en", "hello")
+        assert cache.get(text, "fr", "en") == "hello"
+
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_normalized_key(self, cache):
+        """Espaces superflus et casse des langues ne changent pas la clé."""
+        text = f"chat {uuid.uuid4().hex[:6]}"
+        cache.put(f"  {text}  ", "FR", "EN", "cat")
+        assert cache.get(text.replace(" ", "   "), "fr", "en") == "cat"
+
+    def test_multiline_lyrics_keep_line_breaks(self, cache):
+        """Des paroles qui ne diffèrent que par leurs retours à la ligne ont chacune leur entrée."""
+        tag = uuid.uuid4().hex[:6]
+        cache.put(f"la la {tag}\nle chat\nle chien", "fr", "en", "LA LA\nTHE CAT\nTHE DOG")
+
+        assert cache.get(f"la la {tag} le chat le chien", "fr", "en") is None
+        assert cache.get(f"la la {tag}\n\nle chat le chien", "fr", "en") is None
+        assert cache.get(f"  la la {tag} \r\nle   chat\nle chien\n", "fr", "en") == "LA LA\nTHE CAT\nTHE DOG"
+
+    def test_sqlite_backs_lru(self, cache):
+        """Une entrée sortie du LRU est retrouvée dans SQLite."""
+        texts = [f"mot {i} {uuid.uuid4().hex[:6]}" for i in range(3)]
+        for i, text in enumerate(texts):
+            cache.put(text, "fr", "de", f"wort {i}")
+
+        # Le premier a été évincé de la mémoire (taille 2)
+        assert cache.get(texts[0], "fr", "de") == "wort 0"
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_expired_entry_is_miss(self, cache):
+        """Une entrée plus vieille que le TTL est traitée comme un miss."""
+        text = f"vieux {uuid.uuid4().hex[:6]}"
+        cache.put(text, "fr", "it", "vecchio")
+
+        with patch.object(cache, "_is_expired", return_value=True):
+            assert cache.get(text, "fr", "it") is None
+
+
+class TestTranslationRoutes:
+    """Tests des routes de traduction avec le cache."""
+
+    def test_translate_text_served_from_cache(self, client):
+        """Une traduction en cache est servie sans appel réseau ni token Replicate."""
+        from services.translation_cache import translation_cache
+
+        text = f"maison {uuid.uuid4().hex[:6]}"
+        translation_cache.put(text, "fr", "en", "house")
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            response = client.post("/api/generate/translate-text", json={
+                "text": text, "source": "fr", "target": "en"
+            })
+            mock_translator.assert_not_called()
+
+        assert response.status_code == 200
+        assert response.json()["translated"] == "house"
+
+    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
+    def test_translate_text_populates_cache(self, client):
+        """Un miss appelle le traducteur une seule fois puis le cache répond."""
+        text = f"arbre {uuid.uuid4().hex[:6]}"
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            mock_translator.return_value.translate.return_value = "tree"
+            for _ in range(2):
+                response = client.post("/api/generate/translate-text", json={
+                    "text": text, "source": "fr", "target": "en"
+                })
+                assert response.json()["translated"] == "tree"
+            assert mock_translator.return_value.translate.call_count == 1
+
+    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
+    def test_lyrics_line_layout_not_shared(self, client, test_universe):
+        """Deux paroles identiques sauf pour les retours à la ligne sont traduites séparément."""
+        tag = uuid.uuid4().hex[:6]
+        url = f"/api/generate/{test_universe['slug']}/lyrics/en"
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            mock_translator.return_value.translate.side_effect = lambda text: text.upper()
+            split = client.post(url, json={"lyrics": f"la la {tag}\nle chat"}).json()["lyrics"]
+            joined = client.post(url, json={"lyrics": f"la la {tag} le chat"}).json()["lyrics"]
+
+        assert split == f"LA LA {tag.upper()}\nLE CHAT"
+        assert joined == f"LA LA {tag.upper()} LE CHAT"
+
+    @patch('config.settings.REPLICATE_API_TOKEN', 'fake_token')
+    def test_translate_text_miss_counted_once(self, client):
+        """Un miss n'est compté qu'une fois (pas de double lecture route + service)."""
+        from services.translation_cache import translation_cache
+
+        text = f"pomme {uuid.uuid4().hex[:6]}"
+        before = translation_cache.stats()["misses"]
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            mock_translator.return_value.translate.return_value = "apple"
+            client.post("/api/generate/translate-text", json={"text": text, "source": "fr", "target": "en"})
+
+        assert translation_cache.stats()["misses"] == before + 1
+
+    @patch('config.settings.REPLICATE_API_TOKEN', '')
+    def test_translate_text_miss_without_ai(self, client):
+        """Sans IA configurée, un miss renvoie 503 sans appeler le traducteur."""
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            response = client.post("/api/generate/translate-text", json={
+                "text": f"poire {uuid.uuid4().hex[:6]}", "source": "fr", "target": "en"
+            })
+            mock_translator.return_value.translate.assert_not_called()
+
+        assert response.status_code == 503
+
+    def test_translation_cache_stats(self, client):
+        """L'endpoint de statistiques expose les compteurs."""
+        response = client.get("/api/generate/translation-cache/stats")
+        assert response.status_code == 200
+        data = response.json()
+        for field in ["hits", "misses", "hit_rate", "stored_entries"]:
+            assert field in data
+
+
+class TestBatchTranslation:
+    """Tests du moteur de traduction par lots (backend local hors-ligne)."""
+
+    @pytest.fixture
+    def service(self):
+        """Service de traduction avec backend local et sans cache."""
+        from services.translation_service import TranslationService, LocalTranslatorBackend
+        return TranslationService(backend=LocalTranslatorBackend(), cache=None)
+
+    def test_one_batch_per_language(self, service):
+        """Chaque langue cible coûte un seul appel backend."""
+        concepts = ["chat", "chien", "vache"]
+        translations = service.translate_concepts(concepts, source_lang="fr")
+
+        assert translations["fr"] == concepts
+        assert translations["en"] == ["[en] chat", "[en] chien", "[en] vache"]
+        assert set(translations) == {"fr", "en", "es", "it", "de"}
+        assert service.backend.calls == 4
+
+    def test_failed_items_fall_back_to_original(self, service):
+        """Un élément non traduit garde le texte original."""
+        with patch.object(service.backend, "translate_batch", return_value=["cat", None]):
+            assert service.translate_batch(["chat", "chien"], "fr", "en") == ["cat", "chien"]
+
+        with patch.object(service.backend, "translate_batch", side_effect=RuntimeError("offline")):
+            assert service.translate_batch(["chat"], "fr", "en") == ["chat"]
+
+    def test_cache_hits_skip_backend(self, cache):
+        """Seuls les miss du cache partent au backend."""
+        from services.translation_service import TranslationService, LocalTranslatorBackend
+
+        known = f"connu {uuid.uuid4().hex[:6]}"
+        unknown = f"inconnu {uuid.uuid4().hex[:6]}"
+        cache.put(known, "fr", "en", "known")
+
+        backend = LocalTranslatorBackend()
+        service = TranslationService(backend=backend, cache=cache)
+        with patch.object(backend, "translate_batch", wraps=backend.translate_batch) as spy:
+            assert service.translate_batch([known, unknown], "fr", "en") == ["known", f"[en] {unknown}"]
+            spy.assert_called_once_with([unknown], "fr", "en")
+
+    def test_backend_without_translate_rejected(self):
+        """Un backend incomplet échoue dès l'instanciation."""
+        from services.translation_service import TranslatorBackend
+
+        class Incomplete(TranslatorBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_google_joined_payload_split(self):
+        """Le backend Google envoie un seul texte joint et le redécoupe."""
+        from services.translation_service import GoogleTranslatorBackend
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            mock_translator.return_value.translate.return_value = "cat\ndog"
+            assert GoogleTranslatorBackend().translate_batch(["chat", "chien"], "fr", "en") == ["cat", "dog"]
+            assert mock_translator.return_value.translate.call_count == 1
+
+    def test_google_mismatched_split_falls_back_per_item(self):
+        """Si le découpage ne correspond pas, chaque élément est traduit seul."""
+        from services.translation_service import GoogleTranslatorBackend
+
+        with patch("services.translation_service.GoogleTranslator") as mock_translator:
+            mock_translator.return_value.translate.side_effect = ["cat dog", "cat", "dog"]
+            assert GoogleTranslatorBackend().translate_batch(["chat", "chien"], "fr", "en") == ["cat", "dog"]
@@ -199,4 +199,125 @@ class TestUniverseTranslations:
 
         # Vérifier qu'il n'existe plus
         response = client.get(f"/api/universes/{slug}")
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+class TestUniverseQueryPlans:
+    """Le nombre de requêtes SQL ne dépend pas du nombre de lignes (pas de N+1)."""
+
+    @staticmethod
+    def _query_count(client, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        return int(response.headers["X-Query-Count"])
+
+    @staticmethod
+    def _create_universe(client, asset_count):
+        import uuid
+        slug = f"query-plan-{uuid.uuid4().hex[:8]}"
+        response = client.post("/api/universes", json={"name": "Query Plan", "slug": slug})
+        assert response.status_code == 201
+        for i in range(asset_count):
+            response = client.post(f"/api/universes/{slug}/assets", json={
+                "display_name": f"Asset {i}",
+                "sort_order": i,
+                "translations": {"fr": f"Objet {i}"},
+                "custom_image_prompt": f"Prompt {i}"
+            })
+            assert response.status_code == 201
+        return slug
+
+    def test_get_universe_constant_queries(self, client):
+        """Le détail d'un univers coûte autant de requêtes avec 2 ou 15 assets."""
+        small = self._create_universe(client, 2)
+        large = self._create_universe(client, 15)
+
+        small_count = self._query_count(client, f"/api/universes/{small}")
+        large_count = self._query_count(client, f"/api/universes/{large}")
+
+        assert small_count == large_count
+        assert large_count <= 6
+
+    def test_list_assets_constant_queries(self, client):
+        """Le listing des assets coûte autant de requêtes avec 2 ou 15 assets."""
+        small = self._create_universe(client, 2)
+        large = self._create_universe(client, 15)
+
+        assert self._query_count(client, f"/api/universes/{small}/assets") == \
+            self._query_count(client, f"/api/universes/{large}/assets")
+
+    def test_list_universes_constant_queries(self, client):
+        """Le listing des univers ne charge pas les assets de chaque univers."""
+        for _ in range(3):
+            self._create_universe(client, 3)
+
+        one = self._query_count(client, "/api/universes?limit=1")
+        many = self._query_count(client, "/api/universes?limit=50")
+
+        assert one == many
+        assert many <= 5  # 2 validators (ETag) + count + page + asset counts
+
+    def test_asset_count_in_listing(self, client):
+        """Le compteur d'assets reste correct avec la requête groupée."""
+        slug = self._create_universe(client, 4)
+
+        response = client.get("/api/universes?limit=100")
+        items = {u["slug"]: u for u in response.json()["items"]}
+        assert items[slug]["asset_count"] == 4
+
+    def test_get_asset_constant_queries(self, client):
+        """Le détail d'un asset charge prompts et traductions sans requête par ligne."""
+        slug = self._create_universe(client, 1)
+        asset_id = client.get(f"/api/universes/{slug}/assets").json()[0]["id"]
+
+        assert self._query_count(client, f"/api/universes/{slug}/assets/{asset_id}") <= 4
+
+
+class TestUniversePagination:
+    """Pagination par curseur (created_at, id) de la liste des univers."""
+
+    @staticmethod
+    def _walk(client, limit):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": limit, "with_total": "false"}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get("/api/universes", params=params).json()
+            assert data["total"] is None
+            seen.extend(u["slug"] for u in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                return seen
+
+    def test_cursor_walk_is_stable(self, client):
+        """Le parcours par curseur ne dépend pas de la taille de page, sans doublon."""
+        import uuid
+        created = set()
+        for _ in range(5):
+            slug = f"page-{uuid.uuid4().hex[:8]}"
+            assert client.post("/api/universes", json={"name": "Page", "slug": slug}).status_code == 201
+            created.add(slug)
+
+        small_pages = self._walk(client, 25)
+        large_pages = self._walk(client, 100)
+
+        assert small_pages == large_pages
+        assert len(small_pages) == len(set(small_pages))
+        assert created <= set(small_pages)
+        assert client.get("/api/universes").json()["total"] == len(small_pages)
+
+    def test_skip_still_supported(self, client, test_universe):
+        """skip/limit reste accepté pour les anciens clients."""
+        first_two = client.get("/api/universes", params={"limit": 2}).json()["items"]
+        second = client.get("/api/universes", params={"skip": 1, "limit": 1}).json()["items"]
+
+        assert second[0]["slug"] == first_two[1]["slug"]
+
+    @pytest.mark.parametrize("payload", [None, '"zz"', '["2026",{"a":1}]', '["2026",[1]]', '["2026",true]', '["2026",1,2]', '[1,1]'])
+    def test_invalid_cursor(self, client, payload):
+        """Un curseur invalide (illisible ou de forme inattendue) donne une 400."""
+        import base64
+
+        cursor = "%%%" if payload is None else base64.urlsafe_b64encode(payload.encode()).decode()
+        response = client.get("/api/universes", params={"cursor": cursor})
+        assert response.status_code == 400
@@ -1,6 +1,10 @@
 """Utility functions."""
 from slugify import slugify as python_slugify
 
+from .rate_limiter import TokenBucket
+from .async_loop import BackgroundLoop
+from .http_cache import make_etag, not_modified_response, set_validators
+
 
 def slugify(text: str) -> str:
     """Generate a URL-safe slug from text."""
@@ -0,0 +1,92 @@
+"""Background asyncio event loop shared by synchronous callers."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class BackgroundLoop:
+    """
+    One asyncio event loop running in a daemon thread.
+
+    Synchronous code (route handlers, job threads) hands coroutines to the
+    loop and waits on the result, so a single thread can drive many
+    concurrent network calls. The loop starts on first use and can be
+    started again after `close()`.
+    """
+
+    def __init__(self, name: str = "async-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop (started on demand)."""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                loop = asyncio.new_event_loop()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Max seconds to wait (None = wait forever)
+
+        Returns:
+            The coroutine result (exceptions are re-raised)
+
+        Raises:
+            RuntimeError: Called from the loop thread itself (would deadlock)
+        """
+        if self.in_loop_thread:
+            coro.close()
+            raise RuntimeError(f"{self.name}: run() called from inside the loop; await instead")
+        return self.submit(coro).result(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Stop the loop and join its thread. Pending tasks are cancelled."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def shutdown():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
@@ -0,0 +1,77 @@
+"""HTTP validators - Strong ETags, Last-Modified and conditional GET (304) helpers."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+# Clients may store responses but must revalidate them (cheap 304) before reuse
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values a response is derived from.
+
+    Args:
+        parts: Version inputs (ids, timestamps, counters, query params)
+
+    Returns:
+        Quoted ETag, e.g. '"3f2a9c..."'
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """Format a (naive UTC) datetime as an HTTP date."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists this ETag (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """Attach ETag, Last-Modified and Cache-Control to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    modified = http_date(last_modified)
+    if modified:
+        response.headers["Last-Modified"] = modified
+
+
+def not_modified_response(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    304 response if the client already has this version, else None.
+
+    Only If-None-Match is evaluated: Last-Modified is informational because
+    media files can change within the same second as the database row.
+
+    Usage:
+        cached = not_modified_response(request, etag, last_modified)
+        if cached:
+            return cached
+    """
+    if not etag_matches(request, etag):
+        return None
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
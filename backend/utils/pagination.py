@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination on (created_at, id), newest first."""
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: str, row_id: Any) -> str:
+    """Opaque cursor pointing at the last row of a page."""
+    raw = json.dumps([created_at, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any]:
+    """
+    Decode a cursor from `encode_cursor`.
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    # Only [created_at text, int or str id] may reach the SQL comparison
+    if not isinstance(payload, list) or len(payload) != 2:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    created_at, row_id = payload
+    if not isinstance(created_at, str) or isinstance(row_id, bool) or not isinstance(row_id, (int, str)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, row_id
+
+
+def keyset_page(
+    query: Query,
+    created_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of `query` ordered by (created_at DESC, id DESC).
+
+    Rows are compared with the raw stored created_at text (SQLite keeps
+    CURRENT_TIMESTAMP and SQLAlchemy datetimes in different formats), and the
+    predicate is written as `created_at <= ? AND (created_at < ? OR id < ?)`
+    so a (created_at, id) index serves both the range and the order.
+
+    Args:
+        query: Filtered query over a single entity
+        created_column: Entity created_at column
+        id_column: Entity primary key column (tie-breaker)
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        offset: Rows skipped after the cursor (legacy skip/limit clients)
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    created_text = type_coerce(created_column, String)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            created_text <= created_at,
+            or_(created_text < created_at, and_(created_text == created_at, id_column < row_id))
+        )
+
+    # Fetch one extra row to know whether there is a next page, and the raw
+    # created_at text alongside each entity for the cursor
+    rows = query.add_columns(created_text)\
+        .order_by(created_column.desc(), id_column.desc())\
+        .offset(offset)\
+        .limit(limit + 1)\
+        .all()
+    entities = [row[0] for row in rows[:limit]]
+    if len(rows) <= limit:
+        return entities, None
+
+    last_entity, last_created = rows[limit - 1]
+    return entities, encode_cursor(last_created, getattr(last_entity, id_column.key))
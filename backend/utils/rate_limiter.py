@@ -0,0 +1,96 @@
+"""Thread-safe token bucket rate limiter."""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared between worker threads.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each call to `acquire()` consumes one token, blocking until one is
+    available. This smooths bursts of API calls without forcing a fixed
+    sleep between every call.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum burst size (defaults to max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add tokens accumulated since the last refill (caller holds lock)."""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Consume tokens if immediately available, without blocking."""
+        if self.rate <= 0:
+            return True
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _take_or_wait(self, tokens: float) -> float:
+        """Consume tokens and return 0, or return the seconds to wait for them."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are available.
+
+        Args:
+            tokens: Number of tokens to consume
+            timeout: Max seconds to wait (None = wait forever)
+
+        Returns:
+            True if tokens were acquired, False on timeout
+        """
+        if self.rate <= 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self._take_or_wait(tokens)
+            if not wait:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        """Like `acquire()` without a timeout, but sleeps without blocking the event loop."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            wait = self._take_or_wait(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
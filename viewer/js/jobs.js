@@ -6,6 +6,7 @@
 const JobService = {
     POLL_INTERVAL: 2000, // 2 secondes
     activePolls: new Map(),
+    activeStreams: new Map(),
     
     /**
      * Lance un job et retourne immédiatement le job_id
@@ -23,7 +24,7 @@ const JobService = {
         }
         
         const data = await response.json();
-        return data.job_id;
+        return data.id ?? data.job_id;
     },
     
     /**
@@ -59,10 +60,10 @@ const JobService = {
                     if (onComplete) {
                         onComplete(job.result);
                     }
-                } else if (job.status === 'failed') {
+                } else if (job.status === 'failed' || job.status === 'cancelled') {
                     this.stopPolling(jobId);
                     if (onError) {
-                        onError(job.error || 'Job failed');
+                        onError(job.error || job.message || 'Job failed');
                     }
                 }
             } catch (e) {
@@ -84,7 +85,66 @@ const JobService = {
     },
     
     /**
-     * Arrête le polling d'un job
+     * Suit un job en push (Server-Sent Events), sans polling.
+     * L'événement initial contient le job complet, les suivants uniquement
+     * les champs modifiés. EventSource se reconnecte seul (avec Last-Event-ID) ;
+     * si le flux est indisponible, on repasse au polling.
+     */
+    watchJob(jobId, callbacks = {}) {
+        if (!window.EventSource) {
+            return this.pollJob(jobId, callbacks);
+        }
+        
+        const { onUpdate, onComplete, onError } = callbacks;
+        const source = new EventSource(`${API_BASE}/jobs/${jobId}/events`);
+        let job = null;
+        this.activeStreams.set(jobId, source);
+        
+        source.addEventListener('job', (event) => {
+            job = { ...job, ...JSON.parse(event.data) };
+            
+            if (onUpdate) {
+                onUpdate(job);
+            }
+            
+            if (job.status === 'completed') {
+                this.stopPolling(jobId);
+                if (onComplete) {
+                    onComplete(job.result);
+                }
+            } else if (job.status === 'failed' || job.status === 'cancelled') {
+                this.stopPolling(jobId);
+                if (onError) {
+                    onError(job.error || job.message || 'Job failed');
+                }
+            }
+        });
+        
+        source.onerror = () => {
+            // Fermé définitivement (404, proxy sans SSE...) : fallback polling
+            if (source.readyState === EventSource.CLOSED && this.activeStreams.get(jobId) === source) {
+                this.activeStreams.delete(jobId);
+                this.pollJob(jobId, callbacks);
+            }
+        };
+        
+        return jobId;
+    },
+    
+    /**
+     * Annule un job en attente ou en cours (le suivi reçoit le statut 'cancelled')
+     */
+    async cancelJob(jobId) {
+        const response = await fetch(`${API_BASE}/jobs/${jobId}/cancel`, { method: 'POST' });
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to cancel job');
+        }
+        return await response.json();
+    },
+    
+    /**
+     * Arrête le suivi d'un job (polling ou flux SSE)
      */
     stopPolling(jobId) {
         const intervalId = this.activePolls.get(jobId);
@@ -92,6 +152,11 @@ const JobService = {
             clearInterval(intervalId);
             this.activePolls.delete(jobId);
         }
+        const source = this.activeStreams.get(jobId);
+        if (source) {
+            this.activeStreams.delete(jobId);
+            source.close();
+        }
     },
     
     /**
@@ -102,6 +167,10 @@ const JobService = {
             clearInterval(intervalId);
         }
         this.activePolls.clear();
+        for (const [jobId, source] of this.activeStreams) {
+            source.close();
+        }
+        this.activeStreams.clear();
     },
     
     /**
@@ -156,8 +225,8 @@ async function runJobWithUI(options) {
         // Lancer le job
         const jobId = await JobService.startJob(endpoint, params);
         
-        // Polling
-        JobService.pollJob(jobId, {
+        // Suivi en push (polling en fallback)
+        JobService.watchJob(jobId, {
             onUpdate: (job) => {
                 if (buttonElement) {
                     buttonElement.textContent = `⏳ ${job.progress || job.status}...`;